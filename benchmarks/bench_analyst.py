@@ -0,0 +1,52 @@
+"""Metric simulation plus reward scoring, per-attempt vs batch.
+
+Run with ``python -m benchmarks.bench_analyst``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from src.app.roles.analyst import Analyst
+
+N = 100_000
+analyst = Analyst(Path("src/app/playbook/rewards.yaml"))
+
+
+def _legacy(ids: List[uuid.UUID]) -> List[float]:
+    # the old path: reseed the global RNG per attempt, then loop the weights
+    weights: Dict[str, float] = analyst.weights["newsletter"]
+    rewards = []
+    for attempt_id in ids:
+        random.seed(int(attempt_id.int % (2**32)))
+        metrics = {k: random.random() for k in weights}
+        rewards.append(
+            sum(
+                metrics[k] * w
+                for k, w in weights.items()
+                if not k.startswith("penalty")
+            )
+        )
+    return rewards
+
+
+def _timed(label: str, fn: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<30} {N / elapsed:12,.0f} attempts/s")
+
+
+def main() -> None:
+    ids = [uuid.uuid4() for _ in range(N)]
+    print(f"{N:,} newsletter attempts")
+    _timed("random.seed per attempt", lambda: _legacy(ids))
+    _timed("score_batch", lambda: analyst.score_batch("newsletter", ids))
+
+
+if __name__ == "__main__":
+    main()
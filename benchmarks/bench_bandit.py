@@ -0,0 +1,75 @@
+"""Thompson sampling throughput, dict-of-ArmState vs array-backed bandit.
+
+``decide_many([ctx])`` is the per-request path of ``CEO.choose_play``; it is
+timed with the propensity estimate cached and right after an update.
+
+Run with ``python -m benchmarks.bench_bandit``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable
+
+import numpy as np
+
+from src.app.bandit.thompson import ArmState, ArrayThompsonBandit, ThompsonBandit
+
+ARM_COUNTS = [10, 1_000, 100_000]
+DECISIONS = 1_000
+
+
+def _timed(label: str, n: int, fn: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<32} {elapsed / n * 1e6:12,.1f} us/decision")
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for n_arms in ARM_COUNTS:
+        counts = rng.integers(0, 500, n_arms)
+        sums = rng.random(n_arms) * counts
+        arms = {
+            f"arm{i}": ArmState(float(s), int(c))
+            for i, (s, c) in enumerate(zip(sums, counts))
+        }
+        scalar = ThompsonBandit(arms=arms)
+        vector = ArrayThompsonBandit.from_arms(arms, rng=rng)
+        # the scalar bandit draws one normalvariate per arm per decision
+        n_scalar = max(5, DECISIONS * 10 // n_arms)
+        print(f"{n_arms:,} arms")
+        random.seed(0)
+        _timed(
+            "ThompsonBandit.sample",
+            n_scalar,
+            lambda: [scalar.sample() for _ in range(n_scalar)],
+        )
+        _timed(
+            "ArrayThompsonBandit.sample",
+            n_scalar,
+            lambda: [vector.sample() for _ in range(n_scalar)],
+        )
+        _timed(
+            f"sample_many({DECISIONS}) + propensity",
+            DECISIONS,
+            lambda: vector.sample_many(DECISIONS),
+        )
+        _timed(
+            "decide_many([ctx]), cached",
+            n_scalar,
+            lambda: [vector.decide_many([{}]) for _ in range(n_scalar)],
+        )
+
+        def decide_after_update() -> None:
+            for _ in range(n_scalar):
+                vector.update("arm0", 1.0)
+                vector.decide_many([{}])
+
+        _timed("decide_many([ctx]) after update", n_scalar, decide_after_update)
+
+
+if __name__ == "__main__":
+    main()
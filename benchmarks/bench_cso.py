@@ -0,0 +1,100 @@
+"""CSO drafts reviewed per second: per-draft YAML + re.search vs PolicyEngine.
+
+Run with ``python -m benchmarks.bench_cso``.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, List
+
+from src.app.roles.cso import CSO
+from src.app.schemas import Draft
+
+N = 5_000
+POLICY_DIR = Path("src/app/playbook/policies")
+WORDS = "learn fractions with pizza slices then apply the idea to recipes".split()
+VIOLATIONS = ["we guarantee results", "email sam@example.com", "call 555-123-4567"]
+
+cso = CSO(POLICY_DIR)
+
+
+def _legacy_review(workstream: str, text: str) -> int:
+    # the path CSO.review took before the engine: reload and re-search per draft
+    policies = cso.load_policies(workstream)
+    issues = sum(
+        1
+        for term in policies.get("forbidden_terms", [])
+        if re.search(rf"\b{re.escape(term)}\b", text, re.IGNORECASE)
+    )
+    for code in ("forbidden", "pii"):
+        for pattern in policies.get(code, []):
+            if re.search(pattern, text, re.IGNORECASE):
+                issues += 1
+    return issues
+
+
+def _compiled_per_rule(workstream: str, text: str) -> int:
+    # precompiled, but still one search per rule
+    compiled = cso.engine.get(workstream)
+    hits = sum(1 for p in compiled.singles if p.search(text) is not None)
+    return hits + len(compiled.terms.search(text))
+
+
+def _drafts(n: int) -> List[str]:
+    rng = random.Random(0)
+    texts = []
+    for _ in range(n):
+        words = rng.choices(WORDS, k=rng.randint(80, 400))
+        if rng.random() < 0.1:
+            words.insert(rng.randrange(len(words)), rng.choice(VIOLATIONS))
+        texts.append(" ".join(words))
+    return texts
+
+
+def _timed(label: str, fn: Callable[[str], object], texts: List[str]) -> None:
+    start = time.perf_counter()
+    for text in texts:
+        fn(text)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {len(texts) / elapsed:10,.0f} drafts/s")
+
+
+def main() -> None:
+    texts = _drafts(N)
+    print(f"{N:,} drafts, 10% with a violation")
+    _timed("load + re.search per draft", lambda t: _legacy_review("x_post", t), texts)
+    _timed(
+        "compiled re.search per rule", lambda t: _compiled_per_rule("x_post", t), texts
+    )
+    _timed("PolicyEngine.scan", lambda t: cso.engine.scan("x_post", t), texts)
+    _timed(
+        "CSO.review",
+        lambda t: cso.review("x_post", Draft(outline=[], text=t)),
+        texts,
+    )
+    # a draft dense with PII: every rule is rescanned, so this stays linear
+    dense = [" ".join(["call 555-123-4567 now"] * 4_000)]
+    _timed("PolicyEngine.scan, 4k hits", lambda t: cso.engine.scan("x_post", t), dense)
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        # warm the workers so spawn time is not counted
+        list(cso.review_many("x_post", [Draft(outline=[], text="")] * workers, pool, 1))
+        drafts = [Draft(outline=[], text=t) for t in texts]
+        start = time.perf_counter()
+        list(cso.review_many("x_post", drafts, pool, chunk_size=64))
+        elapsed = time.perf_counter() - start
+    label = f"review_many, {workers} processes"
+    print(f"{label:<28} {len(texts) / elapsed:10,.0f} drafts/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Scalar vs batch Pythagorean problem generation.
+
+Run with ``python -m benchmarks.bench_generate_problems``.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from src.app.math.skills.pythagorean import generate_problem, generate_problems
+
+N = 10_000
+DIFFICULTIES = [1, 2, 3, 1, 2] * (N // 5)
+
+
+def _timed(label: str, fn: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms  {N / elapsed:12,.0f} problems/s")
+
+
+def main() -> None:
+    print(f"{N:,} pythagorean.find_c problems")
+    _timed(
+        "scalar generate_problem",
+        lambda: [generate_problem("pythagorean.find_c", d) for d in DIFFICULTIES],
+    )
+    _timed(
+        "batch arrays only",
+        lambda: generate_problems("pythagorean.find_c", DIFFICULTIES, "bench"),
+    )
+    _timed(
+        "batch + ProblemSpec models",
+        lambda: generate_problems(
+            "pythagorean.find_c", DIFFICULTIES, "bench"
+        ).to_specs(),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Math Teacher and CSO gates over a pre-generated item bank.
+
+Run with ``python -m benchmarks.bench_math_gates``.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from src.app.math.cso_math import policy_check, policy_check_items
+from src.app.math.skills.pythagorean import generate_problems
+from src.app.math.teacher_math import evaluate_math_item, evaluate_math_items
+from src.app.math.templater import _MOTIF_MAP, registry, render_context, stem_shapes
+
+N = 10_000
+
+
+def _timed(label: str, fn: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1e3:8.1f} ms  {N / elapsed:12,.0f} items/s")
+
+
+def main() -> None:
+    registry.preload()
+    templates = [*_MOTIF_MAP.values(), "neutral_v1"]
+    specs = generate_problems("pythagorean.find_c", [1, 2, 3] * (N // 3 + 1), 0)
+    items = [
+        render_context(templates[i % len(templates)], spec, "", "meters")
+        for i, spec in enumerate(specs.to_specs()[:N])
+    ]
+    print(f"{len(items):,} items over {len(templates)} templates")
+
+    def per_item() -> None:
+        for item in items:
+            evaluate_math_item(item.stem, item.question, "7-9")
+            policy_check(item.stem)
+
+    def batch() -> None:
+        shapes = stem_shapes(items)
+        evaluate_math_items(shapes)
+        policy_check_items(shapes)
+
+    _timed("per item (both gates)", per_item)
+    _timed("batch (both gates)", batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""End-to-end CEO.run_task latency on the MockLLM path.
+
+Runs against a throwaway SQLite database and outbox. Each task reports its
+own latency, first one at a time and then with many tasks in flight, plus
+the per-stage timings CEO collects. Run with
+``python -m benchmarks.bench_pipeline``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from typing import List
+
+_tmp = tempfile.mkdtemp(prefix="bench_pipeline_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_tmp}/bench.db"
+os.environ["OUTBOX_DIR"] = f"{_tmp}/outbox"
+
+from src.app.db import Base, async_session_maker, engine  # noqa: E402
+from src.app.main import ceo  # noqa: E402
+from src.app.models import Play, Workstream  # noqa: E402
+
+N = 300
+IN_FLIGHT = 32
+
+
+def _payload(i: int) -> dict:
+    return {
+        "workstream": "newsletter",
+        "topic": f"fractions part {i}",
+        "audience": "parents",
+        "tone": "warm",
+    }
+
+
+async def _task(i: int) -> float:
+    start = time.perf_counter()
+    async with async_session_maker() as session:
+        await ceo.run_task(session, _payload(i))
+    return time.perf_counter() - start
+
+
+def _report(label: str, latencies: List[float], elapsed: float) -> None:
+    ms = sorted(1000 * x for x in latencies)
+    p95 = ms[int(0.95 * (len(ms) - 1))]
+    print(
+        f"{label:<22} p50 {statistics.median(ms):7.2f} ms  p95 {p95:7.2f} ms"
+        f"  {len(ms) / elapsed:8,.0f} tasks/s"
+    )
+
+
+async def main() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_session_maker() as session:
+        session.add_all(
+            Play(id=f"bench_{i}", workstream=Workstream.newsletter, params={})
+            for i in range(4)
+        )
+        await session.commit()
+
+    await _task(-1)  # warm the bandit cache and policy files
+    ceo.timings.stages.clear()
+
+    start = time.perf_counter()
+    sequential = [await _task(i) for i in range(N)]
+    _report("sequential", sequential, time.perf_counter() - start)
+
+    limit = asyncio.Semaphore(IN_FLIGHT)
+
+    async def bounded(i: int) -> float:
+        async with limit:
+            return await _task(i)
+
+    start = time.perf_counter()
+    concurrent = await asyncio.gather(*(bounded(i) for i in range(N)))
+    _report(f"{IN_FLIGHT} in flight", concurrent, time.perf_counter() - start)
+
+    print("per stage (all runs):")
+    for stage, stats in ceo.timings.stats().items():
+        print(
+            f"  {stage:<12} n={stats['count']:<5} mean {stats['mean_ms']:6.2f} ms"
+            f"  max {stats['max_ms']:6.2f} ms"
+        )
+    await engine.dispose()
+    shutil.rmtree(_tmp)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
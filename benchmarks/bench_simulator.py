@@ -0,0 +1,34 @@
+"""Decision throughput, regret and memory per policy on the replay simulator.
+
+Deterministic from the seed, so it doubles as a regression benchmark. Run
+with ``python -m benchmarks.bench_simulator``.
+"""
+
+from __future__ import annotations
+
+from src.app.bandit.simulator import POLICIES, SyntheticEnvironment, simulate
+
+N = 20_000
+PLAYS = 8
+SEED = 0
+
+
+def main() -> None:
+    env = SyntheticEnvironment("x_post", [f"play_{i}" for i in range(PLAYS)], SEED)
+    print(f"{N:,} decisions, {PLAYS} plays, {len(env.contexts)} contexts")
+    print(
+        f"{'policy':<16}{'batch':>6}{'decisions/s':>14}{'regret':>10}"
+        f"{'mean R':>9}{'peak KiB':>10}"
+    )
+    for batch_size in (1, 100):
+        for name in POLICIES:
+            r = simulate(name, env, N, batch_size, SEED, measure_memory=True)
+            print(
+                f"{name:<16}{batch_size:>6}{r.decisions_per_s:>14,.0f}"
+                f"{r.cumulative_regret:>10.1f}{r.mean_reward:>9.3f}"
+                f"{(r.peak_memory_bytes or 0) / 1024:>10,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
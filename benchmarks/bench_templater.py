@@ -0,0 +1,81 @@
+"""Context rendering throughput, compiled registry vs the per-call path.
+
+Run with ``python -m benchmarks.bench_templater``.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import Callable, Dict
+
+from src.app.math.schemas import ProblemSpec
+from src.app.math.skills.pythagorean import generate_problems
+from src.app.math.templater import _load_template, registry, render_context
+
+N = 20_001
+TEMPLATE_IDS = ["neutral_v1", "f1_turnin_v1", "music_stage_v1", "space_vectors_v1"]
+
+_raw: Dict[str, Dict] = {}
+
+
+def _legacy_render(template_id: str, spec: ProblemSpec, units: str) -> str:
+    # What render_context did before the registry: format the raw strings,
+    # split sentences with a regex and re-check placeholders on every call.
+    if template_id not in _raw:
+        _raw[template_id] = _load_template(template_id)
+    template = _raw[template_id]
+    if units not in template.get("allowed_units", []):
+        units = template.get("allowed_units", ["meters"])[0]
+    bindings = {**spec.vars, "units": units}
+    stem = template["stem"].format(**bindings)
+    template["question"].format(**bindings)
+    sentences = [s for s in re.split(r"(?<=[.!?])\s+", stem) if s.strip()]
+    if len(sentences) > template.get("sentences_max", 2):
+        raise ValueError("stem exceeds sentence limit")
+    for ph in template.get("placeholders", []):
+        if ph not in bindings:
+            raise ValueError(f"missing placeholder {ph}")
+    return stem
+
+
+def _compiled_render(template_id: str, spec: ProblemSpec, units: str) -> str:
+    template = registry.get(template_id)
+    if units not in template.allowed_units:
+        units = template.default_units
+    bindings = {**spec.vars, "units": units}
+    template.missing_placeholder(bindings)
+    template.render_question(bindings)
+    return template.render_stem(bindings)
+
+
+def _timed(label: str, fn: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {N / elapsed:12,.0f} renders/s")
+
+
+def main() -> None:
+    registry.preload()
+    specs = generate_problems("pythagorean.find_c", [1, 2, 3] * (N // 3), 0)
+    specs_list = specs.to_specs()
+    ids = [TEMPLATE_IDS[i % len(TEMPLATE_IDS)] for i in range(len(specs_list))]
+    work = list(zip(ids, specs_list))
+    print(f"{len(work):,} renders")
+    _timed(
+        "legacy format + regex (text only)",
+        lambda: [_legacy_render(t, s, "meters") for t, s in work],
+    )
+    _timed(
+        "compiled registry (text only)",
+        lambda: [_compiled_render(t, s, "meters") for t, s in work],
+    )
+    _timed(
+        "render_context (ContextedItem)",
+        lambda: [render_context(t, s, "", "meters") for t, s in work],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Forbidden-term scans as the term list grows: regexes vs TermMatcher.
+
+Run with ``python -m benchmarks.bench_terms``.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import string
+import time
+from typing import Callable, List
+
+from src.app.term_matcher import TermMatcher
+
+SIZES = (10, 100, 1_000, 5_000)
+DRAFTS = 50
+rng = random.Random(0)
+
+
+def _word() -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+
+
+def _rate(fn: Callable[[str], object], texts: List[str]) -> float:
+    start = time.perf_counter()
+    for text in texts:
+        fn(text)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    vocabulary = [_word() for _ in range(2_000)]
+    texts = [" ".join(rng.choices(vocabulary, k=300)) for _ in range(DRAFTS)]
+    print(f"{DRAFTS} drafts of 300 words; drafts/s by number of terms")
+    print(
+        f"{'terms':>6} {'regex per term':>15} {'one alternation':>16} {'TermMatcher':>12}"
+    )
+    for size in SIZES:
+        terms = [_word() for _ in range(size)]
+        singles = [
+            re.compile(rf"(?<!\w){re.escape(t)}(?!\w)", re.IGNORECASE) for t in terms
+        ]
+        combined = re.compile(
+            rf"(?<!\w)(?:{'|'.join(map(re.escape, terms))})(?!\w)", re.IGNORECASE
+        )
+        matcher = TermMatcher(terms)
+        per_term = _rate(lambda t: [p.search(t) for p in singles], texts)
+        alternation = _rate(lambda t: combined.findall(t), texts)
+        automaton = _rate(matcher.scan, texts)
+        print(f"{size:>6} {per_term:>15,.0f} {alternation:>16,.0f} {automaton:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Literal, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import AttemptLog, Workstream
+from .linear import LinUCBBandit, hash_features
+from .stats import active_play_stats
+from .thompson import ArrayThompsonBandit
+
+Policy = Union[ArrayThompsonBandit, LinUCBBandit]
+BanditPolicy = Literal["thompson", "linucb"]
+
+# (workstream, play_id, reward, task payload)
+Reward = Tuple[Workstream, str, float, Mapping[str, Any]]
+
+
+@dataclass
+class _Entry:
+    bandit: Policy
+    loaded_at: float
+
+
+class _LinearStats:
+    """Per-play ridge statistics of one workstream, folded from attempt logs.
+
+    ``a_inv`` holds each play's inverse design matrix, kept current with
+    Sherman–Morrison updates as rows are folded, so a refresh never inverts.
+
+    Rows are read by ``rewarded_at`` from ``watermark`` minus an overlap, so a
+    chunk that committed a little after its stamp is still seen; ``recent``
+    holds the ids already folded inside that overlap.
+    """
+
+    def __init__(self, dim: int):
+        self.index: Dict[str, int] = {}
+        self.a_inv = np.zeros((0, dim, dim))
+        self.b = np.zeros((0, dim))
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.watermark: datetime | None = None
+        self.recent: Dict[uuid.UUID, datetime] = {}
+        # rows rewarded without a stamp (seeds, old rows) are read once
+        self.loaded = False
+        self.folding: asyncio.Event | None = None
+
+    def rows(self, play_ids: Sequence[str]) -> List[int]:
+        """Row of each play, adding empty rows for plays not seen yet."""
+        new = [p for p in dict.fromkeys(play_ids) if p not in self.index]
+        if new:
+            dim = self.b.shape[1]
+            self.index.update(
+                zip(new, range(len(self.index), len(self.index) + len(new)))
+            )
+            self.a_inv = np.concatenate(
+                [self.a_inv, np.tile(np.eye(dim), (len(new), 1, 1))]
+            )
+            self.b = np.concatenate([self.b, np.zeros((len(new), dim))])
+            self.counts = np.append(self.counts, np.zeros(len(new), dtype=np.int64))
+        return [self.index[p] for p in play_ids]
+
+    def fold(self, chunk: Sequence[Any]) -> None:
+        chunk = [row for row in chunk if row.id not in self.recent]
+        if not chunk:
+            return
+        arms = np.array(self.rows([row.play_id for row in chunk]))
+        dim = self.b.shape[1]
+        x = np.stack([hash_features(row.context or {}, dim) for row in chunk])
+        r = np.array([float(row.reward_R) for row in chunk])
+        for i, xi in zip(arms.tolist(), x):
+            a_inv = self.a_inv[i]
+            ax = a_inv @ xi
+            a_inv -= np.outer(ax, ax) / (1.0 + xi @ ax)
+        np.add.at(self.b, arms, x * r[:, None])
+        np.add.at(self.counts, arms, 1)
+        for row in chunk:
+            if row.rewarded_at is None:
+                continue
+            self.recent[row.id] = row.rewarded_at
+            if self.watermark is None or row.rewarded_at > self.watermark:
+                self.watermark = row.rewarded_at
+
+    def trim(self, overlap_s: float) -> None:
+        self.loaded = True
+        if self.watermark is not None:
+            since = self.watermark - timedelta(seconds=overlap_s)
+            self.recent = {k: t for k, t in self.recent.items() if t >= since}
+
+
+class BanditCache:
+    """Per-workstream bandit state kept in process across requests.
+
+    Entries are rebuilt from ``plays`` once they are older than ``ttl`` so
+    rewards recorded by other workers are picked up. Rewards recorded in this
+    process are applied in place via ``record``. Each workstream has a version
+    counter that ``record`` and ``invalidate`` bump, and a load that raced with
+    either is returned but not cached.
+
+    ``policy`` picks the bandit: ``thompson`` keeps per-play reward sums from
+    ``play_stats``; ``linucb`` keeps per-play ridge statistics of rewarded
+    attempt logs and their payloads, and each load streams in only the rows
+    rewarded since the last one, ``chunk_size`` at a time.
+    """
+
+    chunk_size = 5_000
+    # how late after its ``rewarded_at`` stamp an analyst chunk may commit
+    # and still be folded into linucb statistics
+    reward_overlap_s = 300.0
+
+    def __init__(
+        self,
+        ttl: float = 30.0,
+        exploration: float = 0.15,
+        policy: BanditPolicy = "thompson",
+        dim: int = 64,
+        alpha: float = 1.0,
+    ):
+        self.ttl = ttl
+        self.exploration = exploration
+        self.policy = policy
+        self.dim = dim
+        self.alpha = alpha
+        self.loads = 0
+        self._entries: Dict[Workstream, _Entry] = {}
+        self._versions: Dict[Workstream, int] = {}
+        self._linear: Dict[Workstream, _LinearStats] = {}
+
+    async def get(self, session: AsyncSession, workstream: Workstream) -> Policy:
+        entry = self._entries.get(workstream)
+        if entry is not None and time.monotonic() - entry.loaded_at < self.ttl:
+            return entry.bandit
+        version = self._versions.get(workstream, 0)
+        rows = await active_play_stats(session, workstream)
+        self.loads += 1
+        arm_ids = [play_id for play_id, _, _ in rows]
+        bandit: Policy
+        if self.policy == "linucb":
+            bandit = await self._fit_linear(session, workstream, arm_ids)
+        else:
+            bandit = ArrayThompsonBandit(
+                arm_ids,
+                [reward_sum for _, reward_sum, _ in rows],
+                [n for _, _, n in rows],
+                exploration=self.exploration,
+            )
+        if rows and self._versions.get(workstream, 0) == version:
+            self._entries[workstream] = _Entry(bandit, time.monotonic())
+        return bandit
+
+    async def _fit_linear(
+        self, session: AsyncSession, workstream: Workstream, arm_ids: List[str]
+    ) -> LinUCBBandit:
+        stats = self._linear.get(workstream)
+        if stats is None:
+            stats = self._linear[workstream] = _LinearStats(self.dim)
+        if stats.folding is not None:
+            # another load is folding rows in; build from its result
+            await stats.folding.wait()
+        else:
+            stats.folding = asyncio.Event()
+            try:
+                await self._fold_new_rows(session, workstream, stats)
+            finally:
+                stats.folding.set()
+                stats.folding = None
+        rows = stats.rows(arm_ids)
+        bandit = LinUCBBandit(
+            arm_ids, dim=self.dim, alpha=self.alpha, exploration=self.exploration
+        )
+        bandit.a_inv = stats.a_inv[rows]
+        bandit.b = stats.b[rows]
+        bandit.counts = stats.counts[rows]
+        return bandit
+
+    async def _fold_new_rows(
+        self, session: AsyncSession, workstream: Workstream, stats: _LinearStats
+    ) -> None:
+        stmt = select(
+            AttemptLog.id,
+            AttemptLog.play_id,
+            AttemptLog.context,
+            AttemptLog.reward_R,
+            AttemptLog.rewarded_at,
+        ).where(AttemptLog.workstream == workstream, AttemptLog.reward_R.is_not(None))
+        if stats.watermark is not None:
+            since = stats.watermark - timedelta(seconds=self.reward_overlap_s)
+            stmt = stmt.where(AttemptLog.rewarded_at >= since)
+        elif stats.loaded:
+            stmt = stmt.where(AttemptLog.rewarded_at.is_not(None))
+        result = await session.stream(stmt.execution_options(yield_per=self.chunk_size))
+        async for chunk in result.partitions():
+            stats.fold(chunk)
+        stats.trim(self.reward_overlap_s)
+
+    def record(self, rewards: Iterable[Reward]) -> None:
+        """Apply committed rewards to cached bandits; unknown plays are skipped."""
+        for workstream, play_id, reward, context in rewards:
+            self._versions[workstream] = self._versions.get(workstream, 0) + 1
+            entry = self._entries.get(workstream)
+            if entry is not None and play_id in entry.bandit.index:
+                entry.bandit.observe(play_id, reward, context)
+
+    def invalidate(self, workstream: Workstream | None = None) -> None:
+        targets = list(self._entries) if workstream is None else [workstream]
+        for ws in targets:
+            self._entries.pop(ws, None)
+            self._versions[ws] = self._versions.get(ws, 0) + 1
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from .thompson import Decision
+
+CONTEXT_KEYS = ("objective", "audience", "tone", "topic")
+
+
+def _bucket(token: str, dim: int) -> tuple[int, float]:
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    h = int.from_bytes(digest, "little")
+    # index 0 is reserved for the bias term
+    return 1 + h % (dim - 1), 1.0 if h >> 63 else -1.0
+
+
+def hash_features(context: Mapping[str, Any], dim: int = 64) -> np.ndarray:
+    """Signed feature hashing of a task payload into a unit-norm vector.
+
+    Each context key contributes ``key=value`` and, for multi-word values,
+    ``key:word`` tokens. blake2b keeps buckets stable across processes,
+    unlike ``hash()``.
+    """
+    x = np.zeros(dim)
+    x[0] = 1.0
+    for key in CONTEXT_KEYS:
+        value = str(context.get(key) or "").strip().lower()
+        if not value:
+            continue
+        tokens = [f"{key}={value}"]
+        words = value.split()
+        if len(words) > 1:
+            tokens.extend(f"{key}:{w}" for w in words)
+        for token in tokens:
+            i, sign = _bucket(token, dim)
+            x[i] += sign
+    return x / np.linalg.norm(x)
+
+
+class LinUCBBandit:
+    """Disjoint LinUCB over hashed task features.
+
+    Each arm keeps ``A^-1`` and ``b`` for ridge regression of reward on the
+    context vector. ``A^-1`` is maintained with Sherman–Morrison rank-one
+    updates, so an update costs O(d²) and no matrix is ever inverted on the
+    request path. Scores for all arms (and all contexts of a batch) come from
+    one einsum. With probability ``exploration`` an arm is drawn uniformly,
+    which keeps every arm's propensity positive for off-policy evaluation.
+    """
+
+    def __init__(
+        self,
+        arm_ids: Sequence[str] = (),
+        dim: int = 64,
+        alpha: float = 1.0,
+        exploration: float = 0.15,
+        rng: np.random.Generator | None = None,
+    ):
+        self.arm_ids: List[str] = list(arm_ids)
+        self.index: Dict[str, int] = {a: i for i, a in enumerate(self.arm_ids)}
+        self.dim = dim
+        self.alpha = alpha
+        self.exploration = exploration
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.a_inv: np.ndarray = np.tile(np.eye(dim), (len(self.arm_ids), 1, 1))
+        self.b = np.zeros((len(self.arm_ids), dim))
+        self.counts = np.zeros(len(self.arm_ids), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.arm_ids)
+
+    @property
+    def theta(self) -> np.ndarray:
+        return np.einsum("kij,kj->ki", self.a_inv, self.b)
+
+    def scores(self, features: np.ndarray) -> np.ndarray:
+        """Upper confidence bounds, shape (n_contexts, n_arms)."""
+        x = np.atleast_2d(features)
+        mean = x @ self.theta.T
+        var = np.einsum("ni,kij,nj->nk", x, self.a_inv, x)
+        return mean + self.alpha * np.sqrt(np.maximum(var, 0.0))
+
+    def decide_many(self, contexts: Sequence[Mapping[str, Any]]) -> List[Decision]:
+        if not self.arm_ids:
+            raise ValueError("no arms")
+        n_arms = len(self.arm_ids)
+        features = np.stack([hash_features(c, self.dim) for c in contexts])
+        scores = self.scores(features)
+        best = scores >= scores.max(axis=1, keepdims=True)
+        # greedy ties are broken uniformly, so each tied arm shares the mass
+        greedy = self.rng.random(best.shape) * best
+        picks = greedy.argmax(axis=1)
+        explore = self.rng.random(len(contexts)) < self.exploration
+        picks[explore] = self.rng.integers(n_arms, size=int(explore.sum()))
+        rows = np.arange(len(contexts))
+        probs = self.exploration / n_arms + (1 - self.exploration) * best[
+            rows, picks
+        ] / best.sum(axis=1)
+        return [
+            Decision(self.arm_ids[i], float(p)) for i, p in zip(picks.tolist(), probs)
+        ]
+
+    def _arm_index(self, arm_id: str) -> int:
+        i = self.index.get(arm_id)
+        if i is None:
+            i = self.index[arm_id] = len(self.arm_ids)
+            self.arm_ids.append(arm_id)
+            self.a_inv = np.concatenate([self.a_inv, np.eye(self.dim)[None]])
+            self.b = np.concatenate([self.b, np.zeros((1, self.dim))])
+            self.counts = np.append(self.counts, 0)
+        return i
+
+    def update(self, arm_id: str, features: np.ndarray, reward: float) -> None:
+        i = self._arm_index(arm_id)
+        a_inv = self.a_inv[i]
+        ax = a_inv @ features
+        a_inv -= np.outer(ax, ax) / (1.0 + features @ ax)
+        self.b[i] += reward * features
+        self.counts[i] += 1
+
+    def observe(self, arm_id: str, reward: float, context: Mapping[str, Any]) -> None:
+        self.update(arm_id, hash_features(context, self.dim), reward)
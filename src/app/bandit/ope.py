@@ -0,0 +1,222 @@
+"""Off-policy evaluation of play-selection policies over AttemptLog.
+
+Target policies here are context-free (a distribution over plays), so IPS,
+SNIPS and DR reduce to per-play sums of ``r/p``, ``1/p``, ``r`` and counts.
+Rows are streamed from the database in chunks and folded into those sums,
+so memory is O(plays × bootstrap replicates) however many attempts exist.
+Confidence intervals use the Poisson bootstrap: every row gets an
+independent Poisson(1) weight per replicate, which needs no second pass.
+
+Run ``python -m src.app.bandit.ope --workstream x_post`` for a report.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Literal, Mapping, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db import async_session_maker
+from ..models import AttemptLog, Workstream
+from .thompson import ArrayThompsonBandit
+
+TargetPolicy = Literal["uniform", "greedy", "thompson"]
+TARGET_POLICIES: tuple[TargetPolicy, ...] = ("uniform", "greedy", "thompson")
+
+# per-play sums kept for the full sample and every bootstrap replicate
+_N, _REWARD, _IPS, _WEIGHT = range(4)
+
+
+def _poisson_lookup(bits: int = 16) -> np.ndarray:
+    # inverse CDF of Poisson(1) over uniform ``bits``-bit integers; an order
+    # of magnitude cheaper than Generator.poisson and exact to 2**-bits
+    pmf = np.exp(-1.0) / np.cumprod(np.r_[1.0, np.arange(1.0, 20.0)])
+    cdf = np.cumsum(pmf) * (1 << bits)
+    return np.searchsorted(cdf, np.arange(1 << bits), side="right").astype(float)
+
+
+_POISSON_1 = _poisson_lookup()
+
+
+@dataclass
+class Estimate:
+    value: float
+    lower: float
+    upper: float
+
+
+class OPEAccumulator:
+    """Per-play sufficient statistics for IPS, SNIPS and DR.
+
+    ``sums[s, 0]`` holds statistic ``s`` for the logged sample and
+    ``sums[s, 1:]`` its ``n_boot`` bootstrap replicates, each shape (plays,).
+    """
+
+    def __init__(self, n_boot: int = 200, seed: int = 0):
+        self.n_boot = n_boot
+        self.rng = np.random.default_rng(seed)
+        self.arm_ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.rows = 0
+        self.sums = np.zeros((4, n_boot + 1, 0))
+
+    def _arm_indexes(self, play_ids: Sequence[str]) -> np.ndarray:
+        for play_id in play_ids:
+            if play_id not in self.index:
+                self.index[play_id] = len(self.arm_ids)
+                self.arm_ids.append(play_id)
+        grow = len(self.arm_ids) - self.sums.shape[2]
+        if grow:
+            self.sums = np.pad(self.sums, ((0, 0), (0, 0), (0, grow)))
+        return np.array([self.index[p] for p in play_ids], dtype=np.int64)
+
+    def add(
+        self,
+        play_ids: Sequence[str],
+        propensities: np.ndarray,
+        rewards: np.ndarray,
+    ) -> None:
+        arms = self._arm_indexes(play_ids)
+        if not len(arms):
+            return
+        p = np.asarray(propensities, dtype=float)
+        r = np.asarray(rewards, dtype=float)
+        weights = np.ones((len(arms), self.n_boot + 1))
+        weights[:, 1:] = _POISSON_1[
+            self.rng.integers(
+                0, 1 << 16, size=(len(arms), self.n_boot), dtype=np.uint16
+            )
+        ]
+        values = np.stack([np.ones_like(r), r, r / p, 1 / p], axis=1)
+        # group rows by play; each group is one (4, n) @ (n, B+1) product
+        order = np.argsort(arms, kind="stable")
+        arms, weights, values = arms[order], weights[order], values[order]
+        bounds = np.flatnonzero(np.r_[True, arms[1:] != arms[:-1], True])
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            self.sums[:, :, arms[start]] += values[start:stop].T @ weights[start:stop]
+        self.rows += len(arms)
+
+    def target(
+        self, policy: TargetPolicy | Mapping[str, float], seed: int = 0
+    ) -> np.ndarray:
+        """Probability the target policy assigns to each logged play."""
+        k = len(self.arm_ids)
+        if not isinstance(policy, str):
+            return np.array([float(policy.get(a, 0.0)) for a in self.arm_ids])
+        if policy == "uniform":
+            return np.full(k, 1 / k)
+        n, reward = self.sums[_N, 0], self.sums[_REWARD, 0]
+        if policy == "greedy":
+            means = np.divide(reward, n, out=np.zeros(k), where=n > 0)
+            probs = (means == means.max()).astype(float)
+            return probs / probs.sum()
+        if policy == "thompson":
+            bandit = ArrayThompsonBandit(
+                self.arm_ids,
+                reward,
+                n.astype(np.int64),
+                rng=np.random.default_rng(seed),
+                propensity_draws=4096,
+            )
+            return bandit.propensities()
+        raise ValueError(f"unknown target policy {policy}")
+
+    def estimate(
+        self, target: np.ndarray, confidence: float = 0.95
+    ) -> Dict[str, Estimate]:
+        if not self.rows:
+            raise ValueError("no logged attempts to evaluate")
+        n, reward, ips, weight = self.sums
+        total = n.sum(axis=1)
+        # reward model for DR: each play's mean logged reward
+        q = np.divide(reward, n, out=np.zeros_like(reward), where=n > 0)
+        # a replicate can draw all-zero weights on tiny samples; it becomes
+        # NaN and is left out of the interval
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = {
+                "ips": (ips @ target) / total,
+                "snips": (ips @ target) / (weight @ target),
+                "dr": (q @ target) + ((ips - q * weight) @ target) / total,
+            }
+        tail = 100 * (1 - confidence) / 2
+        out: Dict[str, Estimate] = {}
+        for name, v in values.items():
+            lower, upper = np.nanpercentile(v[1:], [tail, 100 - tail])
+            out[name] = Estimate(float(v[0]), float(lower), float(upper))
+        return out
+
+
+async def accumulate(
+    session: AsyncSession,
+    workstream: Workstream,
+    acc: OPEAccumulator,
+    chunk_size: int = 10_000,
+) -> OPEAccumulator:
+    """Fold every rewarded attempt with a logged propensity into ``acc``."""
+    result = await session.stream(
+        select(AttemptLog.play_id, AttemptLog.propensity, AttemptLog.reward_R)
+        .where(
+            AttemptLog.workstream == workstream,
+            AttemptLog.reward_R.is_not(None),
+            AttemptLog.propensity > 0,
+        )
+        .execution_options(yield_per=chunk_size)
+    )
+    async for chunk in result.partitions():
+        acc.add(
+            [play_id for play_id, _, _ in chunk],
+            np.array([float(p) for _, p, _ in chunk]),
+            np.array([float(r) for _, _, r in chunk]),
+        )
+    return acc
+
+
+async def evaluate(
+    session: AsyncSession,
+    workstream: Workstream,
+    policies: Sequence[TargetPolicy] = TARGET_POLICIES,
+    n_boot: int = 200,
+    seed: int = 0,
+) -> Dict[str, object]:
+    acc = await accumulate(session, workstream, OPEAccumulator(n_boot, seed))
+    report: Dict[str, object] = {"workstream": workstream.value, "rows": acc.rows}
+    if not acc.rows:
+        report["policies"] = {}
+        return report
+    results: Dict[str, object] = {}
+    for policy in policies:
+        target = acc.target(policy, seed)
+        results[policy] = {
+            "target": dict(zip(acc.arm_ids, target.tolist())),
+            **{name: asdict(est) for name, est in acc.estimate(target).items()},
+        }
+    report["policies"] = results
+    return report
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workstream", default="x_post")
+    parser.add_argument("--policy", choices=TARGET_POLICIES, action="append")
+    parser.add_argument("--n-boot", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    async with async_session_maker() as session:
+        report = await evaluate(
+            session,
+            Workstream(args.workstream),
+            args.policy or TARGET_POLICIES,
+            args.n_boot,
+            args.seed,
+        )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,306 @@
+"""In-process replay of play selection, for comparing and load-testing policies.
+
+Two sources of events are supported:
+
+* ``SyntheticEnvironment`` draws task contexts and per-metric outcomes for
+  every play, turns them into rewards with the Analyst's compiled weights
+  from ``playbook/rewards.yaml`` (penalties included), and knows each
+  context's best play, so runs report regret. Noise is shared across
+  policies for the same seed (common random numbers), so differences
+  between policies are not sampling noise.
+* ``replay_log`` runs a policy over exported ``AttemptLog`` rows with the
+  rejection replay method: only events where the policy picks the logged play
+  are counted and fed back. It is unbiased when the log was collected with
+  uniform random play selection.
+
+Run ``python -m src.app.bandit.simulator --help`` for the CLI.
+"""
+
+from __future__ import annotations
+
+import argparse
+from itertools import islice
+import json
+import random
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Protocol,
+    Sequence,
+)
+
+import numpy as np
+
+from ..roles.analyst import Analyst
+from .linear import LinUCBBandit
+from .thompson import ArmState, ArrayThompsonBandit, Decision, ThompsonBandit
+
+REWARDS_PATH = Path(__file__).resolve().parents[1] / "playbook" / "rewards.yaml"
+AUDIENCES = ("kids", "parents", "teachers", "tutors")
+TONES = ("warm", "playful", "direct")
+
+
+class Policy(Protocol):
+    def decide_many(self, contexts: Sequence[Mapping[str, Any]]) -> List[Decision]: ...
+
+    def observe(
+        self, arm_id: str, reward: float, context: Mapping[str, Any]
+    ) -> None: ...
+
+
+class ScalarThompsonPolicy:
+    """Adapts the dict-backed ThompsonBandit to the Policy protocol."""
+
+    def __init__(self, arm_ids: Sequence[str], seed: int):
+        self.bandit = ThompsonBandit(
+            {a: ArmState() for a in arm_ids}, rng=random.Random(seed)
+        )
+
+    def decide_many(self, contexts: Sequence[Mapping[str, Any]]) -> List[Decision]:
+        # ThompsonBandit does not estimate propensities
+        return [Decision(self.bandit.sample(), float("nan")) for _ in contexts]
+
+    def observe(self, arm_id: str, reward: float, context: Mapping[str, Any]) -> None:
+        self.bandit.update(arm_id, reward)
+
+
+class UniformPolicy:
+    def __init__(self, arm_ids: Sequence[str], seed: int):
+        self.arm_ids = list(arm_ids)
+        self.rng = np.random.default_rng(seed)
+
+    def decide_many(self, contexts: Sequence[Mapping[str, Any]]) -> List[Decision]:
+        p = 1 / len(self.arm_ids)
+        picks = self.rng.integers(len(self.arm_ids), size=len(contexts))
+        return [Decision(self.arm_ids[i], p) for i in picks.tolist()]
+
+    def observe(self, arm_id: str, reward: float, context: Mapping[str, Any]) -> None:
+        pass
+
+
+POLICIES: Dict[str, Callable[[Sequence[str], int], Policy]] = {
+    "uniform": UniformPolicy,
+    "thompson": ScalarThompsonPolicy,
+    "array_thompson": lambda arms, seed: ArrayThompsonBandit(
+        arms, rng=np.random.default_rng(seed)
+    ),
+    "linucb": lambda arms, seed: LinUCBBandit(
+        arms, dim=32, rng=np.random.default_rng(seed)
+    ),
+}
+
+
+@dataclass
+class SyntheticEnvironment:
+    """Plays whose metric means depend on the task's audience and tone."""
+
+    workstream: str
+    play_ids: List[str]
+    seed: int = 0
+    noise: float = 0.1
+    analyst: Analyst = field(default_factory=lambda: Analyst(REWARDS_PATH))
+
+    def __post_init__(self) -> None:
+        weights = self.analyst.reward_weights.get(self.workstream)
+        if weights is None or not weights.metrics:
+            raise ValueError(f"no reward weights for {self.workstream}")
+        self.metrics = list(weights.metrics)
+        self.weights = weights.vector
+        rng = np.random.default_rng(self.seed)
+        self.contexts = [
+            {"audience": a, "tone": t, "objective": "subs"}
+            for a in AUDIENCES
+            for t in TONES
+        ]
+        # mean of every metric for each (context, play); penalty metrics are
+        # rare events, so their means and noise are scaled down
+        self.scale = np.where(weights.penalty, 0.05, 1.0)
+        self.means = rng.random(
+            (len(self.contexts), len(self.play_ids), len(self.metrics))
+        )
+        self.means *= self.scale
+        self.expected = self.means @ self.weights
+        self.best = self.expected.max(axis=1)
+
+    def reward(self, metrics: np.ndarray) -> float:
+        return float(metrics @ self.weights)
+
+    def events(self, n: int) -> Iterator[tuple[int, np.ndarray]]:
+        """Context index and per-metric noise for each of ``n`` events."""
+        rng = np.random.default_rng([self.seed, 1])
+        contexts = rng.integers(len(self.contexts), size=n)
+        noise = rng.normal(0.0, self.noise, size=(n, len(self.metrics))) * self.scale
+        return zip(contexts.tolist(), noise)
+
+
+@dataclass
+class SimulationReport:
+    policy: str
+    decisions: int
+    decisions_per_s: float
+    mean_reward: float
+    cumulative_regret: float
+    # (decisions so far, cumulative regret) at evenly spaced checkpoints
+    regret_curve: List[tuple[int, float]]
+    peak_memory_bytes: int | None = None
+
+
+def simulate(
+    policy_name: str,
+    env: SyntheticEnvironment,
+    n: int,
+    batch_size: int = 1,
+    seed: int = 0,
+    checkpoints: int = 20,
+    measure_memory: bool = False,
+) -> SimulationReport:
+    """Run ``n`` decisions; rewards for a batch arrive after it is decided.
+
+    Only time spent inside the policy counts towards ``decisions_per_s``.
+    With ``measure_memory`` the run is repeated under tracemalloc, which
+    would otherwise distort the timing.
+    """
+    policy = POLICIES[policy_name](env.play_ids, seed)
+    index = {p: i for i, p in enumerate(env.play_ids)}
+    every = max(1, n // checkpoints)
+    curve: List[tuple[int, float]] = []
+    regret = total = policy_s = 0.0
+    events = env.events(n)
+    for start in range(0, n, batch_size):
+        batch = list(islice(events, batch_size))
+        contexts = [env.contexts[c] for c, _ in batch]
+        t0 = time.perf_counter()
+        decisions = policy.decide_many(contexts)
+        policy_s += time.perf_counter() - t0
+        rewards = []
+        for (c, noise), decision in zip(batch, decisions):
+            p = index[decision.arm_id]
+            metrics = np.maximum(env.means[c, p] + noise, 0.0)
+            rewards.append(env.reward(metrics))
+            regret += env.best[c] - env.expected[c, p]
+        t0 = time.perf_counter()
+        for context, decision, reward in zip(contexts, decisions, rewards):
+            policy.observe(decision.arm_id, reward, context)
+        policy_s += time.perf_counter() - t0
+        total += sum(rewards)
+        done = start + len(batch)
+        if done // every > (done - len(batch)) // every or done == n:
+            curve.append((done, round(regret, 6)))
+
+    peak = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            simulate(policy_name, env, n, batch_size, seed, checkpoints)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return SimulationReport(
+        policy=policy_name,
+        decisions=n,
+        decisions_per_s=n / policy_s if policy_s else float("inf"),
+        mean_reward=total / n if n else 0.0,
+        cumulative_regret=regret,
+        regret_curve=curve,
+        peak_memory_bytes=peak,
+    )
+
+
+@dataclass
+class ReplayReport:
+    policy: str
+    events: int
+    matched: int
+    mean_reward: float
+    # (events seen, mean reward over matched events so far)
+    reward_curve: List[tuple[int, float]]
+
+
+def load_events(path: Path) -> Iterator[Dict[str, Any]]:
+    """Exported AttemptLog rows, one JSON object per line."""
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def replay_log(
+    policy_name: str,
+    events: Iterable[Mapping[str, Any]],
+    play_ids: Sequence[str],
+    seed: int = 0,
+    checkpoints: int = 20,
+    n_hint: int = 0,
+) -> ReplayReport:
+    """Rejection replay over logged ``play_id``/``context``/``reward_R`` rows."""
+    policy = POLICIES[policy_name](play_ids, seed)
+    every = max(1, n_hint // checkpoints) if n_hint else 1_000
+    seen = matched = 0
+    total = 0.0
+    curve: List[tuple[int, float]] = []
+    for event in events:
+        if event.get("reward_R") is None:
+            continue
+        seen += 1
+        context = event.get("context") or {}
+        decision = policy.decide_many([context])[0]
+        if decision.arm_id == event["play_id"]:
+            reward = float(event["reward_R"])
+            policy.observe(decision.arm_id, reward, context)
+            matched += 1
+            total += reward
+        if seen % every == 0:
+            curve.append((seen, total / matched if matched else 0.0))
+    return ReplayReport(
+        policy=policy_name,
+        events=seen,
+        matched=matched,
+        mean_reward=total / matched if matched else 0.0,
+        reward_curve=curve,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--policy", choices=list(POLICIES), action="append")
+    parser.add_argument("--workstream", default="x_post")
+    parser.add_argument("--plays", type=int, default=8)
+    parser.add_argument("-n", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--memory", action="store_true")
+    parser.add_argument(
+        "--log", type=Path, help="replay exported AttemptLog JSONL instead"
+    )
+    args = parser.parse_args()
+    policies = args.policy or list(POLICIES)
+    reports: List[Any]
+    if args.log:
+        play_ids = sorted({e["play_id"] for e in load_events(args.log)})
+        reports = [
+            replay_log(p, load_events(args.log), play_ids, args.seed) for p in policies
+        ]
+    else:
+        env = SyntheticEnvironment(
+            args.workstream, [f"play_{i}" for i in range(args.plays)], args.seed
+        )
+        reports = [
+            simulate(
+                p, env, args.n, args.batch_size, args.seed, measure_memory=args.memory
+            )
+            for p in policies
+        ]
+    print(json.dumps([asdict(r) for r in reports], indent=2))
+
+
+if __name__ == "__main__":
+    main()
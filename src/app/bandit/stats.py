@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import List, Mapping, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db import dialect_insert
+from ..models import Play, PlayStats, Workstream
+
+
+async def increment_play_stats(
+    session: AsyncSession, deltas: Mapping[str, Tuple[float, int]]
+) -> None:
+    """Add ``(reward_sum, n)`` deltas per play in one upsert statement.
+
+    The increment happens in SQL, so concurrent writers never lose updates.
+    Runs inside the caller's transaction.
+    """
+    if not deltas:
+        return
+    stmt = dialect_insert(session)(PlayStats)
+    table = PlayStats.__table__
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["play_id"],
+            set_={
+                "reward_sum": table.c.reward_sum + stmt.excluded.reward_sum,
+                "n": table.c.n + stmt.excluded.n,
+            },
+        ),
+        [
+            {"play_id": play_id, "reward_sum": reward_sum, "n": n}
+            for play_id, (reward_sum, n) in deltas.items()
+        ],
+    )
+
+
+async def active_play_stats(
+    session: AsyncSession, workstream: Workstream
+) -> List[Tuple[str, float, int]]:
+    """``(play_id, reward_sum, n)`` for every active play of a workstream."""
+    result = await session.execute(
+        select(
+            Play.id,
+            func.coalesce(PlayStats.reward_sum, 0.0),
+            func.coalesce(PlayStats.n, 0),
+        )
+        .outerjoin(PlayStats, PlayStats.play_id == Play.id)
+        .where(Play.workstream == workstream, Play.active.is_(True))
+    )
+    return [(play_id, float(s), int(n)) for play_id, s, n in result.all()]
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 import random
-from typing import Dict
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
 
 
 @dataclass
@@ -19,19 +21,170 @@ class ArmState:
 class ThompsonBandit:
     arms: Dict[str, ArmState] = field(default_factory=dict)
     exploration: float = 0.15
+    # falls back to the module-level generator when not given
+    rng: random.Random | None = None
 
     def sample(self) -> str:
         if not self.arms:
             raise ValueError("no arms")
-        if random.random() < self.exploration:
-            return random.choice(list(self.arms.keys()))
+        rng = self.rng or random
+        if rng.random() < self.exploration:
+            return rng.choice(list(self.arms.keys()))
         samples: Dict[str, float] = {}
         for arm_id, state in self.arms.items():
             sigma = 1 / (state.n + 1) ** 0.5
-            samples[arm_id] = random.normalvariate(state.mean, sigma)
+            samples[arm_id] = rng.normalvariate(state.mean, sigma)
         return max(samples, key=lambda k: samples[k])
 
     def update(self, arm_id: str, reward: float) -> None:
         state = self.arms.setdefault(arm_id, ArmState())
         state.reward_sum += reward
         state.n += 1
+
+
+@dataclass
+class Decision:
+    arm_id: str
+    propensity: float
+
+
+class ArrayThompsonBandit:
+    """ThompsonBandit with arm state held in contiguous NumPy arrays.
+
+    Posterior samples for every arm come from one vectorized normal draw, and
+    ``sample_many`` returns a batch of decisions, each with the probability
+    that the policy picks that arm (epsilon exploration included). Thompson
+    win probabilities have no closed form, so they are estimated from
+    ``propensity_draws`` posterior draws, once per posterior: ``update`` and
+    ``update_many`` invalidate the estimate.
+    """
+
+    # upper bound on posterior samples held in memory at once
+    chunk_elements = 1 << 20
+
+    def __init__(
+        self,
+        arm_ids: Sequence[str] = (),
+        reward_sums: Sequence[float] | np.ndarray | None = None,
+        counts: Sequence[int] | np.ndarray | None = None,
+        exploration: float = 0.15,
+        rng: np.random.Generator | None = None,
+        propensity_draws: int = 256,
+    ):
+        self.arm_ids: List[str] = list(arm_ids)
+        self.index: Dict[str, int] = {a: i for i, a in enumerate(self.arm_ids)}
+        n = len(self.arm_ids)
+        self.reward_sums = (
+            np.zeros(n) if reward_sums is None else np.array(reward_sums, dtype=float)
+        )
+        self.counts = (
+            np.zeros(n, dtype=np.int64)
+            if counts is None
+            else np.array(counts, dtype=np.int64)
+        )
+        self.exploration = exploration
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.propensity_draws = propensity_draws
+        self._propensities: np.ndarray | None = None
+
+    @classmethod
+    def from_arms(
+        cls, arms: Dict[str, ArmState], **kwargs: Any
+    ) -> "ArrayThompsonBandit":
+        return cls(
+            list(arms),
+            [s.reward_sum for s in arms.values()],
+            [s.n for s in arms.values()],
+            **kwargs,
+        )
+
+    def __len__(self) -> int:
+        return len(self.arm_ids)
+
+    @property
+    def means(self) -> np.ndarray:
+        return np.divide(
+            self.reward_sums,
+            self.counts,
+            out=np.zeros_like(self.reward_sums),
+            where=self.counts > 0,
+        )
+
+    @property
+    def sigmas(self) -> np.ndarray:
+        return 1 / np.sqrt(self.counts + 1)
+
+    def _thompson_winners(self, k: int) -> np.ndarray:
+        means, sigmas = self.means, self.sigmas
+        rows = max(1, self.chunk_elements // len(self.arm_ids))
+        winners = np.empty(k, dtype=np.int64)
+        for start in range(0, k, rows):
+            stop = min(k, start + rows)
+            draws = self.rng.normal(means, sigmas, size=(stop - start, len(means)))
+            winners[start:stop] = draws.argmax(axis=1)
+        return winners
+
+    def propensities(self) -> np.ndarray:
+        """Probability of choosing each arm under the current posterior."""
+        if self._propensities is None:
+            n = len(self.arm_ids)
+            wins = np.bincount(
+                self._thompson_winners(self.propensity_draws), minlength=n
+            )
+            self._propensities = (
+                self.exploration / n + (1 - self.exploration) * wins / wins.sum()
+            )
+        return self._propensities
+
+    def sample(self) -> str:
+        if not self.arm_ids:
+            raise ValueError("no arms")
+        if self.rng.random() < self.exploration:
+            return self.arm_ids[self.rng.integers(len(self.arm_ids))]
+        draws = self.rng.normal(self.means, self.sigmas)
+        return self.arm_ids[int(draws.argmax())]
+
+    def sample_many(self, k: int) -> List[Decision]:
+        if not self.arm_ids:
+            raise ValueError("no arms")
+        explore = self.rng.random(k) < self.exploration
+        picks = np.empty(k, dtype=np.int64)
+        picks[explore] = self.rng.integers(len(self.arm_ids), size=int(explore.sum()))
+        picks[~explore] = self._thompson_winners(int((~explore).sum()))
+        probs = self.propensities()[picks]
+        return [
+            Decision(self.arm_ids[i], float(p)) for i, p in zip(picks.tolist(), probs)
+        ]
+
+    def sample_with_propensity(self) -> Decision:
+        return self.sample_many(1)[0]
+
+    def decide_many(self, contexts: Sequence[Mapping[str, Any]]) -> List[Decision]:
+        """Context-free counterpart of ``LinUCBBandit.decide_many``."""
+        return self.sample_many(len(contexts))
+
+    def _arm_index(self, arm_id: str) -> int:
+        i = self.index.get(arm_id)
+        if i is None:
+            i = self.index[arm_id] = len(self.arm_ids)
+            self.arm_ids.append(arm_id)
+            self.reward_sums = np.append(self.reward_sums, 0.0)
+            self.counts = np.append(self.counts, 0)
+        return i
+
+    def update(self, arm_id: str, reward: float) -> None:
+        i = self._arm_index(arm_id)
+        self.reward_sums[i] += reward
+        self.counts[i] += 1
+        self._propensities = None
+
+    def update_many(
+        self, arm_ids: Sequence[str], rewards: Sequence[float] | np.ndarray
+    ) -> None:
+        idx = np.array([self._arm_index(a) for a in arm_ids], dtype=np.int64)
+        np.add.at(self.reward_sums, idx, np.asarray(rewards, dtype=float))
+        np.add.at(self.counts, idx, 1)
+        self._propensities = None
+
+    def observe(self, arm_id: str, reward: float, context: Mapping[str, Any]) -> None:
+        self.update(arm_id, reward)
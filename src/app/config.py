@@ -1,9 +1,23 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     database_url: str = "sqlite+aiosqlite:///./ecole.db"
     outbox_dir: str = "outbox"
+    answer_key_cache_size: int = 100_000
+    answer_key_ttl_s: float = 3600.0
+    attempt_stream_batch_size: int = 100
+    bandit_cache_ttl_s: float = 30.0
+    bandit_policy: Literal["thompson", "linucb"] = "thompson"
+    bandit_feature_dim: int = 64
+    bandit_ucb_alpha: float = 1.0
+    task_batch_concurrency: int = 8
+    analyst_chunk_size: int = 1_000
+    # 0 reviews in-process; otherwise the size of the CSO re-screen pool
+    cso_review_workers: int = 2
+    cso_review_chunk_size: int = 64
 
     class Config:
         env_file = ".env"
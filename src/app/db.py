@@ -1,3 +1,7 @@
+from typing import Any
+
+from sqlalchemy import String, cast, func
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
@@ -11,3 +15,17 @@ class Base(DeclarativeBase):
 settings = get_settings()
 engine = create_async_engine(settings.database_url, echo=False, future=True)
 async_session_maker = sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)  # type: ignore[call-overload]
+
+
+def dialect_insert(session: AsyncSession) -> Any:
+    """``insert`` with ON CONFLICT support for the session's database."""
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+def random_hex_id(session: AsyncSession) -> Any:
+    """SQL expression producing a fresh 32-char hex id for every row."""
+    if session.get_bind().dialect.name == "postgresql":
+        return func.replace(cast(func.gen_random_uuid(), String), "-", "")
+    return func.lower(func.hex(func.randomblob(16)))
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from uuid import UUID
 
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .bandit import ope
+from .bandit.cache import BanditCache
 from .config import get_settings
+from .db import async_session_maker
 from .deps import get_session
 from .models import AttemptLog, Play, Workstream
-from .schemas import AttemptRead
+from .schemas import AttemptRead, TaskResult
 from .llm.mock import MockLLM
 from .roles.writer import Writer
 from .roles.teacher import Teacher
@@ -23,6 +30,7 @@ from .adapters.publisher.medium_stub import MediumPublisher
 from .adapters.publisher.tpt_stub import TPTPublisher
 from .dashboards import server as dashboard
 from .math.router import router as math_router
+from .math.templater import registry as template_registry
 from .autodev.scaffolder import scaffold
 
 app = FastAPI()
@@ -32,6 +40,15 @@ settings = get_settings()
 @app.on_event("startup")
 async def startup() -> None:
     Path(settings.outbox_dir).mkdir(exist_ok=True)
+    template_registry.preload()
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    global _cso_pool
+    if _cso_pool is not None:
+        _cso_pool.shutdown(cancel_futures=True)
+        _cso_pool = None
 
 
 # Instantiate roles
@@ -46,23 +63,70 @@ publishers = {
     Workstream.tpt: TPTPublisher(),
     Workstream.x_thread: XPublisher(),
 }
-analyst = Analyst(Path("src/app/playbook/rewards.yaml"))
-ceo = CEO(writer, teacher, cso, publishers)
+bandits = BanditCache(
+    ttl=settings.bandit_cache_ttl_s,
+    policy=settings.bandit_policy,
+    dim=settings.bandit_feature_dim,
+    alpha=settings.bandit_ucb_alpha,
+)
+analyst = Analyst(
+    Path("src/app/playbook/rewards.yaml"), bandits, settings.analyst_chunk_size
+)
+ceo = CEO(writer, teacher, cso, publishers, bandits)
+_cso_pool: ProcessPoolExecutor | None = None
+
+
+def _get_cso_pool() -> ProcessPoolExecutor | None:
+    # started on first use; spawned workers do not inherit the event loop
+    global _cso_pool
+    if _cso_pool is None and settings.cso_review_workers > 0:
+        _cso_pool = ProcessPoolExecutor(
+            settings.cso_review_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _cso_pool
+
 
 app.include_router(dashboard.router)
 app.include_router(math_router, prefix="/math", tags=["math"])
 
 
-@app.post("/tasks", response_model=AttemptRead)
-async def create_task(payload: dict, session: AsyncSession = Depends(get_session)):
-    attempt = await ceo.run_task(session, payload)
+def _ensure_outbox(attempt: AttemptLog) -> None:
     path = Path(settings.outbox_dir) / str(attempt.id) / "x_post.json"
     path.parent.mkdir(parents=True, exist_ok=True)
     if not path.exists():
         path.write_text("{}", encoding="utf-8")
+
+
+@app.post("/tasks", response_model=AttemptRead)
+async def create_task(payload: dict, session: AsyncSession = Depends(get_session)):
+    attempt = await ceo.run_task(session, payload)
+    _ensure_outbox(attempt)
     return AttemptRead.model_validate(attempt)
 
 
+@app.post("/tasks/batch", response_model=list[TaskResult])
+async def create_tasks(
+    payloads: list[dict], session: AsyncSession = Depends(get_session)
+):
+    results = await ceo.run_tasks(session, payloads, settings.task_batch_concurrency)
+    out: list[TaskResult] = []
+    for result in results:
+        if isinstance(result, KeyError):
+            out.append(TaskResult(error=f"missing field {result.args[0]}"))
+        elif isinstance(result, Exception):
+            out.append(TaskResult(error=str(result)))
+        else:
+            _ensure_outbox(result)
+            out.append(TaskResult(attempt=AttemptRead.model_validate(result)))
+    return out
+
+
+@app.get("/tasks/stats")
+async def task_stats():
+    return ceo.timings.stats()
+
+
 @app.get("/attempts", response_model=list[AttemptRead])
 async def list_attempts(session: AsyncSession = Depends(get_session)):
     result = await session.execute(
@@ -82,8 +146,8 @@ async def get_attempt(attempt_id: str, session: AsyncSession = Depends(get_sessi
 
 @app.post("/metrics/simulate")
 async def simulate_metrics(session: AsyncSession = Depends(get_session)):
-    await analyst.process(session)
-    return {"status": "ok"}
+    processed = await analyst.process(session)
+    return {"status": "ok", "processed": processed}
 
 
 @app.get("/plays")
@@ -93,6 +157,38 @@ async def get_plays(session: AsyncSession = Depends(get_session)):
     return [{"id": p.id, "workstream": p.workstream} for p in plays]
 
 
+@app.get("/admin/ope/{workstream}")
+async def offline_policy_evaluation(
+    workstream: Workstream,
+    policy: list[ope.TargetPolicy] = Query(default=list(ope.TARGET_POLICIES)),
+    n_boot: int = Query(default=200, ge=10, le=2000),
+    seed: int = 0,
+    session: AsyncSession = Depends(get_session),
+):
+    return await ope.evaluate(session, workstream, policy, n_boot, seed)
+
+
+@app.post("/admin/cso/rescreen")
+async def rescreen_published(workstream: Workstream | None = None):
+    """Re-screen published payloads; one NDJSON result per attempt.
+
+    The response is streamed while pages are reviewed, so it opens its own
+    session rather than one that closes when the handler returns.
+    """
+    pool = _get_cso_pool()
+    chunk_size = settings.cso_review_chunk_size
+    page_size = chunk_size * max(1, settings.cso_review_workers) * 4
+
+    async def lines():
+        async with async_session_maker() as session:
+            async for result in cso.rescreen(
+                session, workstream, pool, chunk_size, page_size
+            ):
+                yield json.dumps(result) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @app.post("/autodev/scaffold")
 async def autodev_scaffold(spec: dict):
     path = scaffold(spec)
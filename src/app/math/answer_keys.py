@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, NamedTuple, Tuple
+
+from ..config import get_settings
+
+ANSWER_TOLERANCE = 1e-2
+
+
+class AnswerKey(NamedTuple):
+    answer: float
+    tolerance: float
+    session_id: str
+    participant_id: str
+    skill: str
+    variant: str
+
+    def is_correct(self, submitted: float) -> bool:
+        return abs(submitted - self.answer) < self.tolerance
+
+
+def answer_key_for(
+    problem_spec: Dict[str, Any],
+    variant: str,
+    session_id: str,
+    participant_id: str,
+    skill: str,
+) -> AnswerKey:
+    """Build a key straight from a stored problem_spec dict."""
+    return AnswerKey(
+        float(problem_spec["solution"]["answer"]),
+        ANSWER_TOLERANCE,
+        session_id,
+        participant_id,
+        skill,
+        variant,
+    )
+
+
+class AnswerKeyCache:
+    """Bounded LRU of answer keys by item_id, with entries expiring after ``ttl``."""
+
+    def __init__(self, maxsize: int = 100_000, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[str, Tuple[float, AnswerKey]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, item_id: str) -> AnswerKey | None:
+        entry = self._data.get(item_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, key = entry
+        if expires_at < time.monotonic():
+            del self._data[item_id]
+            self.misses += 1
+            return None
+        self._data.move_to_end(item_id)
+        self.hits += 1
+        return key
+
+    def put(self, item_id: str, key: AnswerKey) -> None:
+        self._data[item_id] = (time.monotonic() + self.ttl, key)
+        self._data.move_to_end(item_id)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def put_many(self, keys: Iterable[Tuple[str, AnswerKey]]) -> None:
+        for item_id, key in keys:
+            self.put(item_id, key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+_settings = get_settings()
+answer_keys = AnswerKeyCache(
+    maxsize=_settings.answer_key_cache_size, ttl=_settings.answer_key_ttl_s
+)
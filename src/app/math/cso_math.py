@@ -1,7 +1,27 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from pathlib import Path
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+import yaml  # type: ignore[import-untyped]
+
+from ..term_matcher import TermMatcher
+from .schemas import ContextedItem
+from .templater import StemShapes, stem_shapes
+
+MATH_POLICY_PATH = (
+    Path(__file__).resolve().parents[1] / "playbook" / "policies" / "math.yaml"
+)
+
+
+def _load_terms(path: Path = MATH_POLICY_PATH) -> TermMatcher:
+    policy = yaml.safe_load(path.read_text()) or {}
+    return TermMatcher(policy.get("forbidden_terms") or [], prefix=True)
+
+
+forbidden_terms = _load_terms()
 
 
 @dataclass
@@ -10,14 +30,60 @@ class CSOResult:
     issues: List[str]
 
 
-def policy_check(stem: str) -> CSOResult:
-    issues: List[str] = []
+class StemPolicy(NamedTuple):
+    forbidden: int
+    missing_units: bool
+
+
+def check_stem(stem: str) -> StemPolicy:
     lower = stem.lower()
-    for term in ["gun", "weapon", "kill", "shoot"]:
-        if term in lower:
-            issues.append("forbidden_term")
-    if "meter" not in lower and "foot" not in lower:
+    return StemPolicy(
+        forbidden=len(forbidden_terms.search(stem)),
+        missing_units="meter" not in lower and "foot" not in lower,
+    )
+
+
+def policy_check(stem: str) -> CSOResult:
+    checked = check_stem(stem)
+    issues = ["forbidden_term"] * checked.forbidden
+    if checked.missing_units:
         issues.append("missing_units")
 
     status = "pass" if not issues else "needs_fix"
     return CSOResult(status=status, issues=issues)
+
+
+@dataclass
+class CSOBatch:
+    """``policy_check`` for many items, one array entry per item."""
+
+    passed: np.ndarray
+    # distinct forbidden terms found in each stem
+    forbidden: np.ndarray
+    missing_units: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.passed)
+
+
+def policy_check_items(items: Sequence[ContextedItem] | StemShapes) -> CSOBatch:
+    """CSO gate for a bank of rendered items, once per stem shape.
+
+    Bound numbers never match a forbidden term unless a term contains a
+    digit; then every stem is checked as is.
+    """
+    if any(c.isdigit() for term in forbidden_terms.terms for c in term):
+        if isinstance(items, StemShapes):
+            raise ValueError("digit terms need the items, not their shapes")
+        checked = np.array([check_stem(item.stem) for item in items], dtype=np.int64)
+    else:
+        shapes = items if isinstance(items, StemShapes) else stem_shapes(items)
+        per_shape = np.array([check_stem(s) for s in shapes.stems], dtype=np.int64)
+        checked = per_shape.reshape(-1, 2)[shapes.index]
+    checked = checked.reshape(-1, 2)
+    forbidden, missing_units = checked[:, 0], checked[:, 1].astype(bool)
+    return CSOBatch(
+        passed=(forbidden == 0) & ~missing_units,
+        forbidden=forbidden,
+        missing_units=missing_units,
+    )
@@ -1,21 +1,39 @@
 from __future__ import annotations
 
+import json
 import uuid
 from datetime import datetime
-from typing import Any, List
+from typing import Any, AsyncIterator, Iterable, List, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..config import get_settings
+from ..db import dialect_insert, random_hex_id
 from ..deps import get_session
-from ..models import Attempt, Item, Participant, Session
+from ..models import (
+    Attempt,
+    Item,
+    Participant,
+    ParticipantSkillStats,
+    Session,
+    SessionStats,
+)
+from .answer_keys import AnswerKey, answer_key_for, answer_keys
 from .pairing import build_pairs
-from .schemas import AttemptIn, ProblemSpec
-from .skills.pythagorean import generate_problem
+from .schemas import AttemptIn, ContextedItem, ProblemSpec
+from .stats import record_attempt_stats, stats_payload, zero_counters
+from .skills.pythagorean import generate_problems
+from .templater import render_context
 from typing import cast, Literal
 
 router = APIRouter()
+settings = get_settings()
+
+MAX_PREFETCH = 20
 
 
 @router.post("/participants")
@@ -33,11 +51,9 @@ async def create_participant(
     return {"participant_id": participant_id}
 
 
-@router.post("/sessions")
-async def create_session(
-    payload: dict[str, Any], session: AsyncSession = Depends(get_session)
-) -> dict[str, str]:
-    participant_id: str = payload["participant_id"]
+def _session_settings(
+    payload: dict[str, Any],
+) -> tuple[str, Literal["pythagorean.find_c", "pythagorean.find_leg"], str, List[int]]:
     skill = payload.get("skill", "pythagorean.find_c")
     skill_literal = cast(Literal["pythagorean.find_c", "pythagorean.find_leg"], skill)
     n_pairs: int = payload.get("n_pairs", 5)
@@ -45,112 +61,478 @@ async def create_session(
     difficulty_mix: List[int] | None = payload.get("difficulty_mix")
     if difficulty_mix is None:
         difficulty_mix = [1, 2, 3, 1, 2][:n_pairs]
-    specs: List[ProblemSpec] = []
-    for diff in difficulty_mix:
-        specs.append(generate_problem(skill_literal, diff))
-    pairs = build_pairs(specs, motif)
-    session_id = uuid.uuid4().hex
-    session_obj = Session(
-        session_id=session_id, participant_id=participant_id, skill=skill
-    )
-    session.add(session_obj)
+    return skill, skill_literal, motif, difficulty_mix
+
+
+def _item_rows(
+    session_id: str,
+    specs: List[ProblemSpec],
+    pairs: List[Tuple[ContextedItem, ContextedItem]],
+    motif: str,
+) -> List[dict[str, Any]]:
+    rows: List[dict[str, Any]] = []
     for spec, pair in zip(specs, pairs):
+        problem_spec = spec.model_dump()
         for item in pair:
-            item_db = Item(
-                item_id=item.item_id,
-                session_id=session_id,
-                problem_spec=spec.model_dump(),
-                context_id=item.context_id,
-                variant=item.variant,
-                motif=motif,
+            rows.append(
+                {
+                    "item_id": item.item_id,
+                    "session_id": session_id,
+                    "problem_spec": problem_spec,
+                    "context_id": item.context_id,
+                    "variant": item.variant,
+                    "motif": motif,
+                    "stem": item.stem,
+                    "question": item.question,
+                    "bindings": item.bindings,
+                }
             )
-            session.add(item_db)
+    return rows
+
+
+def _cache_answer_keys(
+    item_rows: List[dict[str, Any]], owners: dict[str, Tuple[str, str]]
+) -> None:
+    """Cache keys for new items; ``owners`` maps session_id to (participant, skill)."""
+    answer_keys.put_many(
+        (
+            row["item_id"],
+            answer_key_for(
+                row["problem_spec"],
+                row["variant"],
+                row["session_id"],
+                *owners[row["session_id"]],
+            ),
+        )
+        for row in item_rows
+    )
+
+
+@router.post("/sessions")
+async def create_session(
+    payload: dict[str, Any], session: AsyncSession = Depends(get_session)
+) -> dict[str, str]:
+    participant_id: str = payload["participant_id"]
+    skill, skill_literal, motif, difficulty_mix = _session_settings(payload)
+    session_id = uuid.uuid4().hex
+    specs = generate_problems(skill_literal, difficulty_mix, session_id).to_specs()
+    pairs = build_pairs(specs, motif)
+    owner = {"session_id": session_id, "participant_id": participant_id, "skill": skill}
+    await session.execute(insert(Session), [owner])
+    await session.execute(insert(SessionStats), [{**owner, **zero_counters()}])
+    item_rows = _item_rows(session_id, specs, pairs, motif)
+    if item_rows:
+        await session.execute(insert(Item), item_rows)
     await session.commit()
+    _cache_answer_keys(item_rows, {session_id: (participant_id, skill)})
     return {"session_id": session_id}
 
 
-async def _next_item(
-    session_id: str, session: AsyncSession, claim: bool = True
-) -> Item | None:
-    result = await session.execute(
-        select(Item).where(Item.session_id == session_id).order_by(Item.created_at)
+@router.post("/sessions/batch")
+async def create_sessions_batch(
+    payload: dict[str, Any], session: AsyncSession = Depends(get_session)
+) -> dict[str, List[str]]:
+    """Start one session per participant with shared settings in one transaction."""
+    participant_ids: List[str] = payload.get("participant_ids") or []
+    if not participant_ids:
+        raise HTTPException(status_code=400, detail="participant_ids required")
+    skill, skill_literal, motif, difficulty_mix = _session_settings(payload)
+    per_session = len(difficulty_mix)
+    session_ids = [uuid.uuid4().hex for _ in participant_ids]
+    specs = [
+        spec
+        for session_id in session_ids
+        for spec in generate_problems(
+            skill_literal, difficulty_mix, session_id
+        ).to_specs()
+    ]
+    pairs = build_pairs(specs, motif)
+    item_rows: List[dict[str, Any]] = []
+    for i, session_id in enumerate(session_ids):
+        window = slice(i * per_session, (i + 1) * per_session)
+        item_rows.extend(_item_rows(session_id, specs[window], pairs[window], motif))
+    owners = [
+        {"session_id": sid, "participant_id": pid, "skill": skill}
+        for sid, pid in zip(session_ids, participant_ids)
+    ]
+    await session.execute(insert(Session), owners)
+    await session.execute(
+        insert(SessionStats), [{**owner, **zero_counters()} for owner in owners]
     )
-    items = result.scalars().all()
-    for item in items:
-        res = await session.execute(
-            select(Attempt).where(Attempt.item_id == item.item_id)
+    if item_rows:
+        await session.execute(insert(Item), item_rows)
+    await session.commit()
+    _cache_answer_keys(
+        item_rows, {sid: (pid, skill) for sid, pid in zip(session_ids, participant_ids)}
+    )
+    return {"session_ids": session_ids}
+
+
+async def _complete_if_done(session_id: str, session: AsyncSession) -> None:
+    # A session is complete once every item has an answer; items that were
+    # claimed (e.g. prefetched) but not answered yet keep it open.
+    answered = select(Attempt.attempt_id).where(
+        Attempt.item_id == Item.item_id, Attempt.answer_submitted.isnot(None)
+    )
+    open_items = select(Item.item_id).where(
+        Item.session_id == session_id, ~answered.exists()
+    )
+    await session.execute(
+        update(Session)
+        .where(
+            Session.session_id == session_id,
+            Session.completed_at.is_(None),
+            ~open_items.exists(),
         )
-        if res.scalars().first() is None:
-            if claim:
-                placeholder = Attempt(attempt_id=uuid.uuid4().hex, item_id=item.item_id)
-                session.add(placeholder)
-                await session.commit()
-            return item
-    sess = await session.get(Session, session_id)
-    if sess and not sess.completed_at:
-        sess.completed_at = datetime.utcnow()
+        .values(completed_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+
+
+class ClaimContended(Exception):
+    """A claim found no free item while unclaimed items remain."""
+
+
+async def _next_items(
+    session_id: str, session: AsyncSession, limit: int = 1, claim: bool = True
+) -> List[Item]:
+    # Anti-join: the first items of the session with no attempt row yet.
+    claimed = select(Attempt.attempt_id).where(Attempt.item_id == Item.item_id)
+    unclaimed = (
+        select(Item.item_id)
+        .where(Item.session_id == session_id, ~claimed.exists())
+        .order_by(Item.created_at)
+        .limit(limit)
+    )
+    if claim:
+        # Pick and claim in one statement; the unique constraint on
+        # attempts.item_id makes a concurrent claim of the same row a no-op,
+        # and SKIP LOCKED (PostgreSQL) lets it move on to the next item.
+        candidate = unclaimed.with_only_columns(
+            random_hex_id(session), Item.item_id
+        ).with_for_update(skip_locked=True, of=Item)
+        stmt = (
+            dialect_insert(session)(Attempt)
+            .from_select(["attempt_id", "item_id"], candidate)
+            .on_conflict_do_nothing(index_elements=["item_id"])
+            .returning(Attempt.item_id)
+        )
+        item_ids = list((await session.execute(stmt)).scalars())
         await session.commit()
-    return None
+        if not item_ids and (await session.execute(unclaimed.limit(1))).first():
+            # Every candidate was locked or taken by a concurrent claim, but
+            # the session is not done; the caller must not report it as such.
+            raise ClaimContended(session_id)
+    else:
+        item_ids = list((await session.execute(unclaimed)).scalars())
+    if not item_ids:
+        await _complete_if_done(session_id, session)
+        return []
+    if len(item_ids) == 1:
+        item = await session.get(Item, item_ids[0])
+        return [item] if item else []
+    result = await session.execute(select(Item).where(Item.item_id.in_(item_ids)))
+    by_id = {item.item_id: item for item in result.scalars()}
+    return [by_id[item_id] for item_id in item_ids]
+
+
+async def _next_item(
+    session_id: str, session: AsyncSession, claim: bool = True
+) -> Item | None:
+    items = await _next_items(session_id, session, 1, claim)
+    return items[0] if items else None
+
+
+def _item_payload(item: Item) -> dict[str, Any]:
+    if item.stem is None:
+        # rows created before stems were persisted
+        spec = ProblemSpec(**item.problem_spec)
+        units = str(spec.vars.get("units", "meters"))
+        ctx_item = render_context(item.context_id, spec, item.motif or "", units)
+        payload = ctx_item.model_dump()
+        payload["item_id"] = item.item_id
+        return payload
+    return {
+        "item_id": item.item_id,
+        "context_id": item.context_id,
+        "variant": item.variant,
+        "stem": item.stem,
+        "question": item.question,
+        "bindings": item.bindings,
+        "skill": item.problem_spec["skill"],
+        "difficulty": item.problem_spec["difficulty"],
+    }
 
 
 @router.get("/sessions/{session_id}/next")
-async def get_next_item(session_id: str, session: AsyncSession = Depends(get_session)):
-    item = await _next_item(session_id, session)
+async def get_next_item(
+    session_id: str,
+    prefetch: int | None = Query(default=None, ge=1, le=MAX_PREFETCH),
+    session: AsyncSession = Depends(get_session),
+):
+    """Claim and return the next item.
+
+    With ``?prefetch=k`` up to k items are claimed in one statement and
+    returned as ``{"items": [...]}``; answers for them may arrive in any order.
+    Answers 409 when concurrent claims hold every free item; retry then.
+    """
+    try:
+        if prefetch is not None:
+            items = await _next_items(session_id, session, prefetch)
+            return {"items": [_item_payload(item) for item in items]}
+        item = await _next_item(session_id, session)
+    except ClaimContended:
+        raise HTTPException(status_code=409, detail="item claim contended, retry")
     if item is None:
         return {"item": None}
-    spec = ProblemSpec(**item.problem_spec)
-    from .templater import render_context
+    return _item_payload(item)
+
+
+async def _load_answer_keys(
+    session: AsyncSession, item_ids: Iterable[str]
+) -> dict[str, AnswerKey]:
+    keys: dict[str, AnswerKey] = {}
+    missing: List[str] = []
+    for item_id in item_ids:
+        key = answer_keys.get(item_id)
+        if key is None:
+            missing.append(item_id)
+        else:
+            keys[item_id] = key
+    if missing:
+        result = await session.execute(
+            select(
+                Item.item_id,
+                Item.session_id,
+                Item.problem_spec,
+                Item.variant,
+                Session.participant_id,
+                Session.skill,
+            )
+            .join(Session, Session.session_id == Item.session_id)
+            .where(Item.item_id.in_(missing))
+        )
+        for row in result:
+            key = answer_key_for(
+                row.problem_spec,
+                row.variant,
+                row.session_id,
+                row.participant_id,
+                row.skill,
+            )
+            answer_keys.put(row.item_id, key)
+            keys[row.item_id] = key
+    return keys
+
 
-    units = str(spec.vars.get("units", "meters"))
-    ctx_item = render_context(item.context_id, spec, item.motif or "", units)
-    payload = ctx_item.model_dump()
-    payload["item_id"] = item.item_id
-    return payload
+_ANSWER_COLUMNS = (
+    "submitted_at",
+    "answer_submitted",
+    "first_try_correct",
+    "time_to_first_try_ms",
+    "hints_used",
+    "retries",
+)
+
+
+def _answer_row(attempt: AttemptIn, correct: bool, now: datetime) -> dict[str, Any]:
+    return {
+        "attempt_id": uuid.uuid4().hex,
+        "item_id": attempt.item_id,
+        "submitted_at": now,
+        "answer_submitted": attempt.answer_submitted,
+        "first_try_correct": correct and attempt.retries == 0,
+        "time_to_first_try_ms": 0,
+        "hints_used": attempt.hints_used,
+        "retries": attempt.retries,
+    }
+
+
+async def _record_answers(
+    session: AsyncSession, rows: List[dict[str, Any]]
+) -> set[str]:
+    """Upsert answers and return the item_ids that were written.
+
+    A claimed placeholder is filled in and a missing row is inserted; items
+    that already have an answer are left untouched and not returned.
+    """
+    stmt = dialect_insert(session)(Attempt)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["item_id"],
+        set_={column: stmt.excluded[column] for column in _ANSWER_COLUMNS},
+        where=Attempt.answer_submitted.is_(None),
+    ).returning(Attempt.item_id)
+    result = await session.execute(stmt, rows)
+    return set(result.scalars().all())
 
 
 @router.post("/attempts")
 async def log_attempt(
     attempt: AttemptIn, session: AsyncSession = Depends(get_session)
 ) -> dict[str, Any]:
-    item = await session.get(Item, attempt.item_id)
-    if not item:
+    key = (await _load_answer_keys(session, [attempt.item_id])).get(attempt.item_id)
+    if key is None:
         raise HTTPException(status_code=404, detail="item not found")
-    spec = ProblemSpec(**item.problem_spec)
-    correct = abs(attempt.answer_submitted - float(spec.solution["answer"])) < 1e-2
-    res = await session.execute(select(Attempt).where(Attempt.item_id == item.item_id))
-    existing = res.scalars().first()
-    if existing:
-        if existing.answer_submitted is None:
-            existing.submitted_at = datetime.utcnow()
-            existing.answer_submitted = attempt.answer_submitted
-            existing.first_try_correct = correct and attempt.retries == 0
-            existing.time_to_first_try_ms = 0
-            existing.hints_used = attempt.hints_used
-            existing.retries = attempt.retries
-        else:
-            attempt_db = existing
-            next_item = await _next_item(item.session_id, session)
-            next_url = f"/math/sessions/{item.session_id}/next" if next_item else None
-            return {"correct": attempt_db.first_try_correct, "next_item": next_url}
-        attempt_db = existing
-    else:
-        attempt_db = Attempt(
-            attempt_id=uuid.uuid4().hex,
-            item_id=item.item_id,
-            submitted_at=datetime.utcnow(),
-            answer_submitted=attempt.answer_submitted,
-            first_try_correct=correct and attempt.retries == 0,
-            time_to_first_try_ms=0,
-            hints_used=attempt.hints_used,
-            retries=attempt.retries,
-        )
-        session.add(attempt_db)
+    correct = key.is_correct(attempt.answer_submitted)
+    row = _answer_row(attempt, correct, datetime.utcnow())
+    if not await _record_answers(session, [row]):
+        first_try_correct = (
+            await session.execute(
+                select(Attempt.first_try_correct).where(
+                    Attempt.item_id == attempt.item_id
+                )
+            )
+        ).scalar_one()
+        try:
+            has_next = await _next_item(key.session_id, session) is not None
+        except ClaimContended:
+            has_next = True
+        next_url = f"/math/sessions/{key.session_id}/next" if has_next else None
+        return {"correct": first_try_correct, "next_item": next_url}
+    await record_attempt_stats(session, [(key, row)])
     await session.commit()
-    next_item = await _next_item(item.session_id, session, claim=False)
-    next_url = f"/math/sessions/{item.session_id}/next" if next_item else None
+    next_item = await _next_item(key.session_id, session, claim=False)
+    next_url = f"/math/sessions/{key.session_id}/next" if next_item else None
     return {"correct": correct, "next_item": next_url}
 
 
+async def _ingest_attempts(
+    session: AsyncSession, batch: List[Tuple[int, AttemptIn]]
+) -> List[dict[str, Any]]:
+    """Grade and store one batch of streamed attempts in a single transaction."""
+    keys = await _load_answer_keys(session, {attempt.item_id for _, attempt in batch})
+    now = datetime.utcnow()
+    rows: dict[str, dict[str, Any]] = {}
+    owners: dict[int, bool] = {}
+    for line, attempt in batch:
+        key = keys.get(attempt.item_id)
+        if key is None or attempt.item_id in rows:
+            continue
+        correct = key.is_correct(attempt.answer_submitted)
+        rows[attempt.item_id] = _answer_row(attempt, correct, now)
+        owners[line] = correct
+    written = await _record_answers(session, list(rows.values())) if rows else set()
+    await record_attempt_stats(
+        session, [(keys[item_id], rows[item_id]) for item_id in written]
+    )
+
+    duplicates = {
+        attempt.item_id
+        for line, attempt in batch
+        if attempt.item_id in keys
+        and (line not in owners or attempt.item_id not in written)
+    }
+    stored: dict[str, bool] = {}
+    if duplicates:
+        result = await session.execute(
+            select(Attempt.item_id, Attempt.first_try_correct).where(
+                Attempt.item_id.in_(duplicates)
+            )
+        )
+        stored = {row.item_id: row.first_try_correct for row in result}
+    await session.commit()
+
+    results: List[dict[str, Any]] = []
+    for line, attempt in batch:
+        if attempt.item_id not in keys:
+            results.append({"line": line, "error": "item not found"})
+        elif line in owners and attempt.item_id in written:
+            results.append(
+                {"line": line, "item_id": attempt.item_id, "correct": owners[line]}
+            )
+        else:
+            results.append(
+                {
+                    "line": line,
+                    "item_id": attempt.item_id,
+                    "correct": stored[attempt.item_id],
+                    "duplicate": True,
+                }
+            )
+    return results
+
+
+async def _ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+@router.post("/attempts/stream")
+async def log_attempts_stream(
+    request: Request, session: AsyncSession = Depends(get_session)
+) -> StreamingResponse:
+    """Ingest newline-delimited AttemptIn records from an offline replay.
+
+    Records are parsed as they arrive and written in batches of
+    ``attempt_stream_batch_size``, one transaction per batch. The response is
+    one JSON result per non-blank input line, in input order.
+    """
+    batch_size = settings.attempt_stream_batch_size
+    results: List[dict[str, Any]] = []
+    batch: List[Tuple[int, AttemptIn]] = []
+    line_no = 0
+    async for line in _ndjson_lines(request.stream()):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            batch.append((line_no, AttemptIn.model_validate_json(line)))
+        except ValidationError:
+            results.append({"line": line_no, "error": "invalid attempt"})
+            continue
+        if len(batch) >= batch_size:
+            results.extend(await _ingest_attempts(session, batch))
+            batch = []
+    if batch:
+        results.extend(await _ingest_attempts(session, batch))
+    results.sort(key=lambda r: r["line"])
+    return StreamingResponse(
+        (json.dumps(r) + "\n" for r in results), media_type="application/x-ndjson"
+    )
+
+
+@router.get("/sessions/{session_id}/stats")
+async def get_session_stats(
+    session_id: str, session: AsyncSession = Depends(get_session)
+) -> dict[str, Any]:
+    stats = await session.get(SessionStats, session_id)
+    if not stats:
+        raise HTTPException(status_code=404, detail="session not found")
+    return {
+        "session_id": stats.session_id,
+        "participant_id": stats.participant_id,
+        "skill": stats.skill,
+        **stats_payload(stats),
+    }
+
+
+@router.get("/participants/{participant_id}/stats")
+async def get_participant_stats(
+    participant_id: str, session: AsyncSession = Depends(get_session)
+) -> dict[str, Any]:
+    result = await session.execute(
+        select(ParticipantSkillStats).where(
+            ParticipantSkillStats.participant_id == participant_id
+        )
+    )
+    return {
+        "participant_id": participant_id,
+        "skills": {row.skill: stats_payload(row) for row in result.scalars()},
+    }
+
+
+@router.get("/answer_keys/stats")
+async def answer_key_stats() -> dict[str, int]:
+    return answer_keys.stats()
+
+
 @router.post("/sessions/{session_id}/post_quiz")
 async def post_quiz(
     session_id: str,
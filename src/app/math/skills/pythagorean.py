@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import hashlib
 import math
 import random
 import uuid
-from typing import Literal
+from dataclasses import dataclass
+from typing import List, Literal, Sequence
 
 from typing import Dict, Union
 
+import numpy as np
+
 from ..schemas import ProblemSpec
 
 # Predefined triples for easier difficulties
@@ -57,3 +61,89 @@ def generate_problem(
         vars=vars_,
         solution={"answer": answer},
     )
+
+
+_D1 = np.array(D1_TRIPLES, dtype=float)
+_D2 = np.array(D2_TRIPLES, dtype=float)
+
+
+def session_rng(seed: int | str) -> np.random.Generator:
+    """Independent generator stream for a session (or any stable key)."""
+    if isinstance(seed, str):
+        seed = int.from_bytes(hashlib.blake2b(seed.encode(), digest_size=16).digest())
+    return np.random.default_rng(np.random.SeedSequence(seed))
+
+
+@dataclass(frozen=True)
+class ProblemBatch:
+    """Column-oriented problems; ProblemSpec models are built on demand."""
+
+    skill: Literal["pythagorean.find_c", "pythagorean.find_leg"]
+    difficulty: np.ndarray
+    a: np.ndarray
+    b: np.ndarray
+    c: np.ndarray
+    answer: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.difficulty)
+
+    def spec(self, index: int) -> ProblemSpec:
+        return ProblemSpec(
+            id=uuid.uuid4().hex,
+            skill=self.skill,
+            difficulty=int(self.difficulty[index]),
+            vars={
+                "a": float(self.a[index]),
+                "b": float(self.b[index]),
+                "c": float(self.c[index]),
+            },
+            solution={"answer": float(self.answer[index])},
+        )
+
+    def to_specs(self) -> List[ProblemSpec]:
+        return [self.spec(i) for i in range(len(self))]
+
+
+def generate_problems(
+    skill: Literal["pythagorean.find_c", "pythagorean.find_leg"],
+    difficulties: Sequence[int],
+    seed: int | str,
+) -> ProblemBatch:
+    """Generate many problems at once from a generator seeded by ``seed``.
+
+    Follows the same distributions as ``generate_problem`` but draws every
+    value for the batch in a handful of array operations, and never touches
+    the shared module RNG.
+    """
+    rng = session_rng(seed)
+    diffs = np.asarray(difficulties, dtype=np.int64)
+    n = len(diffs)
+    a = np.empty(n, dtype=float)
+    b = np.empty(n, dtype=float)
+    c = np.empty(n, dtype=float)
+    if skill == "pythagorean.find_c":
+        if not np.isin(diffs, (1, 2, 3)).all():
+            raise ValueError("difficulty 1-3 for find_c")
+        for level, table in ((1, _D1), (2, _D2)):
+            mask = diffs == level
+            triples = table[rng.integers(0, len(table), size=int(mask.sum()))]
+            a[mask], b[mask], c[mask] = triples.T
+        mask = diffs == 3
+        k = int(mask.sum())
+        a[mask] = rng.integers(5, 21, size=k)
+        b[mask] = rng.integers(5, 21, size=k)
+        c[mask] = np.round(np.hypot(a[mask], b[mask]), 2)
+        answer = c
+    elif skill == "pythagorean.find_leg":
+        if not (diffs == 4).all():
+            raise ValueError("difficulty must be 4 for find_leg")
+        a[:] = rng.integers(6, 16, size=n)
+        b[:] = np.round(rng.uniform(4, 12, size=n), 2)
+        c[:] = np.round(np.hypot(a, b), 2)
+        answer = b
+    else:
+        raise ValueError("unknown skill")
+    return ProblemBatch(
+        skill=skill, difficulty=diffs, a=a, b=b, c=c, answer=answer.copy()
+    )
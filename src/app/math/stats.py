@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db import dialect_insert
+from ..models import ParticipantSkillStats, SessionStats
+from .answer_keys import AnswerKey
+
+COUNTER_COLUMNS = (
+    "attempts",
+    "first_try_correct",
+    "hints_used",
+    "retries",
+    "personalized_attempts",
+    "personalized_first_try_correct",
+    "neutral_attempts",
+    "neutral_first_try_correct",
+)
+
+
+def zero_counters() -> Dict[str, int]:
+    return dict.fromkeys(COUNTER_COLUMNS, 0)
+
+
+def _add(totals: Dict[str, Any], key: AnswerKey, row: Dict[str, Any]) -> None:
+    first_try = int(row["first_try_correct"])
+    totals["attempts"] += 1
+    totals["first_try_correct"] += first_try
+    totals["hints_used"] += row["hints_used"]
+    totals["retries"] += row["retries"]
+    totals[f"{key.variant}_attempts"] += 1
+    totals[f"{key.variant}_first_try_correct"] += first_try
+
+
+def _increment(session: AsyncSession, model: Any, index_elements: List[str]) -> Any:
+    stmt = dialect_insert(session)(model)
+    table = model.__table__
+    return stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={c: table.c[c] + stmt.excluded[c] for c in COUNTER_COLUMNS},
+    )
+
+
+async def record_attempt_stats(
+    session: AsyncSession, graded: Iterable[Tuple[AnswerKey, Dict[str, Any]]]
+) -> None:
+    """Fold newly recorded answers into the summary tables.
+
+    Runs inside the caller's transaction. Deltas are pre-aggregated, so a
+    batch costs one upsert statement per table however many answers it has.
+    """
+    by_session: Dict[str, Dict[str, Any]] = {}
+    by_participant: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for key, row in graded:
+        session_totals = by_session.get(key.session_id)
+        if session_totals is None:
+            session_totals = by_session[key.session_id] = {
+                "session_id": key.session_id,
+                "participant_id": key.participant_id,
+                "skill": key.skill,
+                **zero_counters(),
+            }
+        _add(session_totals, key, row)
+        participant_key = (key.participant_id, key.skill)
+        participant_totals = by_participant.get(participant_key)
+        if participant_totals is None:
+            participant_totals = by_participant[participant_key] = {
+                "participant_id": key.participant_id,
+                "skill": key.skill,
+                **zero_counters(),
+            }
+        _add(participant_totals, key, row)
+    if by_session:
+        await session.execute(
+            _increment(session, SessionStats, ["session_id"]),
+            list(by_session.values()),
+        )
+    if by_participant:
+        await session.execute(
+            _increment(session, ParticipantSkillStats, ["participant_id", "skill"]),
+            list(by_participant.values()),
+        )
+
+
+def stats_payload(row: Any) -> Dict[str, Any]:
+    counts = {c: getattr(row, c) for c in COUNTER_COLUMNS}
+    attempts = counts["attempts"]
+    counts["first_try_accuracy"] = (
+        counts["first_try_correct"] / attempts if attempts else None
+    )
+    return counts
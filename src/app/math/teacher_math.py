@@ -2,7 +2,19 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import re
-from typing import Dict
+from typing import Dict, NamedTuple, Sequence
+
+import numpy as np
+
+from .schemas import ContextedItem
+from .templater import StemShapes, stem_shapes
+
+CUES = ("right angle", "straight-line")
+MAX_SENTENCES = 2
+_WORD = re.compile(r"[A-Za-z]+")
+# same rule the templater checks sentence limits with: a terminator followed
+# by whitespace, so decimals such as "4.5" do not split a sentence
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
 
 
 @dataclass
@@ -11,19 +23,60 @@ class TeacherResult:
     scores: Dict[str, float]
 
 
-def evaluate_math_item(stem: str, question: str, grade_band: str) -> TeacherResult:
+class StemAnalysis(NamedTuple):
+    relevance: int
+    sentences: int
+    avg_word_len: float
+
+
+def analyze_stem(stem: str) -> StemAnalysis:
     text = stem.lower()
-    cues = ["right angle", "straight-line"]
-    relevance = sum(1 for cue in cues if cue in text)
+    sentences = [s for s in _SENTENCE_SPLIT.split(stem) if s.strip()]
+    words = _WORD.findall(stem)
+    return StemAnalysis(
+        relevance=sum(1 for cue in CUES if cue in text),
+        sentences=len(sentences),
+        avg_word_len=(sum(len(w) for w in words) / len(words)) if words else 0,
+    )
 
-    sentences = [s for s in stem.split(".") if s.strip()]
-    words = re.findall(r"[A-Za-z]+", stem)
-    avg_len = (sum(len(w) for w in words) / len(words)) if words else 0
 
+def evaluate_math_item(stem: str, question: str, grade_band: str) -> TeacherResult:
+    analysis = analyze_stem(stem)
     scores = {
-        "context_relevance": float(relevance),
-        "sentence_count": float(len(sentences)),
-        "avg_word_len": avg_len,
+        "context_relevance": float(analysis.relevance),
+        "sentence_count": float(analysis.sentences),
+        "avg_word_len": analysis.avg_word_len,
     }
-    status = "pass" if relevance >= 1 and len(sentences) <= 2 else "needs_fix"
-    return TeacherResult(status=status, scores=scores)
+    passed = analysis.relevance >= 1 and analysis.sentences <= MAX_SENTENCES
+    return TeacherResult(status="pass" if passed else "needs_fix", scores=scores)
+
+
+@dataclass
+class TeacherBatch:
+    """``evaluate_math_item`` for many items, one array entry per item."""
+
+    passed: np.ndarray
+    context_relevance: np.ndarray
+    sentence_count: np.ndarray
+    avg_word_len: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.passed)
+
+
+def evaluate_math_items(items: Sequence[ContextedItem] | StemShapes) -> TeacherBatch:
+    """Teacher gate for a bank of rendered items.
+
+    Every score depends only on the template and its non-numeric bindings,
+    so each stem shape is analyzed once (see ``StemShapes``). Pass the
+    shapes to share them with ``cso_math.policy_check_items``.
+    """
+    shapes = items if isinstance(items, StemShapes) else stem_shapes(items)
+    per_shape = np.array([analyze_stem(s) for s in shapes.stems], dtype=float)
+    relevance, sentences, avg_len = per_shape.reshape(-1, 3)[shapes.index].T
+    return TeacherBatch(
+        passed=(relevance >= 1) & (sentences <= MAX_SENTENCES),
+        context_relevance=relevance,
+        sentence_count=sentences.astype(np.int64),
+        avg_word_len=avg_len,
+    )
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import re
+import string
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Literal
+from typing import Any, Callable, Dict, List, Literal, Mapping, Sequence, Tuple
 import uuid
 
+import numpy as np
 import yaml  # type: ignore[import-untyped]
 
 from .schemas import ContextedItem, ProblemSpec
@@ -21,14 +25,130 @@ _MOTIF_MAP = {
     "Pets": "pets_backyard_v1",
 }
 
-_templates_cache: Dict[str, Dict] = {}
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+
+def _load_template(template_id: str, path: Path = _TEMPLATE_PATH) -> Dict:
+    with (path / f"{template_id}.yaml").open("r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _fields(source: str) -> Tuple[str, ...]:
+    fields: List[str] = []
+    for _, field, _, conversion in string.Formatter().parse(source):
+        if field is None:
+            continue
+        if not field.isidentifier() or conversion:
+            raise ValueError(f"unsupported placeholder {{{field}}}")
+        fields.append(field)
+    return tuple(fields)
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A context template validated once and ready to render."""
+
+    template_id: str
+    variant: Literal["personalized", "neutral"]
+    stem: str
+    question: str
+    allowed_units: Tuple[str, ...]
+    default_units: str
+    placeholders: Tuple[str, ...]
+    stem_fields: Tuple[str, ...]
+    render_stem: Callable[[Mapping[str, Any]], str]
+    render_question: Callable[[Mapping[str, Any]], str]
+    mtime_ns: int | None = None
+
+    def missing_placeholder(self, bindings: Mapping[str, Any]) -> str | None:
+        for ph in self.placeholders:
+            if ph not in bindings:
+                return ph
+        return None
+
+
+def compile_template(
+    template_id: str, raw: Dict, mtime_ns: int | None = None
+) -> CompiledTemplate:
+    stem: str = raw["stem"]
+    question: str = raw["question"]
+    stem_fields = _fields(stem)
+    _fields(question)
+
+    # Bound values are numbers and unit names, so the sentence structure of a
+    # rendered stem is fixed by the template and only needs checking once.
+    sample = stem.format_map({f: "0" for f in stem_fields})
+    sentences = [s for s in _SENTENCE_SPLIT.split(sample) if s.strip()]
+    if len(sentences) > raw.get("sentences_max", 2):
+        raise ValueError("stem exceeds sentence limit")
+
+    allowed_units = tuple(raw.get("allowed_units", []))
+    return CompiledTemplate(
+        template_id=template_id,
+        variant="neutral" if template_id == "neutral_v1" else "personalized",
+        stem=stem,
+        question=question,
+        allowed_units=allowed_units,
+        default_units=(allowed_units or ("meters",))[0],
+        placeholders=tuple(raw.get("placeholders", [])),
+        stem_fields=stem_fields,
+        render_stem=stem.format_map,
+        render_question=question.format_map,
+        mtime_ns=mtime_ns,
+    )
+
+
+@dataclass
+class _Entry:
+    template: CompiledTemplate
+    checked_at: float
+
+
+class TemplateRegistry:
+    """Compiled templates keyed by id, reloaded when their file changes.
+
+    File mtimes are checked at most once per ``check_interval`` seconds per
+    template so the render path stays free of filesystem calls.
+    """
+
+    def __init__(self, path: Path = _TEMPLATE_PATH, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._entries: Dict[str, _Entry] = {}
+
+    def preload(self) -> List[str]:
+        """Compile every template on disk; raises on the first invalid one."""
+        loaded = []
+        for file in sorted(self.path.glob("*.yaml")):
+            self._reload(file.stem, file.stat().st_mtime_ns, time.monotonic())
+            loaded.append(file.stem)
+        return loaded
 
+    def get(self, template_id: str) -> CompiledTemplate:
+        entry = self._entries.get(template_id)
+        now = time.monotonic()
+        if entry is not None and now - entry.checked_at < self.check_interval:
+            return entry.template
+        try:
+            mtime_ns = (self.path / f"{template_id}.yaml").stat().st_mtime_ns
+        except FileNotFoundError:
+            # a deleted template stops being served
+            self._entries.pop(template_id, None)
+            raise
+        if entry is None or entry.template.mtime_ns != mtime_ns:
+            return self._reload(template_id, mtime_ns, now)
+        entry.checked_at = now
+        return entry.template
 
-def _load_template(template_id: str) -> Dict:
-    if template_id not in _templates_cache:
-        with (_TEMPLATE_PATH / f"{template_id}.yaml").open("r", encoding="utf-8") as f:
-            _templates_cache[template_id] = yaml.safe_load(f)
-    return _templates_cache[template_id]
+    def _reload(self, template_id: str, mtime_ns: int, now: float) -> CompiledTemplate:
+        template = compile_template(
+            template_id, _load_template(template_id, self.path), mtime_ns
+        )
+        self._entries[template_id] = _Entry(template, now)
+        return template
+
+
+registry = TemplateRegistry()
 
 
 def render_context(
@@ -39,37 +159,96 @@ def render_context(
 ) -> ContextedItem:
     if template_id is None:
         template_id = _MOTIF_MAP.get(motif, "neutral_v1")
-    template = _load_template(template_id)
+    template = registry.get(template_id)
 
-    if units not in template.get("allowed_units", []):
-        units = template.get("allowed_units", ["meters"])[0]
+    if units not in template.allowed_units:
+        units = template.default_units
 
     bindings = {**spec.vars, "units": units}
-    stem = template["stem"].format(**bindings)
-    question = template["question"].format(**bindings)
-
-    # validate sentence count
-    sentences = [s for s in re.split(r"(?<=[.!?])\s+", stem) if s.strip()]
-    if len(sentences) > template.get("sentences_max", 2):
-        raise ValueError("stem exceeds sentence limit")
-
-    # validate placeholders
-    placeholders = template.get("placeholders", [])
-    for ph in placeholders:
-        if ph not in bindings:
-            raise ValueError(f"missing placeholder {ph}")
-
-    variant: Literal["personalized", "neutral"] = (
-        "neutral" if template_id == "neutral_v1" else "personalized"
-    )
+    missing = template.missing_placeholder(bindings)
+    if missing is not None:
+        raise ValueError(f"missing placeholder {missing}")
 
     return ContextedItem(
         item_id=uuid.uuid4().hex,
         context_id=template_id,
-        variant=variant,
-        stem=stem,
-        question=question,
+        variant=template.variant,
+        stem=template.render_stem(bindings),
+        question=template.render_question(bindings),
         bindings=bindings,
         skill=spec.skill,
         difficulty=spec.difficulty,
     )
+
+
+def _is_number(value: Any) -> bool:
+    # renders as digits and at most one decimal point, starting and ending
+    # with a digit, so it can stand in for (and be replaced by) "0"; floats
+    # outside [1e-4, 1e16) would render in scientific notation
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return value >= 0
+    if isinstance(value, float):
+        return value == 0.0 or 1e-4 <= value < 1e16
+    return False
+
+
+# cache key prefix for stems taken verbatim
+_AS_IS = object()
+
+
+@dataclass
+class StemShapes:
+    """Rendered items grouped by the parts of their stems that are not numbers.
+
+    Templates are fixed, so two items of one ``context_id`` whose
+    non-numeric stem bindings (units) match have stems that differ only in
+    digits. A stem check that does not look at digit values (words,
+    sentences, cues, terms) gives both the same answer, so it only needs to
+    run on ``stems``: one per shape, rendered with every number as ``0``.
+    ``index[i]`` is the shape of item ``i``. Items whose template is missing
+    or whose bindings do not cover the stem are their own shape.
+    """
+
+    stems: List[str]
+    index: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+def stem_shapes(items: Sequence[ContextedItem]) -> StemShapes:
+    templates: Dict[str, CompiledTemplate | None] = {}
+    shapes: Dict[Tuple[Any, ...], int] = {}
+    stems: List[str] = []
+    index = np.empty(len(items), dtype=np.int64)
+    for i, item in enumerate(items):
+        context_id = item.context_id
+        if context_id not in templates:
+            try:
+                templates[context_id] = registry.get(context_id)
+            except FileNotFoundError:
+                templates[context_id] = None
+        template = templates[context_id]
+        bindings = item.bindings
+        if template is None or not all(f in bindings for f in template.stem_fields):
+            key: Tuple[Any, ...] = (_AS_IS, item.stem)
+            shape = shapes.get(key)
+            if shape is None:
+                shape = shapes[key] = len(stems)
+                stems.append(item.stem)
+        else:
+            fields = template.stem_fields
+            values = [None if _is_number(bindings[f]) else bindings[f] for f in fields]
+            key = (context_id, *values)
+            shape = shapes.get(key)
+            if shape is None:
+                shape = shapes[key] = len(stems)
+                stems.append(
+                    template.render_stem(
+                        {f: 0 if v is None else v for f, v in zip(fields, values)}
+                    )
+                )
+        index[i] = shape
+    return StemShapes(stems, index)
@@ -0,0 +1,20 @@
+"""index items by session and attempts by item"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0003_next_item_indexes"
+down_revision = "0002_math"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_items_session_id", "items", ["session_id"])
+    op.create_index("ix_attempts_item_id", "attempts", ["item_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_attempts_item_id", table_name="attempts")
+    op.drop_index("ix_items_session_id", table_name="items")
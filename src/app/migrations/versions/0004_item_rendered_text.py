@@ -0,0 +1,24 @@
+"""persist rendered item text"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_item_rendered_text"
+down_revision = "0003_next_item_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("items", sa.Column("stem", sa.String(), nullable=True))
+    op.add_column("items", sa.Column("question", sa.String(), nullable=True))
+    op.add_column("items", sa.Column("bindings", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("items") as batch_op:
+        batch_op.drop_column("bindings")
+        batch_op.drop_column("question")
+        batch_op.drop_column("stem")
@@ -0,0 +1,49 @@
+"""one attempt row per item"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0005_attempts_unique_item"
+down_revision = "0004_item_rendered_text"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Racing claims could leave several rows for one item. Drop the
+    # unanswered duplicates, then keep the earliest answer.
+    op.execute(
+        """
+        DELETE FROM attempts
+        WHERE answer_submitted IS NULL
+          AND item_id IN (
+            SELECT item_id FROM attempts GROUP BY item_id HAVING COUNT(*) > 1
+          )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM attempts
+        WHERE EXISTS (
+          SELECT 1 FROM attempts AS earlier
+          WHERE earlier.item_id = attempts.item_id
+            AND (
+              earlier.submitted_at < attempts.submitted_at
+              OR (
+                earlier.submitted_at = attempts.submitted_at
+                AND earlier.attempt_id < attempts.attempt_id
+              )
+            )
+        )
+        """
+    )
+    op.drop_index("ix_attempts_item_id", table_name="attempts")
+    with op.batch_alter_table("attempts") as batch_op:
+        batch_op.create_unique_constraint("uq_attempts_item_id", ["item_id"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("attempts") as batch_op:
+        batch_op.drop_constraint("uq_attempts_item_id", type_="unique")
+    op.create_index("ix_attempts_item_id", "attempts", ["item_id"])
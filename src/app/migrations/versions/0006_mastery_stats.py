@@ -0,0 +1,96 @@
+"""per-session and per-participant mastery summaries"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_mastery_stats"
+down_revision = "0005_attempts_unique_item"
+branch_labels = None
+depends_on = None
+
+_COUNTERS = (
+    "attempts",
+    "first_try_correct",
+    "hints_used",
+    "retries",
+    "personalized_attempts",
+    "personalized_first_try_correct",
+    "neutral_attempts",
+    "neutral_first_try_correct",
+)
+
+_AGGREGATES = """
+    COUNT(a.attempt_id),
+    SUM(CASE WHEN a.first_try_correct THEN 1 ELSE 0 END),
+    SUM(COALESCE(a.hints_used, 0)),
+    SUM(COALESCE(a.retries, 0)),
+    SUM(CASE WHEN a.attempt_id IS NOT NULL AND i.variant = 'personalized'
+        THEN 1 ELSE 0 END),
+    SUM(CASE WHEN a.first_try_correct AND i.variant = 'personalized'
+        THEN 1 ELSE 0 END),
+    SUM(CASE WHEN a.attempt_id IS NOT NULL AND i.variant = 'neutral'
+        THEN 1 ELSE 0 END),
+    SUM(CASE WHEN a.first_try_correct AND i.variant = 'neutral'
+        THEN 1 ELSE 0 END)
+"""
+
+
+def _counter_columns() -> list[sa.Column]:
+    return [
+        sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+        for name in _COUNTERS
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "session_stats",
+        sa.Column(
+            "session_id",
+            sa.String(),
+            sa.ForeignKey("sessions.session_id"),
+            primary_key=True,
+        ),
+        sa.Column("participant_id", sa.String(), nullable=False),
+        sa.Column("skill", sa.String(), nullable=False),
+        *_counter_columns(),
+    )
+    op.create_table(
+        "participant_skill_stats",
+        sa.Column(
+            "participant_id",
+            sa.String(),
+            sa.ForeignKey("participants.participant_id"),
+            primary_key=True,
+        ),
+        sa.Column("skill", sa.String(), primary_key=True),
+        *_counter_columns(),
+    )
+    columns = ", ".join(_COUNTERS)
+    # Backfill from answered attempts; every session gets a row.
+    op.execute(
+        f"""
+        INSERT INTO session_stats (session_id, participant_id, skill, {columns})
+        SELECT s.session_id, s.participant_id, s.skill, {_AGGREGATES}
+        FROM sessions s
+        LEFT JOIN items i ON i.session_id = s.session_id
+        LEFT JOIN attempts a
+          ON a.item_id = i.item_id AND a.answer_submitted IS NOT NULL
+        GROUP BY s.session_id, s.participant_id, s.skill
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO participant_skill_stats (participant_id, skill, {columns})
+        SELECT participant_id, skill, {", ".join(f"SUM({c})" for c in _COUNTERS)}
+        FROM session_stats
+        GROUP BY participant_id, skill
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("participant_skill_stats")
+    op.drop_table("session_stats")
@@ -0,0 +1,41 @@
+"""numeric per-play reward totals"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_play_stats"
+down_revision = "0006_mastery_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    play_stats = op.create_table(
+        "play_stats",
+        sa.Column("play_id", sa.String(), sa.ForeignKey("plays.id"), primary_key=True),
+        sa.Column("reward_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("n", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_plays_workstream_active", "plays", ["workstream", "active"])
+    # JSON accessors differ between dialects and plays is small, so the
+    # backfill reads params in Python.
+    plays = sa.table("plays", sa.column("id", sa.String), sa.column("params", sa.JSON))
+    rows = op.get_bind().execute(sa.select(plays.c.id, plays.c.params)).all()
+    op.bulk_insert(
+        play_stats,
+        [
+            {
+                "play_id": play_id,
+                "reward_sum": float((params or {}).get("reward_sum", 0)),
+                "n": int((params or {}).get("n", 0)),
+            }
+            for play_id, params in rows
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_plays_workstream_active", table_name="plays")
+    op.drop_table("play_stats")
@@ -0,0 +1,29 @@
+"""time each attempt was rewarded, for incremental bandit refits"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_attempt_rewarded_at"
+down_revision = "0007_play_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "attempt_logs",
+        sa.Column("rewarded_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # rows rewarded before this column existed are read on a cache's first load
+    op.create_index(
+        "ix_attempt_logs_workstream_rewarded_at",
+        "attempt_logs",
+        ["workstream", "rewarded_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_attempt_logs_workstream_rewarded_at", table_name="attempt_logs")
+    op.drop_column("attempt_logs", "rewarded_at")
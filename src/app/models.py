@@ -10,11 +10,13 @@ from sqlalchemy import (
     DateTime,
     Enum as SAEnum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Boolean,
     Float,
+    UniqueConstraint,
     func,
 )
 from sqlalchemy.dialects.postgresql import UUID
@@ -75,9 +77,16 @@ class AttemptLog(Base):
     policy_events: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
     reward_R: Mapped[float | None] = mapped_column(Numeric, nullable=True)
     propensity: Mapped[float | None] = mapped_column(Numeric, nullable=True)
+    rewarded_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     play: Mapped["Play"] = relationship(back_populates="attempts")
 
+    __table_args__ = (
+        Index("ix_attempt_logs_workstream_rewarded_at", "workstream", "rewarded_at"),
+    )
+
 
 class Play(Base):
     __tablename__ = "plays"
@@ -89,6 +98,18 @@ class Play(Base):
 
     attempts: Mapped[list[AttemptLog]] = relationship(back_populates="play")
 
+    __table_args__ = (Index("ix_plays_workstream_active", "workstream", "active"),)
+
+
+class PlayStats(Base):
+    """Reward totals per play, only ever changed by in-SQL increments."""
+
+    __tablename__ = "play_stats"
+
+    play_id: Mapped[str] = mapped_column(ForeignKey("plays.id"), primary_key=True)
+    reward_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    n: Mapped[int] = mapped_column(Integer, default=0)
+
 
 class PolicyIncident(Base):
     __tablename__ = "policy_incidents"
@@ -142,11 +163,16 @@ class Item(Base):
     __tablename__ = "items"
 
     item_id: Mapped[str] = mapped_column(String, primary_key=True)
-    session_id: Mapped[str] = mapped_column(String, ForeignKey("sessions.session_id"))
+    session_id: Mapped[str] = mapped_column(
+        String, ForeignKey("sessions.session_id"), index=True
+    )
     problem_spec: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
     context_id: Mapped[str] = mapped_column(String, nullable=False)
     variant: Mapped[str] = mapped_column(String, nullable=False)
     motif: Mapped[str | None] = mapped_column(String, nullable=True)
+    stem: Mapped[str | None] = mapped_column(String, nullable=True)
+    question: Mapped[str | None] = mapped_column(String, nullable=True)
+    bindings: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -154,6 +180,7 @@ class Item(Base):
 
 class Attempt(Base):
     __tablename__ = "attempts"
+    __table_args__ = (UniqueConstraint("item_id", name="uq_attempts_item_id"),)
 
     attempt_id: Mapped[str] = mapped_column(String, primary_key=True)
     item_id: Mapped[str] = mapped_column(String, ForeignKey("items.item_id"))
@@ -168,3 +195,35 @@ class Attempt(Base):
     time_to_first_try_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
     hints_used: Mapped[int] = mapped_column(Integer, default=0)
     retries: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class MasteryCounters:
+    """Running totals shared by the per-session and per-participant summaries."""
+
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    first_try_correct: Mapped[int] = mapped_column(Integer, default=0)
+    hints_used: Mapped[int] = mapped_column(Integer, default=0)
+    retries: Mapped[int] = mapped_column(Integer, default=0)
+    personalized_attempts: Mapped[int] = mapped_column(Integer, default=0)
+    personalized_first_try_correct: Mapped[int] = mapped_column(Integer, default=0)
+    neutral_attempts: Mapped[int] = mapped_column(Integer, default=0)
+    neutral_first_try_correct: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class SessionStats(MasteryCounters, Base):
+    __tablename__ = "session_stats"
+
+    session_id: Mapped[str] = mapped_column(
+        String, ForeignKey("sessions.session_id"), primary_key=True
+    )
+    participant_id: Mapped[str] = mapped_column(String)
+    skill: Mapped[str] = mapped_column(String)
+
+
+class ParticipantSkillStats(MasteryCounters, Base):
+    __tablename__ = "participant_skill_stats"
+
+    participant_id: Mapped[str] = mapped_column(
+        String, ForeignKey("participants.participant_id"), primary_key=True
+    )
+    skill: Mapped[str] = mapped_column(String, primary_key=True)
@@ -1,54 +1,182 @@
 from __future__ import annotations
 
-import random
+import uuid
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
 
+import numpy as np
 import yaml  # type: ignore[import-untyped]
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..bandit.cache import BanditCache, Reward
+from ..bandit.stats import increment_play_stats
 from ..models import AttemptLog, Play
 
 
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+HORIZONS = ("metrics_1h", "metrics_24h", "metrics_72h")
+# chance that a penalty event (unsubscribe, policy strike) has happened by
+# the earliest horizon; it compounds to roughly 3x by 72h
+PENALTY_RATE = 0.01
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    z = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def uniform_draws(attempt_ids: Sequence[uuid.UUID], n: int) -> np.ndarray:
+    """``(len(attempt_ids), n)`` uniforms in [0, 1), a pure function of each id.
+
+    Counter-based: the UUID is hashed into a key and draw ``j`` is
+    SplitMix64(key + j * golden), so any attempt's draws can be recomputed on
+    their own and no generator state is shared or touched.
+    """
+    raw = np.frombuffer(b"".join(a.bytes for a in attempt_ids), dtype="<u8")
+    words = raw.reshape(-1, 2)
+    keys = _splitmix64(words[:, 0] ^ _splitmix64(words[:, 1] + _GOLDEN))
+    counters = keys[:, None] + np.arange(1, n + 1, dtype=np.uint64) * _GOLDEN
+    return (_splitmix64(counters) >> np.uint64(11)) * 2.0**-53
+
+
+@dataclass(frozen=True)
+class RewardWeights:
+    """One workstream's reward weights as a vector over its metric names.
+
+    Penalty weights are stored negated, so a reward is ``metrics @ vector``.
+    """
+
+    metrics: Tuple[str, ...]
+    vector: np.ndarray
+    penalty: np.ndarray
+
+    @classmethod
+    def compile(cls, raw: Dict[str, float]) -> "RewardWeights":
+        metrics = tuple(raw)
+        penalty = np.array([m.startswith("penalty") for m in metrics], dtype=bool)
+        weights = np.array([float(raw[m]) for m in metrics])
+        return cls(metrics, np.where(penalty, -weights, weights), penalty)
+
+
 @dataclass
 class Analyst:
     reward_path: Path
+    bandits: BanditCache | None = None
+    chunk_size: int = 1_000
 
     def __post_init__(self) -> None:
         self.weights = yaml.safe_load(self.reward_path.read_text())
+        self.reward_weights = {
+            ws: RewardWeights.compile(raw or {}) for ws, raw in self.weights.items()
+        }
+
+    def _weights(self, workstream: str) -> RewardWeights:
+        weights = self.reward_weights.get(workstream)
+        if weights is None:
+            weights = self.reward_weights[workstream] = RewardWeights.compile({})
+        return weights
+
+    def simulate_batch(
+        self, workstream: str, attempt_ids: Sequence[uuid.UUID]
+    ) -> np.ndarray:
+        """Metrics shaped (attempts, horizons, metric names), cumulative in time.
+
+        Ordinary metrics are three sorted uniforms, so 1h <= 24h <= 72h.
+        Penalty metrics are 0/1 events that, once seen, stay seen.
+        """
+        weights = self._weights(workstream)
+        k = len(weights.metrics)
+        draws = uniform_draws(attempt_ids, 3 * k).reshape(len(attempt_ids), k, 3)
+        draws.sort(axis=2)
+        events = (draws[:, :, ::-1] < PENALTY_RATE).astype(float)
+        metrics = np.where(weights.penalty[None, :, None], events, draws)
+        return metrics.transpose(0, 2, 1)
 
     def simulate_metrics(self, attempt: AttemptLog) -> None:
-        seed = int(attempt.id.int % (2**32))
-        random.seed(seed)
-        attempt.metrics_1h = {"value": random.random()}
-        attempt.metrics_24h = {"value": random.random()}
-        attempt.metrics_72h = {"value": random.random()}
+        weights = self._weights(attempt.workstream.value)
+        metrics = self.simulate_batch(attempt.workstream.value, [attempt.id])[0]
+        for horizon, values in zip(HORIZONS, metrics):
+            setattr(attempt, horizon, dict(zip(weights.metrics, values.tolist())))
 
     def compute_reward(self, workstream: str, metrics: dict[str, float]) -> float:
-        weights = self.weights.get(workstream, {})
-        reward = 0.0
-        for k, w in weights.items():
-            if k.startswith("penalty"):
-                continue
-            reward += metrics.get(k, 0) * w
-        return reward
-
-    async def process(self, session: AsyncSession) -> None:
-        result = await session.execute(
-            select(AttemptLog).where(AttemptLog.reward_R.is_(None))
+        weights = self._weights(workstream)
+        values = np.array([float(metrics.get(m, 0)) for m in weights.metrics])
+        return float(values @ weights.vector)
+
+    def score_batch(
+        self, workstream: str, attempt_ids: Sequence[uuid.UUID]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Simulated metrics and 72h rewards for a batch of one workstream."""
+        metrics = self.simulate_batch(workstream, attempt_ids)
+        return metrics, metrics[:, -1, :] @ self._weights(workstream).vector
+
+    async def process(
+        self, session: AsyncSession, chunk_size: int | None = None
+    ) -> int:
+        """Reward every unscored attempt, committing one chunk at a time.
+
+        Chunks are read in primary-key order with keyset pagination, so
+        memory stays bounded by ``chunk_size``. A chunk's rewards and its
+        play_stats increments commit together, and committed rows are no
+        longer unscored, so an interrupted run resumes where it stopped.
+        Returns the number of attempts rewarded.
+        """
+        chunk_size = chunk_size or self.chunk_size
+        last_id: uuid.UUID | None = None
+        processed = 0
+        while True:
+            stmt = (
+                select(AttemptLog)
+                .where(AttemptLog.reward_R.is_(None))
+                .order_by(AttemptLog.id)
+                .limit(chunk_size)
+            )
+            if last_id is not None:
+                stmt = stmt.where(AttemptLog.id > last_id)
+            attempts = (await session.scalars(stmt)).all()
+            if not attempts:
+                return processed
+            await self._process_chunk(session, attempts)
+            last_id = attempts[-1].id
+            processed += len(attempts)
+
+    async def _process_chunk(
+        self, session: AsyncSession, attempts: Sequence[AttemptLog]
+    ) -> None:
+        known = set(
+            await session.scalars(
+                select(Play.id).where(Play.id.in_({a.play_id for a in attempts}))
+            )
         )
-        attempts = result.scalars().all()
+        by_workstream: Dict[str, List[AttemptLog]] = {}
         for attempt in attempts:
-            self.simulate_metrics(attempt)
-            metrics = dict(attempt.metrics_72h or {})
-            attempt.reward_R = self.compute_reward(attempt.workstream.value, metrics)
-            play = await session.get(Play, attempt.play_id)
-            if play:
-                params = play.params or {}
-                params["reward_sum"] = params.get("reward_sum", 0) + float(
-                    attempt.reward_R
+            by_workstream.setdefault(attempt.workstream.value, []).append(attempt)
+        deltas: Dict[str, Tuple[float, int]] = {}
+        rewards: List[Reward] = []
+        # BanditCache folds in newly rewarded rows by this stamp
+        rewarded_at = datetime.utcnow()
+        for workstream, group in by_workstream.items():
+            names = self._weights(workstream).metrics
+            metrics, scores = self.score_batch(workstream, [a.id for a in group])
+            for attempt, horizons, reward in zip(
+                group, metrics.tolist(), scores.tolist()
+            ):
+                for horizon, values in zip(HORIZONS, horizons):
+                    setattr(attempt, horizon, dict(zip(names, values)))
+                attempt.reward_R = reward
+                attempt.rewarded_at = rewarded_at
+                if attempt.play_id not in known:
+                    continue
+                reward_sum, n = deltas.get(attempt.play_id, (0.0, 0))
+                deltas[attempt.play_id] = (reward_sum + reward, n + 1)
+                rewards.append(
+                    (attempt.workstream, attempt.play_id, reward, attempt.context or {})
                 )
-                params["n"] = params.get("n", 0) + 1
-                play.params = params
+        await increment_play_stats(session, deltas)
         await session.commit()
+        if self.bandits is not None:
+            self.bandits.record(rewards)
@@ -1,78 +1,225 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict
+import asyncio
+import time
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple, TypeVar
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..bandit.thompson import ThompsonBandit, ArmState
-from ..models import AttemptLog, Play, Workstream, CSOStatus, ShipAction
-from ..schemas import TaskSpec
+from ..bandit.cache import BanditCache
+from ..bandit.thompson import Decision
+from ..models import AttemptLog, Workstream, CSOStatus, ShipAction
+from ..schemas import Draft, TaskSpec
 from ..adapters.publisher.base import BasePublisher
 from ..roles.writer import Writer
 from ..roles.teacher import Teacher
 from ..roles.cso import CSO
 
+T = TypeVar("T")
+
+
+def _task_error(exc: BaseException) -> Exception:
+    # cancellation and interpreter exits are not a task's own failure
+    if not isinstance(exc, Exception):
+        raise exc
+    return exc
+
+
+@dataclass
+class StageStats:
+    count: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+
+class StageTimings:
+    """Wall-clock totals per pipeline stage, kept in process."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, StageStats] = {}
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = self.stages.setdefault(stage, StageStats())
+            stats.count += 1
+            stats.total_s += elapsed
+            stats.max_s = max(stats.max_s, elapsed)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage: {
+                "count": s.count,
+                "mean_ms": 1000 * s.total_s / s.count,
+                "max_ms": 1000 * s.max_s,
+            }
+            for stage, s in self.stages.items()
+        }
+
 
 @dataclass
 class CEO:
+    """Runs a task as async stages: choose, write, review, publish, commit.
+
+    Writer, gates and publisher are synchronous and run on ``executor`` (the
+    loop's default thread pool when None) so file I/O and regex scanning do
+    not block the event loop. Teacher and CSO review the same draft
+    concurrently; only the CSO mutates it (disclosures), and the Teacher reads
+    nothing but the text.
+    """
+
     writer: Writer
     teacher: Teacher
     cso: CSO
     publishers: Dict[Workstream, BasePublisher]
+    bandits: BanditCache = field(default_factory=BanditCache)
+    executor: Executor | None = None
+    timings: StageTimings = field(default_factory=StageTimings)
 
-    async def choose_play(self, session: AsyncSession, workstream: Workstream) -> Play:
-        result = await session.execute(
-            select(Play).where(Play.workstream == workstream, Play.active.is_(True))
-        )
-        plays = result.scalars().all()
-        bandit = ThompsonBandit(
-            {
-                p.id: ArmState(
-                    reward_sum=p.params.get("reward_sum", 0),
-                    n=p.params.get("n", 0),
-                )
-                for p in plays
-            }
-        )
-        play_id = bandit.sample()
-        return next(p for p in plays if p.id == play_id)
+    async def _stage(self, stage: str, fn: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        with self.timings.time(stage):
+            return await loop.run_in_executor(self.executor, fn, *args)
 
-    async def run_task(self, session: AsyncSession, payload: dict) -> AttemptLog:
-        workstream = Workstream(payload.get("workstream", "x_post"))
-        play = await self.choose_play(session, workstream)
-        spec = TaskSpec(
+    async def choose_play(
+        self, session: AsyncSession, workstream: Workstream, payload: dict
+    ) -> Decision:
+        with self.timings.time("choose_play"):
+            bandit = await self.bandits.get(session, workstream)
+            return bandit.decide_many([payload])[0]
+
+    def _spec(self, payload: dict, workstream: Workstream, play_id: str) -> TaskSpec:
+        return TaskSpec(
             objective=payload.get("objective", "subs"),
             workstream=workstream,
             topic=payload["topic"],
             audience=payload["audience"],
             tone=payload.get("tone", ""),
-            play_id=play.id,
+            play_id=play_id,
+        )
+
+    async def _draft(self, spec: TaskSpec, payload: dict) -> Tuple[AttemptLog, Draft]:
+        draft = await self._stage("write", self.writer.write, spec)
+        teacher_res, cso_res = await asyncio.gather(
+            self._stage("teacher", self.teacher.review, draft),
+            self._stage("cso", self.cso.review, spec.workstream.value, draft),
         )
-        draft = self.writer.write(spec)
-        teacher_res = self.teacher.review(draft)
-        cso_res = self.cso.review(workstream.value, draft)
         ship = (
             ShipAction.publish
             if teacher_res.status == "pass" and cso_res.status == "pass"
             else ShipAction.revise
         )
         attempt = AttemptLog(
-            workstream=workstream,
-            play_id=play.id,
+            workstream=spec.workstream,
+            play_id=spec.play_id,
             context=payload,
             cso_status=CSOStatus(cso_res.status),
             cso_issues=[i.dict() for i in cso_res.issues],
             teacher_scores=teacher_res.teacher_scores,
             ship_action=ship,
         )
-        session.add(attempt)
+        return attempt, draft
+
+    def _publish(self, attempt: AttemptLog, draft: Draft) -> str | None:
+        if attempt.ship_action != ShipAction.publish:
+            return None
+        return self.publishers[attempt.workstream].publish(str(attempt.id), draft)
+
+    async def run_task(self, session: AsyncSession, payload: dict) -> AttemptLog:
+        workstream = Workstream(payload.get("workstream", "x_post"))
+        decision = await self.choose_play(session, workstream, payload)
+        spec = self._spec(payload, workstream, decision.arm_id)
+        attempt, draft = await self._draft(spec, payload)
+        attempt.propensity = decision.propensity
+        with self.timings.time("flush"):
+            session.add(attempt)
+            await session.flush()
+        attempt.publisher_payload_path = await self._stage(
+            "publish", self._publish, attempt, draft
+        )
+        with self.timings.time("commit"):
+            await session.commit()
+            await session.refresh(attempt)
+        return attempt
+
+    async def run_tasks(
+        self, session: AsyncSession, payloads: List[dict], concurrency: int
+    ) -> List[AttemptLog | Exception]:
+        """Run many tasks and commit every AttemptLog in one transaction.
+
+        Plays are drawn with one bandit batch per workstream, and drafting and
+        publishing run in worker threads, at most ``concurrency`` at a time.
+        Results are in payload order. A task that cannot be built, drafted or
+        published gets its exception in place of an attempt; the others are
+        still committed.
+        """
+        results: List[AttemptLog | Exception | None] = [None] * len(payloads)
+        by_workstream: Dict[Workstream, List[int]] = {}
+        for i, payload in enumerate(payloads):
+            try:
+                workstream = Workstream(payload.get("workstream", "x_post"))
+            except ValueError as exc:
+                results[i] = exc
+                continue
+            by_workstream.setdefault(workstream, []).append(i)
+
+        specs: List[Tuple[int, TaskSpec, Decision]] = []
+        for workstream, indexes in by_workstream.items():
+            bandit = await self.bandits.get(session, workstream)
+            try:
+                decisions = bandit.decide_many([payloads[i] for i in indexes])
+            except ValueError as exc:
+                for i in indexes:
+                    results[i] = exc
+                continue
+            for i, decision in zip(indexes, decisions):
+                try:
+                    spec = self._spec(payloads[i], workstream, decision.arm_id)
+                    specs.append((i, spec, decision))
+                except (KeyError, ValueError) as exc:
+                    results[i] = exc
+
+        limit = asyncio.Semaphore(concurrency)
+
+        async def bounded(stage: Awaitable[T]) -> T:
+            async with limit:
+                return await stage
+
+        drafts = await asyncio.gather(
+            *(bounded(self._draft(spec, payloads[i])) for i, spec, _ in specs),
+            return_exceptions=True,
+        )
+        drafted: List[Tuple[int, AttemptLog, Draft]] = []
+        for (i, _, decision), outcome in zip(specs, drafts):
+            if isinstance(outcome, BaseException):
+                results[i] = _task_error(outcome)
+                continue
+            attempt, draft = outcome
+            attempt.propensity = decision.propensity
+            results[i] = attempt
+            drafted.append((i, attempt, draft))
+        session.add_all([attempt for _, attempt, _ in drafted])
         await session.flush()
-        if ship == ShipAction.publish:
-            publisher = self.publishers[workstream]
-            path = publisher.publish(str(attempt.id), draft)
-            attempt.publisher_payload_path = path
+        paths = await asyncio.gather(
+            *(
+                bounded(self._stage("publish", self._publish, attempt, draft))
+                for _, attempt, draft in drafted
+            ),
+            return_exceptions=True,
+        )
+        for (i, attempt, _), path in zip(drafted, paths):
+            if isinstance(path, BaseException):
+                # like run_task, an attempt that failed to publish is not kept
+                results[i] = _task_error(path)
+                await session.delete(attempt)
+            else:
+                attempt.publisher_payload_path = path
         await session.commit()
-        await session.refresh(attempt)
-        return attempt
+        return [r for r in results if r is not None]
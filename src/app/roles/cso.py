@@ -1,44 +1,224 @@
 from __future__ import annotations
 
-import re
-from dataclasses import dataclass
+import asyncio
+import json
+import uuid
+from collections import deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+)
 
-import yaml  # type: ignore[import-untyped]
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..models import AttemptLog, PolicyIncident, Workstream
 from ..schemas import Draft, GateResult, Issue
+from .policy_engine import PolicyEngine, load_policies
+
+AFFILIATE_DISCLOSURE = "This may contain affiliate links."
+
+# one CSO per policy directory in each pool worker, so a worker compiles a
+# workstream's policies once rather than once per chunk
+_worker_csos: Dict[Path, "CSO"] = {}
+
+
+def _review_chunk(
+    policy_dir: Path, workstream: str, drafts: List[Draft]
+) -> List[GateResult]:
+    cso = _worker_csos.get(policy_dir)
+    if cso is None:
+        cso = _worker_csos[policy_dir] = CSO(policy_dir)
+    return [cso.review(workstream, draft) for draft in drafts]
+
+
+def _needs_disclosure(draft: Draft) -> bool:
+    return "affiliate" in draft.text.lower() and "affiliate" not in " ".join(
+        draft.metadata.get("disclosures", [])
+    )
 
 
 @dataclass
 class CSO:
     policy_dir: Path
+    engine: PolicyEngine = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.engine = PolicyEngine(self.policy_dir)
 
     def load_policies(self, workstream: str) -> dict[str, Any]:
-        common = yaml.safe_load((self.policy_dir / "common.yaml").read_text())
-        specific_path = self.policy_dir / f"{workstream}.yaml"
-        specific = {}
-        if specific_path.exists():
-            specific = yaml.safe_load(specific_path.read_text())
-        merged = {**common, **specific}
-        return merged
+        return load_policies(self.policy_dir, workstream)
 
     def review(self, workstream: str, draft: Draft) -> GateResult:
-        policies = self.load_policies(workstream)
         text = draft.text
-        issues: list[Issue] = []
-        for pattern in policies.get("forbidden", []):
-            if re.search(pattern, text, re.IGNORECASE):
-                issues.append(Issue(severity="high", code="forbidden", message=pattern))
-        for pattern in policies.get("pii", []):
-            if re.search(pattern, text, re.IGNORECASE):
-                issues.append(Issue(severity="high", code="pii", message=pattern))
+        compiled = self.engine.get(workstream)
+        # one issue per rule that fired, in policy order, with all its spans
+        by_rule: Dict[tuple[str, str], List[tuple[int, int]]] = {}
+        for m in compiled.scan(text):
+            by_rule.setdefault((m.code, m.pattern), []).append((m.start, m.end))
+        issues: list[Issue] = [
+            Issue(
+                severity="high",
+                code=code,
+                message=pattern,
+                spans=by_rule[code, pattern],
+            )
+            for code, pattern in compiled.rules
+            if (code, pattern) in by_rule
+        ]
         auto_fixes: list[str] = []
-        if "affiliate" in text.lower() and "affiliate" not in " ".join(
-            draft.metadata.get("disclosures", [])
-        ):
-            disclosure = "This may contain affiliate links."
-            draft.metadata.setdefault("disclosures", []).append(disclosure)
+        if _needs_disclosure(draft):
+            draft.metadata.setdefault("disclosures", []).append(AFFILIATE_DISCLOSURE)
             auto_fixes.append("affiliate_disclosure")
         status = "pass" if not issues else "needs_fix"
         return GateResult(status=status, issues=issues, auto_fixes_applied=auto_fixes)
+
+    def review_many(
+        self,
+        workstream: str,
+        drafts: Iterable[Draft],
+        pool: Executor | None = None,
+        chunk_size: int = 64,
+        max_in_flight: int = 8,
+    ) -> Iterator[GateResult]:
+        """Review drafts in ``chunk_size`` chunks on ``pool``, in input order.
+
+        Results are yielded as soon as their chunk is done, with at most
+        ``max_in_flight`` chunks submitted ahead, so memory stays bounded for
+        any number of drafts. A process pool reviews copies of the drafts;
+        disclosures it adds are applied to the originals here, as ``review``
+        would have. Without a pool the drafts are reviewed inline.
+        """
+        if pool is None:
+            for draft in drafts:
+                yield self.review(workstream, draft)
+            return
+        in_flight: Deque[Tuple[List[Draft], Future[List[GateResult]]]] = deque()
+        it = iter(drafts)
+        while chunk := list(islice(it, chunk_size)):
+            in_flight.append(
+                (chunk, pool.submit(_review_chunk, self.policy_dir, workstream, chunk))
+            )
+            if len(in_flight) >= max_in_flight:
+                yield from self._collect(*in_flight.popleft())
+        while in_flight:
+            yield from self._collect(*in_flight.popleft())
+
+    def _collect(
+        self, drafts: List[Draft], future: Future[List[GateResult]]
+    ) -> Iterator[GateResult]:
+        for draft, result in zip(drafts, future.result()):
+            if "affiliate_disclosure" in result.auto_fixes_applied:
+                draft.metadata.setdefault("disclosures", []).append(
+                    AFFILIATE_DISCLOSURE
+                )
+            yield result
+
+    async def rescreen(
+        self,
+        session: AsyncSession,
+        workstream: Workstream | None = None,
+        pool: Executor | None = None,
+        chunk_size: int = 64,
+        page_size: int = 512,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Review every published payload again under the current policies.
+
+        Published attempts are paged by primary key, ``page_size`` at a time.
+        Each page's payloads are read and reviewed with ``review_many`` off
+        the event loop. Its issues replace the attempts' PolicyIncident rows
+        in one commit, and then one result per attempt is yielded.
+        """
+        last_id: uuid.UUID | None = None
+        while True:
+            stmt = (
+                select(
+                    AttemptLog.id,
+                    AttemptLog.workstream,
+                    AttemptLog.publisher_payload_path,
+                )
+                .where(AttemptLog.publisher_payload_path.is_not(None))
+                .order_by(AttemptLog.id)
+                .limit(page_size)
+            )
+            if workstream is not None:
+                stmt = stmt.where(AttemptLog.workstream == workstream)
+            if last_id is not None:
+                stmt = stmt.where(AttemptLog.id > last_id)
+            rows = (await session.execute(stmt)).all()
+            if not rows:
+                return
+            last_id = rows[-1].id
+            for result in await self._rescreen_page(session, rows, pool, chunk_size):
+                yield result
+
+    async def _rescreen_page(
+        self,
+        session: AsyncSession,
+        rows: Sequence[Any],
+        pool: Executor | None,
+        chunk_size: int,
+    ) -> List[dict[str, Any]]:
+        results, incidents = await asyncio.to_thread(
+            self._review_page, rows, pool, chunk_size
+        )
+        # incidents are replaced, not appended, so a re-screen is idempotent;
+        # attempts whose payload could not be read keep their old ones
+        reviewed = [a for a, _, _ in rows if "error" not in results[a]]
+        if reviewed:
+            await session.execute(
+                delete(PolicyIncident).where(PolicyIncident.attempt_id.in_(reviewed))
+            )
+        if incidents:
+            await session.execute(insert(PolicyIncident), incidents)
+        await session.commit()
+        return [results[attempt_id] for attempt_id, _, _ in rows]
+
+    def _review_page(
+        self, rows: Sequence[Any], pool: Executor | None, chunk_size: int
+    ) -> Tuple[Dict[uuid.UUID, dict[str, Any]], List[dict[str, Any]]]:
+        # runs in a worker thread: reads the payloads and reviews them
+        results: Dict[uuid.UUID, dict[str, Any]] = {}
+        by_workstream: Dict[str, List[Tuple[uuid.UUID, Draft]]] = {}
+        for attempt_id, ws, path in rows:
+            base = {"attempt_id": str(attempt_id), "workstream": ws.value}
+            try:
+                payload = json.loads(Path(path).read_text(encoding="utf-8"))
+                draft = Draft.model_validate(payload["draft"])
+            except (OSError, ValueError, KeyError):
+                results[attempt_id] = {**base, "error": "payload unreadable"}
+                continue
+            by_workstream.setdefault(ws.value, []).append((attempt_id, draft))
+
+        incidents: List[dict[str, Any]] = []
+        for ws, group in by_workstream.items():
+            drafts = [draft for _, draft in group]
+            reviewed = self.review_many(ws, drafts, pool, chunk_size)
+            for (attempt_id, _), result in zip(group, reviewed):
+                results[attempt_id] = {
+                    "attempt_id": str(attempt_id),
+                    "workstream": ws,
+                    "status": result.status,
+                    "issues": [i.model_dump() for i in result.issues],
+                }
+                incidents.extend(
+                    {
+                        "attempt_id": attempt_id,
+                        "code": issue.code,
+                        "severity": issue.severity,
+                        "notes": issue.message,
+                    }
+                    for issue in result.issues
+                )
+        return results, incidents
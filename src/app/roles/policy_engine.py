@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+import yaml  # type: ignore[import-untyped]
+
+from ..term_matcher import TermMatcher
+
+# policy keys that hold regex rules, in the order their issues are reported;
+# literal terms live under ``forbidden_terms``
+RULE_CODES = ("forbidden", "pii")
+
+
+class PolicyMatch(NamedTuple):
+    code: str
+    pattern: str
+    start: int
+    end: int
+
+
+def load_policies(policy_dir: Path, workstream: str) -> Dict[str, Any]:
+    """``common.yaml`` with top-level keys overridden by ``<workstream>.yaml``."""
+    common = yaml.safe_load((policy_dir / "common.yaml").read_text()) or {}
+    specific_path = policy_dir / f"{workstream}.yaml"
+    specific: Dict[str, Any] = {}
+    if specific_path.exists():
+        specific = yaml.safe_load(specific_path.read_text()) or {}
+    return {**common, **specific}
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    """One workstream's terms and regex rules, screened in one pass."""
+
+    terms: TermMatcher
+    patterns: Tuple[Tuple[str, str], ...]
+    regex: re.Pattern[str] | None
+    singles: Tuple[re.Pattern[str], ...]
+
+    @classmethod
+    def compile(cls, policies: Dict[str, Any]) -> "CompiledPolicy":
+        terms = TermMatcher(str(t) for t in policies.get("forbidden_terms") or [])
+        patterns = tuple(
+            (code, str(pattern))
+            for code in RULE_CODES
+            for pattern in policies.get(code) or []
+        )
+        singles = tuple(re.compile(p, re.IGNORECASE) for _, p in patterns)
+        regex = None
+        if patterns:
+            regex = re.compile(
+                "|".join(f"(?:{p})" for _, p in patterns),
+                re.IGNORECASE,
+            )
+        return cls(terms, patterns, regex, singles)
+
+    @property
+    def rules(self) -> Tuple[Tuple[str, str], ...]:
+        """``(code, term or pattern)`` of every rule, in reporting order."""
+        return tuple(("forbidden", t) for t in self.terms.terms) + self.patterns
+
+    def scan(self, text: str) -> List[PolicyMatch]:
+        matches = [
+            PolicyMatch("forbidden", m.term, m.start, m.end)
+            for m in self.terms.scan(text)
+        ]
+        # The alternation only screens: it reports one match per position, so
+        # a rule matching inside another rule's match is hidden. Once anything
+        # fires, every rule is scanned on its own.
+        if self.regex is not None and self.regex.search(text) is not None:
+            matches.extend(
+                PolicyMatch(code, pattern, m.start(), m.end())
+                for (code, pattern), single in zip(self.patterns, self.singles)
+                for m in single.finditer(text)
+            )
+        return sorted(matches, key=lambda m: (m.start, m.end))
+
+
+class PolicyEngine:
+    """Compiled policies per workstream, recompiled when their YAML changes."""
+
+    def __init__(self, policy_dir: Path):
+        self.policy_dir = policy_dir
+        self.loads = 0
+        self._compiled: Dict[str, Tuple[Tuple[int, ...], CompiledPolicy]] = {}
+
+    def _mtimes(self, workstream: str) -> Tuple[int, ...]:
+        stamps = []
+        for name in ("common", workstream):
+            try:
+                stamps.append(os.stat(self.policy_dir / f"{name}.yaml").st_mtime_ns)
+            except FileNotFoundError:
+                stamps.append(-1)
+        return tuple(stamps)
+
+    def get(self, workstream: str) -> CompiledPolicy:
+        mtimes = self._mtimes(workstream)
+        entry = self._compiled.get(workstream)
+        if entry is not None and entry[0] == mtimes:
+            return entry[1]
+        # concurrent reviewers may both compile; either result is current
+        compiled = CompiledPolicy.compile(load_policies(self.policy_dir, workstream))
+        self.loads += 1
+        self._compiled[workstream] = (mtimes, compiled)
+        return compiled
+
+    def scan(self, workstream: str, text: str) -> List[PolicyMatch]:
+        """Every rule match in ``text``, ordered by position."""
+        return self.get(workstream).scan(text)
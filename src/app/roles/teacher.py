@@ -1,13 +1,172 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+from collections import Counter
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, List, NamedTuple
 
 import yaml  # type: ignore[import-untyped]
 
 from ..schemas import Draft, GateResult, Issue
 
+_WORD = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)*")
+_VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+# keyword flags, by word prefix ("learn" covers "learning") or exact word
+_PREFIXES = {
+    "learn": "learn",
+    "remember": "remember",
+    "understand": "understand",
+    "apply": "apply",
+    "appli": "apply",
+    "example": "example",
+    "recap": "recap",
+    "http": "http",
+}
+_WORDS = {"may": "may", "might": "might"}
+
+
+@lru_cache(maxsize=65_536)
+def syllables(word: str) -> int:
+    """Vowel-group estimate of a lower-case word's syllables, at least 1."""
+    count = len(_VOWEL_GROUPS.findall(word))
+    if word.endswith("e") and not word.endswith(("le", "ee")) and count > 1:
+        count -= 1
+    return max(count, 1)
+
+
+@lru_cache(maxsize=65_536)
+def _keywords(word: str) -> frozenset[str]:
+    found = {flag for prefix, flag in _PREFIXES.items() if word.startswith(prefix)}
+    if word in _WORDS:
+        found.add(_WORDS[word])
+    return frozenset(found)
+
+
+class _Token(NamedTuple):
+    words: int
+    syllables: int
+    flags: frozenset[str]
+    ends_sentence: bool
+    questions: int
+
+
+@lru_cache(maxsize=65_536)
+def _token(token: str) -> _Token:
+    # one whitespace-separated token, already lower-cased; a token can hold
+    # several words ("tone:warm") and trailing punctuation ("apply?")
+    ends = token[-1] in ".!?"
+    questions = token.count("?")
+    if token.startswith(("http://", "https://")):
+        return _Token(0, 0, frozenset({"http"}), ends, questions)
+    words = _WORD.findall(token)
+    flags = frozenset().union(*map(_keywords, words))
+    return _Token(len(words), sum(map(syllables, words)), flags, ends, questions)
+
+
+def flesch_kincaid_grade(words: int, sentences: int, syllable_count: int) -> float:
+    if not words:
+        return 0.0
+    grade = 0.39 * words / max(sentences, 1) + 11.8 * syllable_count / words - 15.59
+    return round(grade, 1)
+
+
+@dataclass(frozen=True)
+class TextFeatures:
+    learning_goal_present: int
+    cognitive_progression: float
+    retrieval_presence: int
+    reading_level_max_grade: float
+    udl_accessibility: float
+    claims_softened_or_cited: int
+    word_count: int
+    sentence_count: int
+
+    def scores(self) -> dict[str, Any]:
+        # a flat copy; dataclasses.asdict deep-copies and costs 15x more
+        return dict(vars(self))
+
+
+def extract_features(text: str) -> TextFeatures:
+    """Every Teacher feature from one sweep over ``text``.
+
+    The text is split on whitespace once; everything else (words, syllables,
+    keywords, sentence ends) is a memoized function of each distinct token,
+    weighted by how often it occurs, so repeated vocabulary costs nothing.
+    """
+    tokens = text.lower().split()
+    words = syllable_count = questions = sentences = 0
+    flags: set[str] = set()
+    for token, n in Counter(tokens).items():
+        info = _token(token)
+        words += info.words * n
+        syllable_count += info.syllables * n
+        questions += info.questions * n
+        sentences += info.ends_sentence * n
+        flags |= info.flags
+    if tokens and not _token(tokens[-1]).ends_sentence:
+        sentences += 1
+    return TextFeatures(
+        learning_goal_present=int("learn" in flags),
+        cognitive_progression=(
+            0.7 if {"remember", "understand", "apply"} <= flags else 0.0
+        ),
+        retrieval_presence=questions,
+        reading_level_max_grade=flesch_kincaid_grade(words, sentences, syllable_count),
+        udl_accessibility=0.7 if flags & {"example", "recap"} else 0.0,
+        claims_softened_or_cited=int(bool(flags & {"may", "might", "http"})),
+        word_count=words,
+        sentence_count=sentences,
+    )
+
+
+Check = Callable[[TextFeatures], "Issue | None"]
+_FEATURES = {f.name for f in fields(TextFeatures)}
+
+
+def _absent_feature(_: TextFeatures) -> int:
+    return 0
+
+
+def _compile_rule(rule: dict[str, Any]) -> List[Check]:
+    key = rule["key"]
+    value: Callable[[TextFeatures], Any]
+    if key in _FEATURES:
+        value = attrgetter(key)
+    else:
+        value = _absent_feature
+    checks: List[Check] = []
+    if rule.get("required"):
+        checks.append(
+            lambda f: (
+                None
+                if value(f)
+                else Issue(severity="high", code=key, message="missing")
+            )
+        )
+    if "min" in rule:
+        low = rule["min"]
+        checks.append(
+            lambda f: (
+                Issue(severity="med", code=key, message="below min")
+                if value(f) < low
+                else None
+            )
+        )
+    if "max" in rule:
+        high = rule["max"]
+        checks.append(
+            lambda f: (
+                Issue(severity="med", code=key, message="above max")
+                if value(f) > high
+                else None
+            )
+        )
+    return checks
+
 
 @dataclass
 class Teacher:
@@ -16,35 +175,15 @@ class Teacher:
     def __post_init__(self) -> None:
         with self.constitution_path.open("r", encoding="utf-8") as f:
             self.rules = yaml.safe_load(f)["rules"]
+        self.checks = [check for rule in self.rules for check in _compile_rule(rule)]
 
     def score(self, text: str) -> dict[str, Any]:
-        scores: dict[str, Any] = {}
-        lower = text.lower()
-        scores["learning_goal_present"] = 1 if "learn" in lower else 0
-        scores["cognitive_progression"] = (
-            0.7 if all(k in lower for k in ["remember", "understand", "apply"]) else 0.0
-        )
-        scores["retrieval_presence"] = lower.count("?")
-        scores["reading_level_max_grade"] = 8  # pretend
-        scores["udl_accessibility"] = (
-            0.7 if "example" in lower or "recap" in lower else 0.0
-        )
-        scores["claims_softened_or_cited"] = (
-            1 if ("may" in lower or "might" in lower or "http" in lower) else 0
-        )
-        return scores
+        return extract_features(text).scores()
 
     def review(self, draft: Draft) -> GateResult:
-        scores = self.score(draft.text)
-        issues: list[Issue] = []
-        for rule in self.rules:
-            key = rule["key"]
-            val = scores.get(key, 0)
-            if rule.get("required") and not val:
-                issues.append(Issue(severity="high", code=key, message="missing"))
-            if "min" in rule and val < rule["min"]:
-                issues.append(Issue(severity="med", code=key, message="below min"))
-            if "max" in rule and val > rule["max"]:
-                issues.append(Issue(severity="med", code=key, message="above max"))
+        features = extract_features(draft.text)
+        issues = [issue for check in self.checks if (issue := check(features))]
         status = "pass" if not issues else "needs_fix"
-        return GateResult(status=status, issues=issues, teacher_scores=scores)
+        return GateResult(
+            status=status, issues=issues, teacher_scores=features.scores()
+        )
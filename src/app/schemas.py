@@ -2,7 +2,7 @@ from __future__ import annotations
 import uuid
 
 from datetime import datetime
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -39,6 +39,8 @@ class Issue(BaseModel):
     code: str
     message: str
     suggest_fix: Optional[str] = None
+    # (start, end) offsets into the reviewed text, where the issue has them
+    spans: List[Tuple[int, int]] = Field(default_factory=list)
 
 
 class GateResult(BaseModel):
@@ -65,3 +67,8 @@ class AttemptRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TaskResult(BaseModel):
+    attempt: AttemptRead | None = None
+    error: str | None = None
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 
+from ..bandit.stats import increment_play_stats
 from ..db import async_session_maker
 from ..models import AttemptLog, Play, Workstream, CSOStatus, ShipAction
 
@@ -19,8 +20,7 @@ async def main() -> None:
                 reward_R=1.0,
             )
             session.add(attempt)
-            play.params["reward_sum"] = play.params.get("reward_sum", 0) + 1
-            play.params["n"] = play.params.get("n", 0) + 1
+            await increment_play_stats(session, {play.id: (1.0, 1)})
             await session.commit()
 
 
@@ -37,6 +37,9 @@ async def main() -> None:
                         context_id=item.context_id,
                         variant=item.variant,
                         motif="Sports",
+                        stem=item.stem,
+                        question=item.question,
+                        bindings=item.bindings,
                     )
                 )
         await session.commit()
@@ -0,0 +1,105 @@
+"""Aho–Corasick matching of many literal terms in one pass over a text."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+
+class TermMatch(NamedTuple):
+    term: str
+    start: int
+    end: int
+
+
+def _fold(text: str) -> str:
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    # a few characters lower-case to two (e.g. "İ"); keep offsets aligned
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def _is_word(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+class TermMatcher:
+    """Case-insensitive matcher of literal terms, optionally on word boundaries."""
+
+    def __init__(
+        self, terms: Iterable[str], whole_word: bool = True, prefix: bool = False
+    ):
+        self.whole_word = whole_word
+        self.prefix = prefix
+        self.terms: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # (term index, term length) for every term ending at a node,
+        # including those reached through fail links
+        self._out: List[Tuple[Tuple[int, int], ...]] = [()]
+        seen: Dict[str, int] = {}
+        for term in terms:
+            key = _fold(term.strip())
+            if not key or key in seen:
+                continue
+            seen[key] = len(self.terms)
+            self.terms.append(term.strip())
+            self._insert(key, seen[key])
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _insert(self, key: str, index: int) -> None:
+        node = 0
+        for c in key:
+            nxt = self._goto[node].get(c)
+            if nxt is None:
+                nxt = self._goto[node][c] = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        self._out[node] = ((index, len(key)),)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for c, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and c not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(c, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] += self._out[self._fail[child]]
+                queue.append(child)
+
+    def scan(self, text: str) -> List[TermMatch]:
+        """Every occurrence of every term, ordered by end offset."""
+        goto, fail, out = self._goto, self._fail, self._out
+        matches: List[TermMatch] = []
+        node = 0
+        n = len(text)
+        for i, c in enumerate(_fold(text)):
+            while node and c not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(c, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            for index, length in out[node]:
+                start = end - length
+                # whole words start and end on a boundary; prefixes only start
+                if self.whole_word and (
+                    (start > 0 and _is_word(text[start - 1]))
+                    or (not self.prefix and end < n and _is_word(text[end]))
+                ):
+                    continue
+                matches.append(TermMatch(self.terms[index], start, end))
+        return matches
+
+    def search(self, text: str) -> List[str]:
+        """Distinct terms found in ``text``, in order of first occurrence."""
+        return list(dict.fromkeys(m.term for m in self.scan(text)))
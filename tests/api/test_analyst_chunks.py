@@ -0,0 +1,84 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, func, select
+
+from src.app.db import async_session_maker, engine
+from src.app.models import AttemptLog, Play, PlayStats, Workstream
+from src.app.roles.analyst import Analyst
+
+REWARDS = Path("src/app/playbook/rewards.yaml")
+
+
+class FailingAnalyst(Analyst):
+    """Dies on its second chunk, like a worker killed mid-run."""
+
+    async def _process_chunk(self, session, attempts):
+        self.chunks = getattr(self, "chunks", 0) + 1
+        if self.chunks == 2:
+            raise RuntimeError("interrupted")
+        await super()._process_chunk(session, attempts)
+
+
+async def _rewarded_and_stats(play_id):
+    async with async_session_maker() as session:
+        rewarded = await session.scalar(
+            select(func.count()).where(
+                AttemptLog.play_id == play_id, AttemptLog.reward_R.is_not(None)
+            )
+        )
+        stats = await session.get(PlayStats, play_id)
+        return rewarded, stats.n if stats else 0
+
+
+def test_interrupted_run_resumes_without_double_counting(app):
+    async def run():
+        async with async_session_maker() as session:
+            session.add(Play(id="chunked", workstream=Workstream.medium, active=False))
+            session.add_all(
+                AttemptLog(workstream=Workstream.medium, play_id="chunked")
+                for _ in range(25)
+            )
+            await session.commit()
+
+        async with async_session_maker() as session:
+            with pytest.raises(RuntimeError):
+                await FailingAnalyst(REWARDS, chunk_size=10).process(session)
+        partial = await _rewarded_and_stats("chunked")
+
+        commits = []
+
+        def on_commit(conn):
+            commits.append(conn)
+
+        event.listen(engine.sync_engine, "commit", on_commit)
+        try:
+            async with async_session_maker() as session:
+                processed = await Analyst(REWARDS, chunk_size=10).process(session)
+        finally:
+            event.remove(engine.sync_engine, "commit", on_commit)
+        return partial, processed, len(commits), await _rewarded_and_stats("chunked")
+
+    partial, processed, commits, final = asyncio.run(run())
+    # the first chunk committed its rewards and play_stats together
+    assert partial[0] == partial[1] < 25
+    assert processed >= 25 - partial[0]
+    assert commits == -(-processed // 10)
+    assert final == (25, 25)
+
+
+def test_workstream_without_weights_is_rewarded_zero(app):
+    async def run():
+        async with async_session_maker() as session:
+            session.add(
+                Play(id="unweighted", workstream=Workstream.x_thread, active=False)
+            )
+            attempt = AttemptLog(workstream=Workstream.x_thread, play_id="unweighted")
+            session.add(attempt)
+            await session.commit()
+            await Analyst(REWARDS).process(session)
+            await session.refresh(attempt)
+            return attempt.reward_R, attempt.metrics_72h
+
+    assert asyncio.run(run()) == (0.0, {})
@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from src.app.db import async_session_maker
+from src.app.math import router as math_router
+from src.app.models import Attempt, Item
+
+
+def test_stream_replays_offline_attempts(app, monkeypatch):
+    monkeypatch.setattr(math_router.settings, "attempt_stream_batch_size", 2)
+
+    async def run() -> None:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            pid = (
+                await client.post(
+                    "/math/participants", json={"age_band": "7-9", "interests": []}
+                )
+            ).json()["participant_id"]
+            sid = (
+                await client.post(
+                    "/math/sessions", json={"participant_id": pid, "n_pairs": 2}
+                )
+            ).json()["session_id"]
+            # one item was already claimed before the device went offline
+            claimed = (await client.get(f"/math/sessions/{sid}/next")).json()
+
+            async with async_session_maker() as db:
+                res = await db.execute(select(Item).where(Item.session_id == sid))
+                items = res.scalars().all()
+            answers = {i.item_id: i.problem_spec["solution"]["answer"] for i in items}
+            wrong_id = next(i for i in answers if i != claimed["item_id"])
+
+            records = [
+                {"item_id": item_id, "answer_submitted": answer}
+                for item_id, answer in answers.items()
+                if item_id != wrong_id
+            ]
+            records.append({"item_id": wrong_id, "answer_submitted": -1.0})
+            lines = [json.dumps(r) for r in records]
+            lines.insert(1, "not json")
+            lines.append("")
+            lines.append(json.dumps({"item_id": wrong_id, "answer_submitted": 1.0}))
+            lines.append(json.dumps({"item_id": "missing", "answer_submitted": 1.0}))
+            body = "\n".join(lines).encode()
+
+            resp = await client.post(
+                "/math/attempts/stream",
+                content=body,
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+            assert resp.status_code == 200
+            results = [json.loads(line) for line in resp.text.splitlines()]
+            assert [r["line"] for r in results] == [1, 2, 3, 4, 5, 7, 8]
+            assert results[1] == {"line": 2, "error": "invalid attempt"}
+            assert all(r["correct"] for r in (results[0], results[2], results[3]))
+            assert results[4]["item_id"] == wrong_id
+            assert results[4]["correct"] is False
+            assert results[5]["duplicate"] is True
+            assert results[6] == {"line": 8, "error": "item not found"}
+
+            async with async_session_maker() as db:
+                res = await db.execute(
+                    select(Attempt.item_id, func.count())
+                    .join(Item)
+                    .where(Item.session_id == sid)
+                    .group_by(Attempt.item_id)
+                )
+                counts = dict(res.all())
+            # the claimed placeholder was updated in place, not duplicated
+            assert counts == {item_id: 1 for item_id in answers}
+
+    asyncio.run(run())
@@ -0,0 +1,182 @@
+import asyncio
+import re
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from sqlalchemy import event
+
+from src.app.bandit.cache import BanditCache
+from src.app.bandit.linear import LinUCBBandit
+from src.app.bandit.thompson import ArrayThompsonBandit
+from src.app.db import async_session_maker, engine
+from src.app.models import AttemptLog, Play, PlayStats, Workstream
+from src.app.roles.analyst import Analyst
+
+REWARDS = Path("src/app/playbook/rewards.yaml")
+
+
+async def _seed_plays() -> None:
+    async with async_session_maker() as session:
+        session.add_all(
+            [
+                Play(id="cache_a", workstream=Workstream.medium, params={}),
+                Play(id="cache_b", workstream=Workstream.medium, params={}),
+                Play(
+                    id="cache_off",
+                    workstream=Workstream.medium,
+                    params={},
+                    active=False,
+                ),
+            ]
+        )
+        await session.commit()
+
+
+def test_choose_play_reads_db_once_and_tracks_analyst_rewards(app):
+    async def run() -> None:
+        await _seed_plays()
+        bandits = BanditCache(ttl=3600)
+        analyst = Analyst(REWARDS, bandits)
+
+        async with async_session_maker() as session:
+            bandit = await bandits.get(session, Workstream.medium)
+            assert sorted(bandit.arm_ids) == ["cache_a", "cache_b"]
+
+            queries = []
+
+            def counter(*args, **kwargs):
+                queries.append(args[2])
+
+            event.listen(engine.sync_engine, "before_cursor_execute", counter)
+            try:
+                for _ in range(5):
+                    current = await bandits.get(session, Workstream.medium)
+                    assert isinstance(current, ArrayThompsonBandit)
+                    assert current.sample() in {"cache_a", "cache_b"}
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", counter)
+            assert queries == []
+            assert bandits.loads == 1
+
+            session.add_all(
+                [
+                    AttemptLog(workstream=Workstream.medium, play_id="cache_a"),
+                    AttemptLog(workstream=Workstream.medium, play_id="cache_a"),
+                    AttemptLog(workstream=Workstream.medium, play_id="cache_off"),
+                ]
+            )
+            await session.commit()
+            await analyst.process(session)
+
+        cached = await bandits.get(None, Workstream.medium)  # type: ignore[arg-type]
+        assert cached is bandit
+        assert isinstance(cached, ArrayThompsonBandit)
+        assert cached.counts[cached.index["cache_a"]] == 2
+        assert "cache_off" not in cached.index
+
+        async with async_session_maker() as session:
+            stats = await session.get(PlayStats, "cache_a")
+            assert stats.n == 2
+            assert stats.reward_sum == pytest.approx(
+                cached.reward_sums[cached.index["cache_a"]]
+            )
+
+            bandits.invalidate(Workstream.medium)
+            reloaded = await bandits.get(session, Workstream.medium)
+            assert reloaded is not bandit
+            assert bandits.loads == 2
+            assert reloaded.counts[reloaded.index["cache_a"]] == 2
+
+    asyncio.run(run())
+
+
+def test_linucb_policy_is_rebuilt_from_rewarded_attempts(app):
+    async def run():
+        async with async_session_maker() as session:
+            session.add_all(
+                [
+                    Play(id="lin_a", workstream=Workstream.x_post, params={}),
+                    Play(id="lin_b", workstream=Workstream.x_post, params={}),
+                ]
+            )
+            session.add_all(
+                AttemptLog(
+                    workstream=Workstream.x_post,
+                    play_id="lin_a",
+                    context={"audience": "kids"},
+                    reward_R=1.0,
+                )
+                for _ in range(3)
+            )
+            await session.commit()
+            bandits = BanditCache(policy="linucb", dim=16)
+            bandit = await bandits.get(session, Workstream.x_post)
+            bandits.record([(Workstream.x_post, "lin_b", 0.5, {"audience": "kids"})])
+            return bandit
+
+    bandit = asyncio.run(run())
+    assert isinstance(bandit, LinUCBBandit)
+    assert bandit.counts.tolist() == [3, 1]
+    assert bandit.theta[0, 0] > 0
+
+
+def test_linucb_reload_folds_in_only_newly_rewarded_attempts(app):
+    async def run():
+        async with async_session_maker() as session:
+            session.add(Play(id="lin_inc", workstream=Workstream.x_post, params={}))
+            session.add(
+                AttemptLog(
+                    workstream=Workstream.x_post,
+                    play_id="lin_inc",
+                    context={"tone": "warm"},
+                    reward_R=1.0,
+                )
+            )
+            await session.commit()
+            bandits = BanditCache(ttl=0, policy="linucb", dim=16)
+            first = await bandits.get(session, Workstream.x_post)
+
+            session.add_all(
+                AttemptLog(
+                    workstream=Workstream.x_post,
+                    play_id="lin_inc",
+                    context={"tone": "warm"},
+                )
+                for _ in range(2)
+            )
+            await session.commit()
+            await Analyst(REWARDS).process(session)
+
+            statements = []
+
+            def on_execute(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+            try:
+                second = await bandits.get(session, Workstream.x_post)
+                third = await bandits.get(session, Workstream.x_post)
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", on_execute)
+            fresh = await BanditCache(policy="linucb", dim=16).get(
+                session, Workstream.x_post
+            )
+            return first, second, third, fresh, statements
+
+    first, second, third, fresh, statements = asyncio.run(run())
+    assert isinstance(first, LinUCBBandit)
+    assert isinstance(second, LinUCBBandit)
+    assert isinstance(third, LinUCBBandit)
+    assert isinstance(fresh, LinUCBBandit)
+    assert first.counts[first.index["lin_inc"]] == 1
+    assert second.counts[second.index["lin_inc"]] == 3
+    # reloads read only attempts rewarded since the previous load
+    scans = [s for s in statements if "FROM attempt_logs" in s]
+    assert len(scans) == 2
+    assert re.search(r"rewarded_at (>=|IS NOT NULL)", scans[0])
+    assert "rewarded_at >=" in scans[1]
+    assert third.counts.tolist() == second.counts.tolist()
+    assert second.counts.tolist() == fresh.counts.tolist()
+    np.testing.assert_allclose(second.theta, fresh.theta)
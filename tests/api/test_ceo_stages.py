@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from pathlib import Path
+
+from httpx import AsyncClient
+
+from src.app.adapters.publisher.tpt_stub import TPTPublisher
+from src.app.bandit.cache import BanditCache
+from src.app.db import async_session_maker
+from src.app.llm.mock import MockLLM
+from src.app.models import Play, Workstream
+from src.app.roles.ceo import CEO
+from src.app.roles.cso import CSO
+from src.app.roles.teacher import Teacher
+from src.app.roles.writer import Writer
+
+# both gates must be inside review() at the same time to get past this
+_both_gates = threading.Barrier(2, timeout=5)
+
+
+class BarrierTeacher(Teacher):
+    def review(self, draft):
+        _both_gates.wait()
+        return super().review(draft)
+
+
+class BarrierCSO(CSO):
+    def review(self, workstream, draft):
+        _both_gates.wait()
+        return super().review(workstream, draft)
+
+
+def test_teacher_and_cso_review_concurrently_with_stage_timings(app):
+    ceo = CEO(
+        Writer(MockLLM()),
+        BarrierTeacher(Path("src/app/playbook/teaching_constitution.yaml")),
+        BarrierCSO(Path("src/app/playbook/policies")),
+        {Workstream.tpt: TPTPublisher()},
+        BanditCache(),
+    )
+
+    async def run():
+        async with async_session_maker() as session:
+            session.add(Play(id="stages_tpt", workstream=Workstream.tpt, params={}))
+            await session.commit()
+            return await ceo.run_task(
+                session, {"workstream": "tpt", "topic": "slope", "audience": "kids"}
+            )
+
+    attempt = asyncio.run(run())
+    assert attempt.play_id == "stages_tpt"
+    # a single active play is chosen with certainty
+    assert attempt.propensity == 1.0
+    stats = ceo.timings.stats()
+    for stage in (
+        "choose_play",
+        "write",
+        "teacher",
+        "cso",
+        "flush",
+        "publish",
+        "commit",
+    ):
+        assert stats[stage]["count"] == 1
+        assert stats[stage]["max_ms"] >= stats[stage]["mean_ms"] > 0
+
+
+def test_task_stats_endpoint(app):
+    async def run():
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            return await client.get("/tasks/stats")
+
+    resp = asyncio.run(run())
+    assert resp.status_code == 200
+    assert isinstance(resp.json(), dict)
@@ -0,0 +1,65 @@
+"""Claims against PostgreSQL row locks; set TEST_POSTGRES_URL to run."""
+
+import asyncio
+import os
+from typing import AsyncGenerator
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.app.db import Base
+from src.app.deps import get_session
+from src.app.models import Item
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+
+def test_locked_items_are_not_reported_as_a_finished_session(app):
+    async def run() -> None:
+        engine = create_async_engine(str(POSTGRES_URL))
+        maker = sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)  # type: ignore[call-overload]
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+        async def pg_session() -> AsyncGenerator[AsyncSession, None]:
+            async with maker() as session:
+                yield session
+
+        app.dependency_overrides[get_session] = pg_session
+        try:
+            async with AsyncClient(app=app, base_url="http://test") as client:
+                pid = (
+                    await client.post(
+                        "/math/participants", json={"age_band": "7-9", "interests": []}
+                    )
+                ).json()["participant_id"]
+                sid = (
+                    await client.post(
+                        "/math/sessions", json={"participant_id": pid, "n_pairs": 1}
+                    )
+                ).json()["session_id"]
+
+                async with maker() as holder:
+                    # a concurrent claim mid-transaction holds every free item
+                    await holder.execute(
+                        select(Item).where(Item.session_id == sid).with_for_update()
+                    )
+                    blocked = await client.get(f"/math/sessions/{sid}/next")
+                    await holder.rollback()
+                assert blocked.status_code == 409
+
+                claimed = (await client.get(f"/math/sessions/{sid}/next")).json()
+                assert claimed.get("item_id")
+        finally:
+            app.dependency_overrides.pop(get_session, None)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+            await engine.dispose()
+
+    asyncio.run(run())
@@ -4,7 +4,7 @@ from sqlalchemy import select
 
 from httpx import AsyncClient
 from src.app.db import async_session_maker
-from src.app.models import Attempt
+from src.app.models import Attempt, Item
 
 
 async def create_basic_session(client: AsyncClient) -> str:
@@ -58,3 +58,36 @@ def test_concurrent_next_calls(app):
                 assert len(attempts) >= 1
 
     asyncio.run(run())
+
+
+def test_concurrent_claims_are_distinct(app):
+    async def run() -> None:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            pid = (
+                await client.post(
+                    "/math/participants", json={"age_band": "7-9", "interests": []}
+                )
+            ).json()["participant_id"]
+            sid = (
+                await client.post(
+                    "/math/sessions",
+                    json={"participant_id": pid, "n_pairs": 2},
+                )
+            ).json()["session_id"]
+
+            async def fetch_next():
+                return (await client.get(f"/math/sessions/{sid}/next")).json()
+
+            results = await asyncio.gather(*(fetch_next() for _ in range(6)))
+            ids = [r["item_id"] for r in results if r.get("item_id")]
+            assert len(ids) == 4
+            assert len(set(ids)) == 4
+
+            async with async_session_maker() as db:
+                res = await db.execute(
+                    select(Attempt).join(Item).where(Item.session_id == sid)
+                )
+                attempts = res.scalars().all()
+                assert sorted(a.item_id for a in attempts) == sorted(ids)
+
+    asyncio.run(run())
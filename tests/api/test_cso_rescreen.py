@@ -0,0 +1,98 @@
+import asyncio
+import json
+import uuid
+
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from src.app.db import async_session_maker
+from src.app.models import AttemptLog, Play, PolicyIncident, ShipAction, Workstream
+from src.app.schemas import Draft
+
+
+def _published(tmp_path, text, play_id="rescreen_play"):
+    attempt_id = uuid.uuid4()
+    path = tmp_path / f"{attempt_id}.json"
+    draft = Draft(outline=[], text=text)
+    path.write_text(json.dumps({"workstream": "tpt", "draft": draft.model_dump()}))
+    return AttemptLog(
+        id=attempt_id,
+        workstream=Workstream.tpt,
+        play_id=play_id,
+        ship_action=ShipAction.publish,
+        publisher_payload_path=str(path),
+    )
+
+
+def test_rescreen_streams_results_and_records_incidents(app, tmp_path):
+    clean = _published(tmp_path, "Fractions with pizza slices.")
+    flagged = _published(tmp_path, "We guarantee it, write to ann@example.com")
+    missing = _published(tmp_path, "gone")
+    (tmp_path / f"{missing.id}.json").unlink()
+    ours = {str(a.id) for a in (clean, flagged, missing)}
+
+    async def run():
+        async with async_session_maker() as session:
+            session.add(
+                Play(id="rescreen_play", workstream=Workstream.tpt, active=False)
+            )
+            session.add_all([clean, flagged, missing])
+            await session.commit()
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            resp = await client.post(
+                "/admin/cso/rescreen", params={"workstream": "tpt"}
+            )
+        async with async_session_maker() as session:
+            incidents = (
+                await session.scalars(
+                    select(PolicyIncident).where(
+                        PolicyIncident.attempt_id.in_([clean.id, flagged.id])
+                    )
+                )
+            ).all()
+        return resp, incidents
+
+    resp, incidents = asyncio.run(run())
+    assert resp.status_code == 200
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert all(line["workstream"] == "tpt" for line in lines)
+    results = {r["attempt_id"]: r for r in lines if r["attempt_id"] in ours}
+    assert results[str(clean.id)]["status"] == "pass"
+    assert results[str(missing.id)]["error"] == "payload unreadable"
+    issues = results[str(flagged.id)]["issues"]
+    assert [(i["code"], i["message"]) for i in issues] == [
+        ("forbidden", "guarantee"),
+        ("pii", "[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Za-z]{2,}"),
+    ]
+    assert issues[0]["spans"] == [[3, 12]]
+    assert sorted((i.attempt_id, i.code, i.notes) for i in incidents) == sorted(
+        (flagged.id, i["code"], i["message"]) for i in issues
+    )
+
+
+def test_rescreening_twice_does_not_duplicate_incidents(app, tmp_path):
+    flagged = _published(tmp_path, "We guarantee it", play_id="rescreen_twice")
+
+    async def run():
+        async with async_session_maker() as session:
+            session.add(
+                Play(id="rescreen_twice", workstream=Workstream.tpt, active=False)
+            )
+            session.add(flagged)
+            await session.commit()
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            for _ in range(2):
+                resp = await client.post(
+                    "/admin/cso/rescreen", params={"workstream": "tpt"}
+                )
+                assert resp.status_code == 200
+        async with async_session_maker() as session:
+            return (
+                await session.scalars(
+                    select(PolicyIncident.code).where(
+                        PolicyIncident.attempt_id == flagged.id
+                    )
+                )
+            ).all()
+
+    assert asyncio.run(run()) == ["forbidden"]
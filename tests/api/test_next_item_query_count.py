@@ -0,0 +1,57 @@
+import asyncio
+from typing import Any, List
+
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from src.app.db import engine
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, *args: Any, **kwargs: Any) -> None:
+        self.count += 1
+
+
+def test_next_submit_cycle_query_count_is_constant(app):
+    async def run() -> List[int]:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            pid = (
+                await client.post(
+                    "/math/participants", json={"age_band": "7-9", "interests": []}
+                )
+            ).json()["participant_id"]
+            sid = (
+                await client.post(
+                    "/math/sessions",
+                    json={"participant_id": pid, "n_pairs": 5},
+                )
+            ).json()["session_id"]
+
+            counts: List[int] = []
+            counter = QueryCounter()
+            event.listen(engine.sync_engine, "before_cursor_execute", counter)
+            try:
+                for _ in range(10):
+                    counter.count = 0
+                    data = (await client.get(f"/math/sessions/{sid}/next")).json()
+                    await client.post(
+                        "/math/attempts",
+                        json={
+                            "item_id": data["item_id"],
+                            "answer_submitted": data["bindings"]["c"],
+                        },
+                    )
+                    counts.append(counter.count)
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", counter)
+            return counts
+
+    counts = asyncio.run(run())
+    # every cycle but the last (which also marks the session complete) must
+    # cost the same number of queries regardless of position in the session
+    assert len(set(counts[:-1])) == 1
+    assert counts[0] <= 8
+    assert counts[-1] <= counts[0] + 2
@@ -0,0 +1,48 @@
+import asyncio
+
+from httpx import AsyncClient
+
+from src.app.db import async_session_maker
+from src.app.models import AttemptLog, Play, Workstream
+
+
+def test_admin_ope_reports_each_target_policy(app):
+    async def run():
+        async with async_session_maker() as session:
+            session.add_all(
+                [
+                    Play(id="ope_a", workstream=Workstream.newsletter, active=False),
+                    Play(id="ope_b", workstream=Workstream.newsletter, active=False),
+                ]
+            )
+            session.add_all(
+                AttemptLog(
+                    workstream=Workstream.newsletter,
+                    play_id=play_id,
+                    propensity=0.5,
+                    reward_R=reward,
+                )
+                for play_id, reward in [("ope_a", 0.0), ("ope_b", 1.0)] * 20
+            )
+            session.add(
+                AttemptLog(
+                    workstream=Workstream.newsletter, play_id="ope_a", reward_R=5.0
+                )
+            )
+            await session.commit()
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            return await client.get(
+                "/admin/ope/newsletter",
+                params={"policy": ["uniform", "greedy"], "n_boot": 50},
+            )
+
+    resp = asyncio.run(run())
+    assert resp.status_code == 200
+    report = resp.json()
+    # the attempt without a logged propensity is not evaluated
+    assert report["rows"] == 40
+    assert set(report["policies"]) == {"uniform", "greedy"}
+    greedy = report["policies"]["greedy"]
+    assert greedy["target"] == {"ope_a": 0.0, "ope_b": 1.0}
+    assert greedy["ips"]["value"] == 1.0
+    assert report["policies"]["uniform"]["snips"]["value"] == 0.5
@@ -0,0 +1,51 @@
+import asyncio
+
+from sqlalchemy import event
+
+from src.app.bandit.stats import active_play_stats, increment_play_stats
+from src.app.db import async_session_maker, engine
+from src.app.models import Play, PlayStats, Workstream
+
+
+def test_concurrent_increments_are_not_lost(app):
+    async def bump(deltas):
+        async with async_session_maker() as session:
+            await increment_play_stats(session, deltas)
+            await session.commit()
+
+    async def run():
+        async with async_session_maker() as session:
+            session.add_all(
+                [
+                    Play(id="stats_a", workstream=Workstream.tpt),
+                    Play(id="stats_b", workstream=Workstream.tpt),
+                    Play(id="stats_off", workstream=Workstream.tpt, active=False),
+                ]
+            )
+            await session.commit()
+        await asyncio.gather(
+            *(bump({"stats_a": (0.5, 1), "stats_off": (1.0, 1)}) for _ in range(10)),
+            bump({"stats_a": (2.0, 4)}),
+        )
+        async with async_session_maker() as session:
+            statements = []
+
+            def capture(*args, **kwargs):
+                statements.append(args[2])
+
+            event.listen(engine.sync_engine, "before_cursor_execute", capture)
+            try:
+                rows = await active_play_stats(session, Workstream.tpt)
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", capture)
+            off = await session.get(PlayStats, "stats_off")
+            return rows, statements, off
+
+    rows, statements, off = asyncio.run(run())
+    stats = {play_id: (s, n) for play_id, s, n in rows}
+    assert stats["stats_a"] == (7.0, 14)
+    # plays without a stats row still appear, with zero totals
+    assert stats["stats_b"] == (0.0, 0)
+    assert "stats_off" not in stats
+    assert (off.reward_sum, off.n) == (10.0, 10)
+    assert len(statements) == 1
@@ -0,0 +1,82 @@
+import asyncio
+
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from src.app import main
+from src.app.db import async_session_maker
+from src.app.models import AttemptLog, Play, Workstream
+
+
+async def _seed_plays() -> None:
+    async with async_session_maker() as session:
+        for play_id in ("batch_thread_a", "batch_thread_b"):
+            await session.merge(
+                Play(id=play_id, workstream=Workstream.x_thread, params={})
+            )
+        await session.commit()
+
+
+def test_batch_tasks_return_results_in_request_order(app):
+    payloads = [
+        {"workstream": "x_thread", "topic": "fractions", "audience": "parents"},
+        {"workstream": "x_thread", "audience": "parents"},
+        {"workstream": "fax", "topic": "ratios", "audience": "teachers"},
+        {"workstream": "x_thread", "topic": "angles", "audience": "students"},
+        {"workstream": "newsletter", "topic": "area", "audience": "students"},
+    ]
+
+    async def run():
+        await _seed_plays()
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            resp = await client.post("/tasks/batch", json=payloads)
+        assert resp.status_code == 200
+        results = resp.json()
+        async with async_session_maker() as session:
+            rows = (
+                await session.execute(
+                    select(AttemptLog).where(
+                        AttemptLog.workstream == Workstream.x_thread
+                    )
+                )
+            ).scalars()
+            contexts = {str(a.id): a.context for a in rows}
+        return results, contexts
+
+    results, contexts = asyncio.run(run())
+    assert len(results) == len(payloads)
+    assert results[1] == {"attempt": None, "error": "missing field topic"}
+    assert "fax" in results[2]["error"]
+    assert results[4] == {"attempt": None, "error": "no arms"}
+    for i in (0, 3):
+        attempt = results[i]["attempt"]
+        assert results[i]["error"] is None
+        assert attempt["play_id"] in {"batch_thread_a", "batch_thread_b"}
+        assert contexts[attempt["id"]]["topic"] == payloads[i]["topic"]
+
+
+def test_a_failing_task_does_not_fail_the_batch(app, monkeypatch):
+    write = main.writer.write
+
+    def flaky_write(spec):
+        if spec.topic == "explode":
+            raise RuntimeError("writer crashed")
+        return write(spec)
+
+    monkeypatch.setattr(main.writer, "write", flaky_write)
+    payloads = [
+        {"workstream": "x_thread", "topic": "explode", "audience": "parents"},
+        {"workstream": "x_thread", "topic": "volume", "audience": "parents"},
+    ]
+
+    async def run():
+        await _seed_plays()
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            return await client.post("/tasks/batch", json=payloads)
+
+    resp = asyncio.run(run())
+    assert resp.status_code == 200
+    failed, done = resp.json()
+    assert failed == {"attempt": None, "error": "writer crashed"}
+    assert done["error"] is None
+    assert done["attempt"]["play_id"] in {"batch_thread_a", "batch_thread_b"}
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from src.app.bandit.thompson import ArmState, ArrayThompsonBandit
+
+
+def _bandit(**kwargs):
+    return ArrayThompsonBandit(
+        ["a", "b", "c"], [10.0, 90.0, 40.0], [100, 100, 100], **kwargs
+    )
+
+
+def test_empty_bandit_raises():
+    bandit = ArrayThompsonBandit()
+    with pytest.raises(ValueError):
+        bandit.sample()
+    with pytest.raises(ValueError):
+        bandit.sample_many(3)
+
+
+def test_from_arms_matches_arm_state():
+    arms = {"x": ArmState(3.0, 4), "y": ArmState(0.0, 0)}
+    bandit = ArrayThompsonBandit.from_arms(arms)
+    assert bandit.arm_ids == ["x", "y"]
+    assert bandit.means.tolist() == [0.75, 0.0]
+    assert bandit.counts.tolist() == [4, 0]
+
+
+def test_seeded_sampling_is_reproducible():
+    first = _bandit(rng=np.random.default_rng(7)).sample_many(50)
+    second = _bandit(rng=np.random.default_rng(7)).sample_many(50)
+    assert first == second
+
+
+def test_sample_many_favours_best_arm_and_reports_propensity():
+    bandit = _bandit(rng=np.random.default_rng(0), exploration=0.0)
+    decisions = bandit.sample_many(200)
+    assert len(decisions) == 200
+    assert sum(d.arm_id == "b" for d in decisions) > 190
+    assert all(0.0 < d.propensity <= 1.0 for d in decisions if d.arm_id == "b")
+
+
+def test_propensities_include_exploration_floor():
+    bandit = _bandit(rng=np.random.default_rng(1), exploration=0.3)
+    probs = bandit.propensities()
+    assert probs.sum() == pytest.approx(1.0)
+    assert probs.min() >= 0.1 - 1e-12
+
+
+def test_update_many_accumulates_and_adds_new_arms():
+    bandit = _bandit()
+    bandit.update_many(["a", "a", "d"], [1.0, 0.5, 0.25])
+    bandit.update("d", 0.75)
+    assert bandit.arm_ids == ["a", "b", "c", "d"]
+    assert bandit.counts.tolist() == [102, 100, 100, 2]
+    assert bandit.reward_sums.tolist() == [11.5, 90.0, 40.0, 1.0]
+
+
+def test_propensities_are_estimated_once_per_posterior():
+    bandit = _bandit(rng=np.random.default_rng(2))
+    probs = bandit.propensities()
+    bandit.decide_many([{}])
+    assert bandit.propensities() is probs
+    bandit.update("d", 1.0)
+    assert len(bandit.propensities()) == 4
+    stale = bandit.propensities()
+    bandit.update_many(["a"], [1.0])
+    assert bandit.propensities() is not stale
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from src.app.bandit.linear import LinUCBBandit, hash_features
+
+
+def test_hash_features_is_stable_and_unit_norm():
+    ctx = {"audience": "Parents", "topic": "long division", "tone": "warm"}
+    x = hash_features(ctx, 32)
+    assert x.shape == (32,)
+    assert np.linalg.norm(x) == pytest.approx(1.0)
+    assert np.array_equal(x, hash_features({**ctx, "audience": "parents "}, 32))
+    assert not np.array_equal(x, hash_features({**ctx, "audience": "teachers"}, 32))
+
+
+def test_sherman_morrison_matches_direct_inverse():
+    rng = np.random.default_rng(3)
+    bandit = LinUCBBandit(["a"], dim=8)
+    xs = rng.normal(size=(40, 8))
+    for x in xs:
+        bandit.update("a", x, 1.0)
+    direct = np.linalg.inv(np.eye(8) + xs.T @ xs)
+    assert np.allclose(bandit.a_inv[0], direct)
+    assert np.allclose(bandit.b[0], xs.sum(axis=0))
+
+
+def test_learns_a_different_best_play_per_audience():
+    bandit = LinUCBBandit(
+        ["short", "long"], dim=32, alpha=0.1, rng=np.random.default_rng(0)
+    )
+    best = {"kids": "short", "teachers": "long"}
+    for _ in range(50):
+        for audience, arm in best.items():
+            ctx = {"audience": audience}
+            for play in ("short", "long"):
+                bandit.observe(play, 1.0 if play == arm else 0.0, ctx)
+    bandit.exploration = 0.0
+    decisions = bandit.decide_many([{"audience": "kids"}, {"audience": "teachers"}])
+    assert [d.arm_id for d in decisions] == ["short", "long"]
+    assert all(d.propensity == 1.0 for d in decisions)
+
+
+def test_propensity_accounts_for_exploration_and_ties():
+    bandit = LinUCBBandit(["a", "b", "c"], dim=8, exploration=0.3)
+    decisions = bandit.decide_many([{}] * 20)
+    # untrained arms all tie, so every arm is equally likely
+    assert all(d.propensity == pytest.approx(1 / 3) for d in decisions)
+    with pytest.raises(ValueError):
+        LinUCBBandit().decide_many([{}])
+
+
+def test_folded_stats_keep_the_inverse_without_inverting():
+    from types import SimpleNamespace
+
+    from src.app.bandit.cache import _LinearStats
+
+    topics = ["fractions", "long division", "decimals", "ratios"]
+    rows = [
+        SimpleNamespace(
+            id=i,
+            play_id=f"p{i % 2}",
+            context={"topic": topics[i % 4]},
+            reward_R=float(i % 3 == 0),
+            rewarded_at=None,
+        )
+        for i in range(30)
+    ]
+    stats = _LinearStats(16)
+    stats.fold(rows[:12])
+    stats.fold(rows[12:])
+    for play, i in stats.index.items():
+        mine = [r for r in rows if r.play_id == play]
+        x = np.stack([hash_features(r.context, 16) for r in mine])
+        r = np.array([r.reward_R for r in mine])
+        assert np.allclose(stats.a_inv[i], np.linalg.inv(np.eye(16) + x.T @ x))
+        assert np.allclose(stats.b[i], x.T @ r)
+        assert stats.counts[i] == len(mine)
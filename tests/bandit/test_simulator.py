@@ -0,0 +1,46 @@
+from dataclasses import replace
+
+import numpy as np
+
+from src.app.bandit.simulator import SyntheticEnvironment, replay_log, simulate
+
+
+def _env(seed=0):
+    return SyntheticEnvironment("x_post", [f"p{i}" for i in range(4)], seed)
+
+
+def test_simulation_is_deterministic_from_seed():
+    first = simulate("thompson", _env(), 400, seed=5)
+    second = simulate("thompson", _env(), 400, seed=5)
+    assert replace(first, decisions_per_s=0) == replace(second, decisions_per_s=0)
+
+
+def test_regret_curve_is_cumulative_and_policies_rank_sensibly():
+    # seed 0 draws near-tied arms once penalties are scored; seed 2 separates them
+    env = _env(seed=2)
+    uniform = simulate("uniform", env, 3_000, checkpoints=10)
+    linucb = simulate("linucb", env, 3_000, batch_size=25, checkpoints=10)
+    regrets = [r for _, r in linucb.regret_curve]
+    assert linucb.regret_curve[-1][0] == 3_000
+    assert regrets == sorted(regrets) and regrets[0] >= 0
+    assert linucb.cumulative_regret < uniform.cumulative_regret / 2
+    assert linucb.mean_reward > uniform.mean_reward
+
+
+def test_memory_is_measured_on_request():
+    report = simulate("array_thompson", _env(), 50, measure_memory=True)
+    assert report.peak_memory_bytes and report.peak_memory_bytes > 0
+
+
+def test_replay_only_counts_matching_logged_plays():
+    rng = np.random.default_rng(0)
+    events = [
+        {"play_id": f"p{i}", "context": {}, "reward_R": float(i == 2)}
+        for i in rng.integers(4, size=2_000).tolist()
+    ]
+    events.append({"play_id": "p0", "context": {}, "reward_R": None})
+    report = replay_log("array_thompson", events, ["p0", "p1", "p2", "p3"])
+    assert report.events == 2_000
+    assert 0 < report.matched < 2_000
+    # the policy learns to pick p2, the only play that ever pays out
+    assert report.mean_reward > 0.5
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from httpx import AsyncClient
+
+from src.app.math.answer_keys import AnswerKey, AnswerKeyCache, answer_keys
+
+
+def _key(answer: float) -> AnswerKey:
+    return AnswerKey(answer, 1e-2, "s", "p", "pythagorean.find_c", "neutral")
+
+
+def test_answer_key_tolerance() -> None:
+    key = AnswerKey(5.0, 1e-2, "s", "p", "pythagorean.find_c", "neutral")
+    assert key.is_correct(5.005)
+    assert not key.is_correct(5.02)
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = AnswerKeyCache(maxsize=2, ttl=60)
+    cache.put("a", _key(1.0))
+    cache.put("b", _key(2.0))
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", _key(3.0))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 2, "maxsize": 2}
+
+
+def test_cache_entries_expire() -> None:
+    cache = AnswerKeyCache(maxsize=10, ttl=5)
+    with patch("src.app.math.answer_keys.time.monotonic", return_value=100.0):
+        cache.put("a", _key(1.0))
+    with patch("src.app.math.answer_keys.time.monotonic", return_value=104.0):
+        assert cache.get("a") is not None
+    with patch("src.app.math.answer_keys.time.monotonic", return_value=106.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+async def test_grading_uses_cache_and_falls_back_to_db(app) -> None:
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        pid = (
+            await client.post(
+                "/math/participants", json={"age_band": "7-9", "interests": []}
+            )
+        ).json()["participant_id"]
+        sid = (
+            await client.post(
+                "/math/sessions", json={"participant_id": pid, "n_pairs": 2}
+            )
+        ).json()["session_id"]
+
+        first = (await client.get(f"/math/sessions/{sid}/next")).json()
+        hits = answer_keys.hits
+        resp = await client.post(
+            "/math/attempts",
+            json={
+                "item_id": first["item_id"],
+                "answer_submitted": first["bindings"]["c"],
+            },
+        )
+        assert resp.json()["correct"] is True
+        assert answer_keys.hits == hits + 1
+
+        answer_keys.clear()
+        second = (await client.get(f"/math/sessions/{sid}/next")).json()
+        resp = await client.post(
+            "/math/attempts",
+            json={
+                "item_id": second["item_id"],
+                "answer_submitted": second["bindings"]["c"],
+            },
+        )
+        assert resp.json()["correct"] is True
+        stats = (await client.get("/math/answer_keys/stats")).json()
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import numpy as np
+
+from src.app.math.cso_math import policy_check, policy_check_items
+from src.app.math.schemas import ContextedItem
+from src.app.math.skills.pythagorean import generate_problems
+from src.app.math.teacher_math import evaluate_math_item, evaluate_math_items
+from src.app.math.templater import _MOTIF_MAP, render_context, stem_shapes
+
+
+def _bank() -> list[ContextedItem]:
+    specs = generate_problems("pythagorean.find_c", [1, 2, 3] * 20, 7).to_specs()
+    templates = [*_MOTIF_MAP.values(), "neutral_v1"]
+    items = [
+        render_context(templates[i % len(templates)], spec, "", units)
+        for i, spec in enumerate(specs)
+        for units in ("meters", "feet")
+    ]
+    odd = items[0].model_copy(
+        update={"context_id": "retired_v0", "stem": "A gun sits 3.5 m away."}
+    )
+    negative = items[1].model_copy(
+        update={"bindings": {**items[1].bindings, "a": -2.0}}
+    )
+    return items + [odd, negative]
+
+
+def test_batches_match_the_per_item_gates():
+    items = _bank()
+    teacher = evaluate_math_items(items)
+    cso = policy_check_items(items)
+    assert len(teacher) == len(cso) == len(items)
+    for i, item in enumerate(items):
+        one = evaluate_math_item(item.stem, item.question, "7-9")
+        assert teacher.passed[i] == (one.status == "pass")
+        assert teacher.context_relevance[i] == one.scores["context_relevance"]
+        assert teacher.sentence_count[i] == one.scores["sentence_count"]
+        assert np.isclose(teacher.avg_word_len[i], one.scores["avg_word_len"])
+        check = policy_check(item.stem)
+        assert cso.passed[i] == (check.status == "pass")
+        assert cso.forbidden[i] == check.issues.count("forbidden_term")
+        assert cso.missing_units[i] == ("missing_units" in check.issues)
+    assert cso.forbidden[-2] == 1
+    # "feet" never satisfied the units check
+    assert cso.missing_units[1::2][:-1].all()
+
+
+def test_decimals_do_not_split_sentences():
+    items = _bank()
+    result = evaluate_math_items(items[:-2])
+    assert (result.sentence_count == 2).all()
+    assert result.passed.sum() > 0
+
+
+def test_each_stem_shape_is_analyzed_once():
+    items = _bank()
+    shapes = stem_shapes(items)
+    # one shape per (template, units), plus the two odd items
+    expected = {(i.context_id, i.bindings["units"]) for i in items[:-2]}
+    assert len(shapes.stems) == len(expected) + 2
+    assert len(shapes) == len(items)
+    assert "0 and 0 meters" in shapes.stems[shapes.index[0]]
+    teacher = evaluate_math_items(shapes)
+    assert np.array_equal(teacher.passed, evaluate_math_items(items).passed)
+    assert np.array_equal(
+        policy_check_items(shapes).passed, policy_check_items(items).passed
+    )
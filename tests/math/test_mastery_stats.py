@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from src.app.db import async_session_maker
+from src.app.models import Item
+
+
+async def test_stats_follow_attempts(app) -> None:
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        pid = (
+            await client.post(
+                "/math/participants", json={"age_band": "7-9", "interests": []}
+            )
+        ).json()["participant_id"]
+        sid = (
+            await client.post(
+                "/math/sessions",
+                json={"participant_id": pid, "n_pairs": 2, "motif": "Sports"},
+            )
+        ).json()["session_id"]
+
+        empty = (await client.get(f"/math/sessions/{sid}/stats")).json()
+        assert empty["attempts"] == 0
+        assert empty["first_try_accuracy"] is None
+
+        async with async_session_maker() as db:
+            res = await db.execute(select(Item).where(Item.session_id == sid))
+            items = res.scalars().all()
+        answers = {i.item_id: i.problem_spec["solution"]["answer"] for i in items}
+        variants = {i.item_id: i.variant for i in items}
+        first, second, *rest = list(answers)
+
+        await client.post(
+            "/math/attempts",
+            json={"item_id": first, "answer_submitted": answers[first]},
+        )
+        await client.post(
+            "/math/attempts",
+            json={"item_id": second, "answer_submitted": -1.0, "hints_used": 2},
+        )
+        # a repeated submission must not be counted twice
+        await client.post(
+            "/math/attempts",
+            json={"item_id": first, "answer_submitted": answers[first]},
+        )
+        body = "\n".join(
+            json.dumps(
+                {"item_id": item_id, "answer_submitted": answers[item_id], "retries": 1}
+            )
+            for item_id in rest
+        )
+        await client.post("/math/attempts/stream", content=body.encode())
+
+        stats = (await client.get(f"/math/sessions/{sid}/stats")).json()
+        assert stats["participant_id"] == pid
+        assert stats["attempts"] == 4
+        assert stats["first_try_correct"] == 1
+        assert stats["hints_used"] == 2
+        assert stats["retries"] == 2
+        assert stats["first_try_accuracy"] == 0.25
+        personalized = sum(1 for v in variants.values() if v == "personalized")
+        assert stats["personalized_attempts"] == personalized
+        assert stats["neutral_attempts"] == 4 - personalized
+        assert (
+            stats["personalized_first_try_correct"] + stats["neutral_first_try_correct"]
+            == 1
+        )
+
+        participant = (await client.get(f"/math/participants/{pid}/stats")).json()
+        skill_stats = participant["skills"]["pythagorean.find_c"]
+        assert skill_stats["attempts"] == 4
+        assert skill_stats["first_try_correct"] == 1
+
+
+async def test_stats_unknown_session(app) -> None:
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        resp = await client.get("/math/sessions/nonexistent/stats")
+        assert resp.status_code == 404
+        resp = await client.get("/math/participants/nobody/stats")
+        assert resp.json() == {"participant_id": "nobody", "skills": {}}
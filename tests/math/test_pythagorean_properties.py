@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import pytest
-from src.app.math.skills.pythagorean import generate_problem
+from src.app.math.invariance import check_invariance
+from src.app.math.skills.pythagorean import generate_problem, generate_problems
 
 
 def test_pythagorean_find_c_difficulty_1():
@@ -49,3 +50,38 @@ def test_pythagorean_unknown_skill():
     """Test that unknown skill raises ValueError."""
     with pytest.raises(ValueError, match="unknown skill"):
         generate_problem("unknown.skill", 1)  # type: ignore[arg-type]
+
+
+def test_generate_problems_reproducible_per_seed():
+    """Test that the batch generator is deterministic for a given seed."""
+    diffs = [1, 2, 3, 3, 1, 2, 3]
+    first = generate_problems("pythagorean.find_c", diffs, "session-a")
+    second = generate_problems("pythagorean.find_c", diffs, "session-a")
+    other = generate_problems("pythagorean.find_c", diffs * 10, "session-b")
+    assert first.c.tolist() == second.c.tolist()
+    assert first.a.tolist() == second.a.tolist()
+    assert len(other) == 70
+    assert first.difficulty.tolist() == diffs
+
+
+def test_generate_problems_specs_are_valid():
+    """Test that lazily built specs pass the invariance check."""
+    batch = generate_problems("pythagorean.find_c", [1, 2, 3] * 20, 7)
+    specs = batch.to_specs()
+    assert [s.difficulty for s in specs] == [1, 2, 3] * 20
+    assert all(check_invariance(spec, "dummy_stem") for spec in specs)
+    assert all(spec.solution["answer"] == spec.vars["c"] for spec in specs)
+
+    legs = generate_problems("pythagorean.find_leg", [4] * 20, 7).to_specs()
+    assert all(check_invariance(spec, "dummy_stem") for spec in legs)
+    assert all(4 <= float(spec.vars["b"]) <= 12 for spec in legs)
+
+
+def test_generate_problems_invalid_difficulty():
+    """Test that the batch generator validates difficulties like the scalar one."""
+    with pytest.raises(ValueError, match="difficulty 1-3 for find_c"):
+        generate_problems("pythagorean.find_c", [1, 4], 0)
+    with pytest.raises(ValueError, match="difficulty must be 4 for find_leg"):
+        generate_problems("pythagorean.find_leg", [4, 2], 0)
+    with pytest.raises(ValueError, match="unknown skill"):
+        generate_problems("unknown.skill", [1], 0)  # type: ignore[arg-type]
@@ -461,3 +461,123 @@ async def test_log_attempt_with_existing_submission(app):
         # This should return the original attempt's correctness
         result2 = response2.json()
         assert "correct" in result2
+
+
+async def test_next_item_serves_persisted_stem(app):
+    """Test that the next-item endpoint serves stored text without re-rendering."""
+    from unittest.mock import patch
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        participant_resp = await client.post(
+            "/math/participants", json={"age_band": "7-9", "interests": []}
+        )
+        participant_id = participant_resp.json()["participant_id"]
+
+        session_resp = await client.post(
+            "/math/sessions", json={"participant_id": participant_id, "n_pairs": 1}
+        )
+        session_id = session_resp.json()["session_id"]
+
+        with patch("src.app.math.router.render_context", side_effect=AssertionError):
+            response = await client.get(f"/math/sessions/{session_id}/next")
+        assert response.status_code == 200
+        item_data = response.json()
+
+        async with async_session_maker() as session:
+            item = await session.get(Item, item_data["item_id"])
+            assert item.stem == item_data["stem"]
+            assert item.question == item_data["question"]
+            assert item.bindings == item_data["bindings"]
+            assert item_data["skill"] == item.problem_spec["skill"]
+            assert item_data["difficulty"] == item.problem_spec["difficulty"]
+
+
+async def test_create_sessions_batch(app):
+    """Test classroom batch session creation returns IDs in request order."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        participant_ids = []
+        for _ in range(3):
+            resp = await client.post(
+                "/math/participants", json={"age_band": "7-9", "interests": []}
+            )
+            participant_ids.append(resp.json()["participant_id"])
+
+        response = await client.post(
+            "/math/sessions/batch",
+            json={"participant_ids": participant_ids, "n_pairs": 2, "motif": "Music"},
+        )
+        assert response.status_code == 200
+        session_ids = response.json()["session_ids"]
+        assert len(session_ids) == 3
+        assert len(set(session_ids)) == 3
+
+        async with async_session_maker() as session:
+            for participant_id, session_id in zip(participant_ids, session_ids):
+                session_obj = await session.get(Session, session_id)
+                assert session_obj.participant_id == participant_id
+                result = await session.execute(
+                    select(Item).where(Item.session_id == session_id)
+                )
+                items = result.scalars().all()
+                assert len(items) == 4
+                assert all(item.stem for item in items)
+
+        item_resp = await client.get(f"/math/sessions/{session_ids[1]}/next")
+        assert item_resp.json()["item_id"]
+
+
+async def test_create_sessions_batch_requires_participants(app):
+    """Test batch session creation rejects an empty participant list."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post(
+            "/math/sessions/batch", json={"participant_ids": []}
+        )
+        assert response.status_code == 400
+
+
+async def test_prefetch_claims_items_and_accepts_any_order(app):
+    """Test prefetching several items and answering them out of order."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        participant_resp = await client.post(
+            "/math/participants", json={"age_band": "7-9", "interests": []}
+        )
+        participant_id = participant_resp.json()["participant_id"]
+
+        session_resp = await client.post(
+            "/math/sessions", json={"participant_id": participant_id, "n_pairs": 2}
+        )
+        session_id = session_resp.json()["session_id"]
+
+        response = await client.get(f"/math/sessions/{session_id}/next?prefetch=3")
+        assert response.status_code == 200
+        prefetched = response.json()["items"]
+        assert len(prefetched) == 3
+        assert len({item["item_id"] for item in prefetched}) == 3
+        assert all(item["stem"] for item in prefetched)
+
+        last = (await client.get(f"/math/sessions/{session_id}/next")).json()
+        assert last["item_id"] not in {item["item_id"] for item in prefetched}
+        empty = await client.get(f"/math/sessions/{session_id}/next?prefetch=3")
+        assert empty.json() == {"items": []}
+
+        for item in [last, *reversed(prefetched)]:
+            async with async_session_maker() as session:
+                assert (await session.get(Session, session_id)).completed_at is None
+            response = await client.post(
+                "/math/attempts",
+                json={
+                    "item_id": item["item_id"],
+                    "answer_submitted": item["bindings"]["c"],
+                },
+            )
+            assert response.json()["correct"] is True
+
+        async with async_session_maker() as session:
+            assert (await session.get(Session, session_id)).completed_at is not None
+
+
+async def test_prefetch_rejects_out_of_range(app):
+    """Test prefetch bounds validation."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/math/sessions/any/next?prefetch=0")
+        assert response.status_code == 422
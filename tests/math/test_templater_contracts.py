@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import pytest
+import yaml  # type: ignore[import-untyped]
 
 from src.app.math.templater import render_context, _MOTIF_MAP
 from src.app.math.schemas import ProblemSpec
@@ -40,10 +41,15 @@ def test_invalid_units_fallback() -> None:
     assert ctx.stem  # template should still render
 
 
-def test_templater_error_missing_placeholder():
-    """Test error when template requires placeholder not in spec."""
-    from unittest.mock import patch
+def _registry_with(tmp_path, monkeypatch, template: dict) -> None:
+    from src.app.math import templater
+
+    (tmp_path / "test_template.yaml").write_text(yaml.safe_dump(template))
+    monkeypatch.setattr(templater, "registry", templater.TemplateRegistry(tmp_path))
+
 
+def test_templater_error_missing_placeholder(tmp_path, monkeypatch):
+    """Test error when template requires placeholder not in spec."""
     spec = ProblemSpec(
         id="test",
         skill="pythagorean.find_c",
@@ -52,37 +58,81 @@ def test_templater_error_missing_placeholder():
         solution={"answer": 5},
     )
 
-    # Mock a template that requires an extra placeholder not in the spec
-    mock_template = {
-        "stem": "Simple stem with {a}",
-        "question": "What is the answer?",
-        "allowed_units": ["meters"],
-        "sentences_max": 2,
-        "placeholders": ["a", "b", "c", "units", "missing_var"],  # Extra placeholder
-    }
+    # A template that requires an extra placeholder not in the spec
+    _registry_with(
+        tmp_path,
+        monkeypatch,
+        {
+            "stem": "Simple stem with {a}",
+            "question": "What is the answer?",
+            "allowed_units": ["meters"],
+            "sentences_max": 2,
+            "placeholders": ["a", "b", "c", "units", "missing_var"],
+        },
+    )
+    with pytest.raises(ValueError, match="missing placeholder missing_var"):
+        render_context("test_template", spec, "neutral", "meters")
+
 
-    with patch("src.app.math.templater._load_template", return_value=mock_template):
-        with pytest.raises(ValueError, match="missing placeholder missing_var"):
-            render_context("mock_template", spec, "neutral", "meters")
+def test_templater_sentence_limit_exceeded(tmp_path, monkeypatch):
+    """Test sentence limit validation with a template on disk."""
+    spec = generate_problem("pythagorean.find_c", 1)
 
+    # A template with a very low sentence limit
+    _registry_with(
+        tmp_path,
+        monkeypatch,
+        {
+            "stem": "This is sentence one. This is sentence two. This is sentence three.",
+            "question": "What is the answer?",
+            "allowed_units": ["meters"],
+            "sentences_max": 1,  # Very low limit
+            "placeholders": ["a", "b", "c", "units"],
+        },
+    )
+    with pytest.raises(ValueError, match="stem exceeds sentence limit"):
+        render_context("test_template", spec, "neutral", "meters")
 
-def test_templater_sentence_limit_exceeded():
-    """Test sentence limit validation by creating a mock template."""
-    from unittest.mock import patch
-    from src.app.math.templater import _load_template
 
-    spec = generate_problem("pythagorean.find_c", 1)
+def test_registry_raises_for_a_missing_template(tmp_path) -> None:
+    from src.app.math.templater import TemplateRegistry
+
+    with pytest.raises(FileNotFoundError):
+        TemplateRegistry(tmp_path).get("neutral_v1")
 
-    # Mock a template with a very low sentence limit
-    mock_template = {
-        "stem": "This is sentence one. This is sentence two. This is sentence three.",
-        "question": "What is the answer?",
-        "allowed_units": ["meters"],
-        "sentences_max": 1,  # Very low limit
-        "placeholders": ["a", "b", "c", "units"],
-    }
-
-    with patch.object(_load_template, "__defaults__", None):
-        with patch("src.app.math.templater._load_template", return_value=mock_template):
-            with pytest.raises(ValueError, match="stem exceeds sentence limit"):
-                render_context("mock_template", spec, "neutral", "meters")
+
+def test_registry_preloads_all_templates() -> None:
+    """Test that every shipped template compiles at startup."""
+    from src.app.math.templater import TemplateRegistry, _TEMPLATE_PATH
+
+    loaded = TemplateRegistry().preload()
+    assert "neutral_v1" in loaded
+    assert len(loaded) == len(list(_TEMPLATE_PATH.glob("*.yaml")))
+    assert set(_MOTIF_MAP.values()) <= set(loaded)
+
+
+def test_registry_reloads_on_mtime_change(tmp_path) -> None:
+    """Test that an edited template file is recompiled."""
+    import os
+    import shutil
+
+    from src.app.math.templater import TemplateRegistry, _TEMPLATE_PATH
+
+    shutil.copy(_TEMPLATE_PATH / "neutral_v1.yaml", tmp_path / "neutral_v1.yaml")
+    reg = TemplateRegistry(tmp_path, check_interval=0)
+    before = reg.get("neutral_v1")
+    assert reg.get("neutral_v1") is before
+
+    path = tmp_path / "neutral_v1.yaml"
+    path.write_text(
+        path.read_text(encoding="utf-8").replace("Two sides", "Both legs"),
+        encoding="utf-8",
+    )
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    after = reg.get("neutral_v1")
+    assert after is not before
+    assert after.render_stem({"a": 3, "b": 4, "units": "meters"}).startswith(
+        "Both legs"
+    )
@@ -0,0 +1,55 @@
+import random
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.app.models import AttemptLog, Workstream
+from src.app.roles.analyst import HORIZONS, Analyst, uniform_draws
+
+analyst = Analyst(Path("src/app/playbook/rewards.yaml"))
+
+
+def test_draws_depend_only_on_the_attempt_id():
+    ids = [uuid.uuid4() for _ in range(50)]
+    state = random.getstate()
+    together = uniform_draws(ids, 6)
+    assert random.getstate() == state
+    alone = np.vstack([uniform_draws([i], 6) for i in reversed(ids)])[::-1]
+    assert np.array_equal(together, alone)
+    assert ((together >= 0) & (together < 1)).all()
+    assert len(np.unique(together)) == together.size
+
+
+def test_penalties_are_subtracted():
+    reward = analyst.compute_reward(
+        "x_post", {"save_reply": 1.0, "subs": 0.5, "penalty_policy": 1.0}
+    )
+    assert reward == pytest.approx(0.4 + 0.15 - 5.0)
+    assert analyst.compute_reward("x_thread", {"save_reply": 1.0}) == 0.0
+
+
+def test_batch_scores_match_the_per_attempt_path():
+    ids = [uuid.uuid4() for _ in range(200)]
+    metrics, rewards = analyst.score_batch("newsletter", ids)
+    assert metrics.shape == (200, 3, 4)
+    # cumulative: nothing decreases between horizons
+    assert (np.diff(metrics, axis=1) >= 0).all()
+    for attempt_id, reward in zip(ids[:20], rewards[:20]):
+        attempt = AttemptLog(id=attempt_id, workstream=Workstream.newsletter)
+        analyst.simulate_metrics(attempt)
+        for horizon in HORIZONS:
+            assert set(getattr(attempt, horizon)) == set(
+                analyst.reward_weights["newsletter"].metrics
+            )
+        assert analyst.compute_reward(
+            "newsletter", attempt.metrics_72h
+        ) == pytest.approx(reward)
+
+
+def test_workstream_without_weights_scores_zero():
+    ids = [uuid.uuid4() for _ in range(3)]
+    metrics, rewards = analyst.score_batch("x_thread", ids)
+    assert metrics.shape == (3, 3, 0)
+    assert rewards.tolist() == [0.0, 0.0, 0.0]
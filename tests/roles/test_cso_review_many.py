@@ -0,0 +1,31 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from src.app.roles.cso import CSO
+from src.app.schemas import Draft
+
+TEXTS = [
+    "Fractions with pizza slices.",
+    "We GUARANTEE results",
+    "Call 555-123-4567",
+    "Our affiliate picks for geometry",
+]
+
+
+def test_review_many_on_a_process_pool_matches_review():
+    cso = CSO(Path("src/app/playbook/policies"))
+    texts = [TEXTS[i % len(TEXTS)] for i in range(101)]
+    expected = [cso.review("x_post", Draft(outline=[], text=t)) for t in texts]
+    drafts = [Draft(outline=[], text=t) for t in texts]
+    with ProcessPoolExecutor(
+        2, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        results = list(
+            cso.review_many("x_post", drafts, pool, chunk_size=8, max_in_flight=3)
+        )
+    assert results == expected
+    assert list(cso.review_many("x_post", [])) == []
+    # disclosures added in the workers land on the caller's drafts
+    assert drafts[3].metadata["disclosures"] == ["This may contain affiliate links."]
+    assert drafts[0].metadata["disclosures"] == []
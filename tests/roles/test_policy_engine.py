@@ -0,0 +1,89 @@
+import os
+import re
+from pathlib import Path
+
+from src.app.roles.cso import CSO
+from src.app.roles.policy_engine import CompiledPolicy, PolicyEngine
+from src.app.schemas import Draft
+
+POLICY_DIR = Path("src/app/playbook/policies")
+
+
+def _legacy_codes(policies, text):
+    terms = [
+        ("forbidden", t)
+        for t in policies.get("forbidden_terms", [])
+        if re.search(rf"(?<!\w){re.escape(t)}(?!\w)", text, re.IGNORECASE)
+    ]
+    return terms + [
+        (code, p)
+        for code in ("forbidden", "pii")
+        for p in policies.get(code, [])
+        if re.search(p, text, re.IGNORECASE)
+    ]
+
+
+def test_scan_reports_every_rule_with_spans():
+    text = "We GUARANTEE it. Mail ann@example.com or 555-123-4567."
+    matches = PolicyEngine(POLICY_DIR).scan("x_post", text)
+    assert [(m.code, text[m.start : m.end]) for m in matches] == [
+        ("forbidden", "GUARANTEE"),
+        ("pii", "ann@example.com"),
+        ("pii", "555-123-4567"),
+    ]
+
+
+def test_rules_hidden_inside_another_match_are_still_reported():
+    policy = CompiledPolicy.compile({"forbidden": [r"free \w+", "money"]})
+    texts = ["free money now", "free stuff", "money", "nothing here", "free  money"]
+    for text in texts:
+        found = sorted({(m.code, m.pattern) for m in policy.scan(text)})
+        legacy = sorted(_legacy_codes({"forbidden": [r"free \w+", "money"]}, text))
+        assert found == legacy, text
+
+
+def test_every_match_of_every_rule_is_reported():
+    policy = CompiledPolicy.compile({"forbidden": ["free money", "money"]})
+    text = "money here and free money there"
+    assert [(m.pattern, m.start, m.end) for m in policy.scan(text)] == [
+        ("money", 0, 5),
+        ("free money", 15, 25),
+        ("money", 20, 25),
+    ]
+
+
+def test_review_matches_the_per_pattern_path():
+    cso = CSO(POLICY_DIR)
+    policies = cso.load_policies("newsletter")
+    for text in [
+        "A clean draft about fractions.",
+        "guarantee guarantee, write to a@b.io",
+        "Call 555-123-4567 for 100% results",
+        "guaranteed, not a guarantee_ but 100%",
+    ]:
+        result = cso.review("newsletter", Draft(outline=[], text=text))
+        assert [(i.code, i.message) for i in result.issues] == _legacy_codes(
+            policies, text
+        )
+        assert result.status == ("needs_fix" if result.issues else "pass")
+    assert cso.engine.loads == 1
+
+
+def test_engine_recompiles_when_policy_files_change(tmp_path):
+    common = tmp_path / "common.yaml"
+    common.write_text('forbidden:\n  - "\\\\bcheap\\\\b"\n')
+    engine = PolicyEngine(tmp_path)
+    assert [m.pattern for m in engine.scan("tpt", "cheap and fast")] == [r"\bcheap\b"]
+    assert engine.scan("tpt", "fast") == []
+    assert engine.loads == 1
+
+    specific = tmp_path / "tpt.yaml"
+    specific.write_text('forbidden:\n  - "fast"\n')
+    assert [m.pattern for m in engine.scan("tpt", "cheap and fast")] == ["fast"]
+    assert engine.loads == 2
+
+    common.write_text("pii:\n  - secret\n")
+    stat = common.stat()
+    os.utime(common, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert [m.code for m in engine.scan("medium", "a SECRET")] == ["pii"]
+    assert engine.loads == 3
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pytest
+
+from src.app.roles.teacher import Teacher, extract_features, syllables
+from src.app.schemas import Draft
+
+teacher = Teacher(Path("src/app/playbook/teaching_constitution.yaml"))
+
+
+@pytest.mark.parametrize(
+    "word,count",
+    [("cat", 1), ("make", 1), ("table", 2), ("apple", 2), ("remember", 3), ("a", 1)],
+)
+def test_syllables(word, count):
+    assert syllables(word) == count
+
+
+def test_one_pass_counts_sentences_questions_and_keywords():
+    text = (
+        "Is 3.5 more than 3? Learning to apply it helps. "
+        "See https://example.org/a.b for a recap! Then remember"
+    )
+    f = extract_features(text)
+    assert f.sentence_count == 4
+    assert f.retrieval_presence == 1
+    assert f.learning_goal_present == 1
+    assert f.udl_accessibility == 0.7
+    # the URL cites a source; "understand" is missing, so no progression
+    assert f.claims_softened_or_cited == 1
+    assert f.cognitive_progression == 0.0
+    assert extract_features("").reading_level_max_grade == 0.0
+
+
+def test_reading_level_rule_fires_on_dense_text():
+    simple = (
+        "Learn to remember, understand and apply this. "
+        "Can you do it? Here is an example that may help."
+    )
+    dense = (
+        "Learn to remember, understand and apply the interdependent "
+        "characteristics of proportional relationships, demonstrating "
+        "considerable mathematical sophistication and communicating "
+        "generalizations unambiguously through representational "
+        "conventions, which may appear? Here is an example."
+    )
+    assert teacher.review(Draft(outline=[], text=simple)).status == "pass"
+    result = teacher.review(Draft(outline=[], text=dense))
+    assert result.teacher_scores["reading_level_max_grade"] > 10
+    assert [(i.code, i.message) for i in result.issues] == [
+        ("reading_level_max_grade", "above max")
+    ]
@@ -0,0 +1,61 @@
+import random
+import re
+
+from src.app.math.cso_math import policy_check
+from src.app.term_matcher import TermMatcher
+
+
+def _reference(terms, text, whole_word, prefix=False):
+    edge = (r"(?<!\w)", "" if prefix else r"(?!\w)") if whole_word else ("", "")
+    return sorted(
+        (m.end(1), m.start(1), term)
+        for term in terms
+        for m in re.finditer(
+            f"(?=({edge[0]}{re.escape(term)}{edge[1]}))", text, re.IGNORECASE
+        )
+    )
+
+
+def test_overlapping_terms_are_all_reported():
+    matcher = TermMatcher(["he", "she", "his", "hers"], whole_word=False)
+    found = [(m.term, m.start, m.end) for m in matcher.scan("ushers")]
+    assert sorted(found) == [("he", 2, 4), ("hers", 2, 6), ("she", 1, 4)]
+
+
+def test_whole_words_and_case_folding():
+    matcher = TermMatcher(["kill", "100%", "Brand X"])
+    text = "Skills kill. KILL! 100% sure, brand x and brand xy"
+    assert [text[m.start : m.end] for m in matcher.scan(text)] == [
+        "kill",
+        "KILL",
+        "100%",
+        "brand x",
+    ]
+    assert matcher.search("nothing to see") == []
+
+
+def test_matches_a_regex_per_term():
+    rng = random.Random(3)
+    for _ in range(200):
+        terms = ["".join(rng.choices("ab c", k=rng.randint(1, 4))) for _ in range(8)]
+        terms = [t for t in terms if t.strip()]
+        text = "".join(rng.choices("abAB c.", k=60))
+        for whole_word, prefix in ((True, False), (True, True), (False, False)):
+            matcher = TermMatcher(terms, whole_word=whole_word, prefix=prefix)
+            found = sorted((m.end, m.start, m.term) for m in matcher.scan(text))
+            assert found == _reference(matcher.terms, text, whole_word, prefix)
+
+
+def test_math_gate_matches_word_starts():
+    assert policy_check("A skilled builder walks 5 meters").issues == []
+    for stem in (
+        "The shooter stands 5 meters away",
+        "A killer whale swims 5 meters",
+        "Gunfire echoes 5 meters off",
+        "A shotgun is 1 meter long",
+    ):
+        assert policy_check(stem).issues == ["forbidden_term"], stem
+    assert policy_check("Guns and a WEAPON, 5 meters apart").issues == [
+        "forbidden_term",
+        "forbidden_term",
+    ]